@@ -5,6 +5,11 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+The order event stream (``/api/events/``) is an async StreamingHttpResponse,
+so the staff panels need this entry point (e.g. ``uvicorn core.asgi:application``)
+rather than WSGI to receive push updates. Under WSGI the endpoint answers 204 and
+the panels fall back to polling.
 """
 
 import os
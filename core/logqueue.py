@@ -0,0 +1,15 @@
+# core/logqueue.py — نوشتن لاگ در thread جدا؛ درخواست فقط رکورد را در صف می‌گذارد
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+
+def queue_handler(stream=None):
+    # در LOGGING با '()': 'core.logqueue.queue_handler'؛ level و formatter را dictConfig روی
+    # QueueHandler می‌گذارد، پس پیام فقط وقتی سطحش فعال باشد ساخته می‌شود
+    records = queue.SimpleQueue()
+    listener = QueueListener(records, logging.StreamHandler(stream), respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return QueueHandler(records)
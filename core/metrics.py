@@ -0,0 +1,220 @@
+# core/metrics.py — زمان پاسخ، تعداد/زمان کوئری و حجم پاسخ به ازای هر view در قالب متنی Prometheus
+import hmac
+import threading
+from bisect import bisect_left
+from contextlib import ExitStack
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+from django.views.decorators.cache import never_cache
+
+# مرزهای histogram ها (le)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        i = bisect_left(self.buckets, value)
+        if i < len(self.counts):
+            self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self):
+        # (le, تعداد تجمعی) شامل +Inf
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield _format_number(bound), total
+        yield '+Inf', self.count
+
+
+class _ViewStats:
+    __slots__ = ('latency', 'queries', 'size', 'db_seconds')
+
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.size = Histogram(SIZE_BUCKETS)
+        self.db_seconds = 0.0
+
+
+class RequestMetrics:
+    # آمار در حافظه‌ی همین پروسس است؛ با چند worker هر پروسس آمار خودش را گزارش می‌کند
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}  # (view, method) -> _ViewStats
+        self._responses = {}  # (view, method, status) -> تعداد
+
+    def observe(self, view, method, status, seconds, queries, db_seconds, size=None):
+        key = (view, method)
+        with self._lock:
+            stats = self._views.get(key)
+            if stats is None:
+                stats = self._views[key] = _ViewStats()
+            stats.latency.observe(seconds)
+            stats.queries.observe(queries)
+            stats.db_seconds += db_seconds
+            if size is not None:
+                stats.size.observe(size)
+            response_key = (view, method, status)
+            self._responses[response_key] = self._responses.get(response_key, 0) + 1
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+            self._responses.clear()
+
+    def render(self):
+        with self._lock:
+            lines = [
+                '# HELP django_http_requests_total Responses by view, method and status.',
+                '# TYPE django_http_requests_total counter',
+            ]
+            for (view, method, status), count in sorted(self._responses.items()):
+                lines.append(f'django_http_requests_total{_labels(view=view, method=method, status=status)} {count}')
+
+            views = sorted(self._views.items())
+            for name, help_text, attr in (
+                ('django_http_request_duration_seconds', 'Time until the response (headers for streams) is ready.', 'latency'),
+                ('django_db_queries_per_request', 'SQL queries executed while building the response.', 'queries'),
+                ('django_http_response_size_bytes', 'Body size of non-streaming responses.', 'size'),
+            ):
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} histogram')
+                for (view, method), stats in views:
+                    histogram = getattr(stats, attr)
+                    if not histogram.count:
+                        continue
+                    for le, count in histogram.samples():
+                        lines.append(f'{name}_bucket{_labels(view=view, method=method, le=le)} {count}')
+                    labels = _labels(view=view, method=method)
+                    lines.append(f'{name}_sum{labels} {_format_number(histogram.sum)}')
+                    lines.append(f'{name}_count{labels} {histogram.count}')
+
+            lines.append('# HELP django_db_query_duration_seconds_total Time spent in SQL queries.')
+            lines.append('# TYPE django_db_query_duration_seconds_total counter')
+            for (view, method), stats in views:
+                lines.append(
+                    f'django_db_query_duration_seconds_total{_labels(view=view, method=method)} '
+                    f'{_format_number(stats.db_seconds)}'
+                )
+        return '\n'.join(lines) + '\n'
+
+
+def _format_number(value):
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels):
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + '}'
+
+
+registry = RequestMetrics()
+
+
+class _QueryTimer:
+    __slots__ = ('count', 'seconds')
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += perf_counter() - start
+
+
+class MetricsMiddleware:
+    # باید اولین middleware باشد تا زمان کل زنجیره اندازه گرفته شود. برچسب view نام URL است
+    # (نه مسیر) تا تعداد سری‌ها با شناسه‌ی سفارش/میز بالا نرود.
+    # زیر ASGI خودش async است تا زنجیره‌ی async (مثلاً جریان SSE) به ترد sync منتقل نشود.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        timer = _QueryTimer()
+        start = perf_counter()
+        with ExitStack() as stack:
+            _wrap_connections(stack, timer)
+            response = self.get_response(request)
+        self._observe(request, response, perf_counter() - start, timer)
+        return response
+
+    async def __acall__(self, request):
+        # اتصال‌های دیتابیس مال ترد sync_to_async درخواست‌اند (ORM async هم همان‌جا اجرا می‌شود)،
+        # پس wrapper ها همان‌جا نصب و برداشته می‌شوند
+        timer = _QueryTimer()
+        start = perf_counter()
+        stack = ExitStack()
+        await sync_to_async(_wrap_connections)(stack, timer)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        self._observe(request, response, perf_counter() - start, timer)
+        return response
+
+    def _observe(self, request, response, elapsed, timer):
+        match = getattr(request, 'resolver_match', None)
+        registry.observe(
+            match.view_name if match else 'unmatched',
+            request.method,
+            response.status_code,
+            elapsed,
+            timer.count,
+            timer.seconds,
+            None if response.streaming else len(response.content),
+        )
+
+
+def _wrap_connections(stack, timer):
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(timer))
+
+
+def _can_scrape(request):
+    # اسکرپر Prometheus با METRICS_TOKEN (هدر Authorization: Bearer ...)، یا کاربر staff/مدیر لاگین‌شده
+    token = settings.METRICS_TOKEN
+    if token and hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return True
+    user = request.user
+    return user.is_authenticated and (user.is_staff or user.role == 'manager')
+
+
+@never_cache
+def metrics_view(request):
+    if not _can_scrape(request):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
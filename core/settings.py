@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -42,6 +43,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.metrics.MetricsMiddleware",  # اول از همه تا زمان کل زنجیره اندازه گرفته شود
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -57,8 +59,15 @@ TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         'DIRS': [BASE_DIR / 'templates'],
-        "APP_DIRS": True,
         "OPTIONS": {
+            # قالب‌ها یک بار کامپایل و در حافظه‌ی پروسس نگه داشته می‌شوند؛ در توسعه
+            # autoreload با تغییر فایل قالب کش را خالی می‌کند
+            "loaders": [
+                ("django.template.loaders.cached.Loader", [
+                    "django.template.loaders.filesystem.Loader",
+                    "django.template.loaders.app_directories.Loader",
+                ]),
+            ],
             "context_processors": [
                 "django.template.context_processors.debug",
                 "django.template.context_processors.request",
@@ -72,12 +81,91 @@ TEMPLATES = [
 WSGI_APPLICATION = "core.wsgi.application"
 
 # Database
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# DJANGO_DB: sqlite (پیش‌فرض) | postgres
+DATABASE_PROFILE = os.environ.get('DJANGO_DB', 'sqlite')
+
+if DATABASE_PROFILE == 'postgres':
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.environ.get('POSTGRES_DB', 'restaurant'),
+            "USER": os.environ.get('POSTGRES_USER', 'restaurant'),
+            "PASSWORD": os.environ.get('POSTGRES_PASSWORD', ''),
+            "HOST": os.environ.get('POSTGRES_HOST', '127.0.0.1'),
+            "PORT": os.environ.get('POSTGRES_PORT', '5432'),
+            "CONN_HEALTH_CHECKS": True,
+            "OPTIONS": {},
+        }
+    }
+    # pool داخلی جنگو (psycopg[pool]) با اتصال پایدار سازگار نیست:
+    # یا pool (DB_POOL_MAX_SIZE > 0) یا CONN_MAX_AGE برای هر worker.
+    DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', '0'))
+    if DB_POOL_MAX_SIZE:
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": int(os.environ.get('DB_POOL_MIN_SIZE', '2')),
+            "max_size": DB_POOL_MAX_SIZE,
+            "timeout": 10,
+        }
+    else:
+        DATABASES["default"]["CONN_MAX_AGE"] = int(os.environ.get('DB_CONN_MAX_AGE', '60'))
+else:
+    # SQLITE_PATH: دیتابیس استقرار. بدون آن db.sqlite3 نمونه‌ی داخل مخزن استفاده می‌شود که WAL
+    # نمی‌گیرد؛ journal_mode=WAL در هدر خود فایل نوشته می‌شود و فایل ثبت‌شده در git را عوض می‌کند.
+    SQLITE_PATH = os.environ.get('SQLITE_PATH')
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": SQLITE_PATH or BASE_DIR / "db.sqlite3",
+            "OPTIONS": {
+                # چند تبلت هم‌زمان: WAL خواننده‌ها را از نویسنده جدا می‌کند، busy_timeout به جای
+                # «database is locked» منتظر می‌ماند و IMMEDIATE قفل نوشتن را از اول تراکنش می‌گیرد.
+                "timeout": 20,
+                "transaction_mode": "IMMEDIATE",
+                "init_command": (
+                    ("PRAGMA journal_mode=WAL;" if SQLITE_PATH else "")
+                    + "PRAGMA busy_timeout=20000;"
+                    "PRAGMA synchronous=NORMAL;"
+                    "PRAGMA mmap_size=134217728;"
+                ),
+            },
+        }
     }
-}
+
+# Cache & sessions
+# DJANGO_CACHE: locmem (پیش‌فرض، یک پروسس) | file | redis
+# با چند worker از file یا redis استفاده کنید تا نسخه‌ی منو، session، جمع آشپزخانه و شمارنده‌ی
+# زمان‌بندی آشپزخانه بین پروسس‌ها مشترک باشد (با locmem هر worker تغییرات بقیه را نمی‌بیند).
+CACHE_BACKEND = os.environ.get('DJANGO_CACHE', 'locmem')
+REDIS_URL = os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/0')
+
+if CACHE_BACKEND == 'redis':
+    # هر سرور سازگار با پروتکل Redis (Redis, Valkey, KeyDB, ...)
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+elif CACHE_BACKEND == 'file':
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": os.environ.get('DJANGO_CACHE_DIR', BASE_DIR / '.django_cache'),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# cached_db: خواندن session از کش، نوشتن در کش و دیتابیس.
+# DJANGO_SESSION_ENGINE=django.contrib.sessions.backends.cache برای session فقط روی Redis.
+SESSION_ENGINE = os.environ.get('DJANGO_SESSION_ENGINE', 'django.contrib.sessions.backends.cached_db')
+# session های منقضی را `python manage.py purge_sessions --interval 3600` پاک می‌کند
+SESSION_COOKIE_AGE = 60 * 60 * 24 * 14
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -107,6 +195,47 @@ MEDIA_ROOT = BASE_DIR / 'media'
 # Static files
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']  # اختیاری - اگر پوشه static نداری، کامنت کن
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# در توسعه runserver فایل‌ها را بدون هش از STATICFILES_DIRS می‌دهد. در production بعد از
+# collectstatic نام‌ها هش‌دار (قابل کش برای همیشه) و نسخه‌های .gz/.br کنارشان ساخته می‌شوند.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+            else 'core.staticfiles.PrecompressedManifestStaticFilesStorage'
+        ),
+    },
+}
+# بدون وب‌سرور جلوی جنگو: DJANGO_SERVE_STATIC=1 تا خود جنگو STATIC_ROOT را با کش بلندمدت بدهد
+SERVE_STATIC = os.environ.get('DJANGO_SERVE_STATIC') == '1'
+
+# متریک‌ها (core.metrics) در /metrics/ برای staff/مدیر؛ اسکرپر Prometheus با
+# Authorization: Bearer $DJANGO_METRICS_TOKEN
+METRICS_TOKEN = os.environ.get('DJANGO_METRICS_TOKEN', '')
+
+# لاگ‌های برنامه در صف نوشته می‌شوند و یک thread جدا آن‌ها را روی stderr می‌نویسد
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'simple': {'format': '%(asctime)s %(levelname)s %(name)s: %(message)s'},
+    },
+    'handlers': {
+        'queue': {'()': 'core.logqueue.queue_handler', 'formatter': 'simple'},
+    },
+    'loggers': {
+        app: {
+            'handlers': ['queue'],
+            'level': os.environ.get('DJANGO_LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        }
+        for app in ('core', 'index', 'user')
+    },
+}
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
@@ -120,4 +249,32 @@ LOGIN_URL = '/user/login/'
 
 KAVENEGAR_API_KEY = '58423059794D3734465A6A777777642F507076446D67344D63664970466F486C386B2F3854504F6A575A303D'
 KAVENEGAR_SENDER = '2000660110'
-KAVENEGAR_TEMPLATE = 'verify'  # اختیاری: اگر از قالب استفاده می‌کنید
\ No newline at end of file
+KAVENEGAR_TEMPLATE = 'verify'  # اختیاری: اگر از قالب استفاده می‌کنید
+
+# IP کاربر برای محدودیت نرخ OTP. پشت nginx/proxy: نام META هدری که proxy می‌گذارد، مثلاً
+# HTTP_X_REAL_IP یا HTTP_X_FORWARDED_FOR (آخرین آدرس). خالی = REMOTE_ADDR. فقط وقتی تنظیم شود
+# که proxy هدر کاربر را بازنویسی می‌کند، وگرنه قابل جعل است.
+CLIENT_IP_HEADER = os.environ.get('DJANGO_CLIENT_IP_HEADER', '')
+
+# ارسال پیامک (user.sms): backend قابل تعویض، در صف پس‌زمینه با تکرار و backoff
+# برای تست/توسعه: SMS_BACKEND=user.sms.LocMemBackend یا user.sms.ConsoleBackend
+SMS_BACKEND = os.environ.get('SMS_BACKEND', 'user.sms.KavenegarBackend')
+SMS_ASYNC = True
+SMS_WORKERS = 4
+SMS_MAX_RETRIES = 3
+SMS_RETRY_BACKOFF = 1  # ثانیه؛ دو برابر در هر تلاش
+
+# cursor پنل‌ها (ثانیه): سفارشی که updated_at گرفته ولی هنوز commit نشده بعداً با زمان قدیمی‌تر
+# ظاهر می‌شود؛ همپوشانی باید از بیشترین انتظار قفل (busy_timeout = ۲۰ ثانیه در SQLite) بیشتر باشد
+ORDER_CURSOR_OVERLAP = 30
+
+# زمان‌بندی آشپزخانه (index.scheduler): ایستگاه‌های غذاهای بدون دسته
+KITCHEN_DEFAULT_STATIONS = 1
+
+# تصاویر منو (index.images): نسخه‌های کوچک با نام هش‌شده، ساخته‌شده در پس‌زمینه بعد از ذخیره‌ی غذا
+MENU_IMAGE_WIDTHS = (320, 640, 960)
+MENU_IMAGE_ASPECT = (16, 9)  # برش ثابت کارت منو
+MENU_IMAGE_FORMATS = ('avif', 'webp', 'jpeg')  # به ترتیب ترجیح؛ jpeg همیشه ساخته می‌شود
+MENU_IMAGE_QUALITY = 80
+MENU_IMAGE_ASYNC = True
+MENU_IMAGE_WORKERS = 1
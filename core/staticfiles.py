@@ -0,0 +1,84 @@
+# staticfiles.py — فایل‌های استاتیک با نام هش‌شده، نسخه‌های از پیش فشرده‌ی gzip/brotli و کش بلندمدت
+import gzip
+import mimetypes
+import os
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # اختیاری؛ بدون آن فقط gzip ساخته می‌شود
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.txt', '.map')
+MIN_COMPRESS_SIZE = 512  # بایت؛ فایل‌های کوچک‌تر ارزش فشرده‌سازی ندارند
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+DEFAULT_CACHE = 'public, max-age=3600'
+
+
+class PrecompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    بعد از هش کردن نام‌ها در collectstatic، کنار هر فایل متنی نسخه‌ی .gz (و اگر پکیج
+    brotli نصب باشد .br) را می‌سازد تا وب‌سرور یا serve_static بدون فشرده‌سازی لحظه‌ای بفرستد.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        for name in set(self.hashed_files.values()):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self._write_compressed(self.path(name))
+
+    def _write_compressed(self, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < MIN_COMPRESS_SIZE:
+            return
+        compressors = [('.gz', lambda d: gzip.compress(d, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            compressors.append(('.br', lambda d: brotli.compress(d, quality=11)))
+        for suffix, compress in compressors:
+            compressed = compress(data)
+            if len(compressed) < len(data):
+                with open(path + suffix, 'wb') as f:
+                    f.write(compressed)
+
+
+@lru_cache(maxsize=1)
+def _hashed_names():
+    return frozenset(getattr(staticfiles_storage, 'hashed_files', {}).values())
+
+
+def serve_static(request, path):
+    # برای استقرار بدون وب‌سرور جلوی جنگو (SERVE_STATIC)؛ با nginx همین کار را
+    # gzip_static / brotli_static و expires max روی STATIC_ROOT انجام می‌دهند
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    if not os.path.isfile(full_path):
+        raise Http404
+
+    content_type = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+    accepted = request.headers.get('Accept-Encoding', '')
+    encoding = None
+    for name, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if name in accepted and os.path.isfile(full_path + suffix):
+            full_path += suffix
+            encoding = name
+            break
+
+    response = FileResponse(open(full_path, 'rb'), content_type=content_type)
+    if encoding:
+        response['Content-Encoding'] = encoding
+    patch_vary_headers(response, ['Accept-Encoding'])
+    # نام هش‌شده با تغییر محتوا عوض می‌شود، پس مرورگر هیچ‌وقت لازم نیست دوباره بپرسد
+    response['Cache-Control'] = IMMUTABLE_CACHE if path in _hashed_names() else DEFAULT_CACHE
+    return response
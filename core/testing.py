@@ -0,0 +1,33 @@
+# core/testing.py — ابزار مشترک تست‌های اپ‌ها (فقط در tests.py ایمپورت شود)
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetMixin:
+    """
+    تعداد کوئری هر endpoint برای اندازه‌های مختلف داده (sizes) اندازه گرفته می‌شود و باید برای
+    همه دقیقاً برابر budget باشد؛ یعنی مستقل از تعداد ردیف‌ها (بدون N+1).
+
+    کلاس تست متد grow(size) را تعریف می‌کند که داده را (به صورت تجمعی) به اندازه‌ی size برساند.
+    """
+    sizes = (1, 10, 100)
+
+    def reset_caches(self):
+        # کش سرد در هر اندازه تا همیشه بدترین حالت (بازسازی از دیتابیس) سنجیده شود
+        cache.clear()
+
+    def assertQueryBudget(self, budget, request, prepare=None):
+        counts = {}
+        for size in self.sizes:
+            self.grow(size)
+            self.reset_caches()
+            kwargs = prepare(size) if prepare else {}
+            # on_commit ها (کش آشپزخانه، زمان‌بندی، ...) هم جزو هزینه‌ی درخواست‌اند
+            with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+                response = request(**kwargs)
+                if response.streaming:
+                    b''.join(response.streaming_content)
+            self.assertLess(response.status_code, 400, f'size={size}')
+            counts[size] = len(queries)
+        self.assertEqual(counts, dict.fromkeys(self.sizes, budget), 'تعداد کوئری به ازای اندازه‌ی داده')
@@ -1,10 +1,11 @@
 from django.contrib import admin
-from .models import Category, MenuItem, Order, OrderItem
+from .models import Category, DailySales, ItemSales, MenuItem, Order, OrderItem, Table, WaiterSales
 
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
-    list_display = ('name', 'icon')
+    list_display = ('name', 'icon', 'stations')
+    list_editable = ('stations',)
     search_fields = ('name',)
     ordering = ('name',)
 
@@ -18,6 +19,19 @@ class MenuItemAdmin(admin.ModelAdmin):
     autocomplete_fields = ('category',)
 
 
+@admin.register(Table)
+class TableAdmin(admin.ModelAdmin):
+    list_display = ('number', 'seats', 'is_active', 'order_url')
+    list_editable = ('seats', 'is_active')
+    search_fields = ('number',)
+    ordering = ('number',)
+    readonly_fields = ('qr_token', 'order_url')
+
+    @admin.display(description='آدرس QR')
+    def order_url(self, obj):
+        return obj.order_url() if obj.pk else '-'
+
+
 class OrderItemInline(admin.TabularInline):
     model = OrderItem
     extra = 0
@@ -30,11 +44,33 @@ class OrderAdmin(admin.ModelAdmin):
     list_display = ('id', 'user', 'table_number', 'status', 'total_price', 'created_at')
     list_filter = ('status', 'created_at')
     search_fields = ('user__mobile', 'table_number', 'user__first_name', 'user__last_name')
-    readonly_fields = ('total_price', 'created_at', 'user', 'table_number', 'special_requests')
+    readonly_fields = ('total_price', 'created_at', 'user', 'table', 'table_number', 'special_requests')
     inlines = [OrderItemInline]
 
     def has_add_permission(self, request):
         return False  # فقط از فرانت ثبت بشه
 
     def has_change_permission(self, request, obj=None):
-        return False  # فقط وضعیت تغییر کنه، نه محتوا
\ No newline at end of file
+        return False  # فقط وضعیت تغییر کنه، نه محتوا
+
+@admin.register(DailySales)
+class DailySalesAdmin(admin.ModelAdmin):
+    list_display = ('date', 'order_count', 'revenue')
+    date_hierarchy = 'date'
+
+    def has_add_permission(self, request):
+        return False  # توسط تحویل سفارش و rebuild_sales_rollups پر می‌شود
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ItemSales)
+class ItemSalesAdmin(DailySalesAdmin):
+    list_display = ('date', 'name', 'quantity', 'revenue')
+    search_fields = ('name',)
+
+
+@admin.register(WaiterSales)
+class WaiterSalesAdmin(DailySalesAdmin):
+    list_display = ('date', 'waiter', 'order_count', 'revenue')
@@ -0,0 +1,157 @@
+# events.py — پخش رویدادهای سفارش به پنل‌های پرسنل (SSE روی ASGI)
+import asyncio
+import json
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import CharField, Value
+from django.utils import timezone
+
+from .models import Order, OrderTombstone
+
+logger = logging.getLogger(__name__)
+
+# هر نقش فقط رویدادهایی را می‌گیرد که لیست پنلش را تغییر می‌دهند
+ROLE_EVENTS = {
+    'manager': {'place_order', 'confirm_order', 'start_cooking', 'finish_cooking', 'deliver_order', 'reject_order'},
+    'chef': {'confirm_order', 'start_cooking', 'finish_cooking', 'reject_order'},
+    'waiter': {'finish_cooking', 'deliver_order', 'reject_order'},
+}
+
+# وضعیت‌هایی که پنل هر نقش نشان می‌دهد یا سفارش با رسیدن به آن از پنل خارج می‌شود (None = همه)
+ROLE_STATUSES = {
+    'manager': None,
+    'chef': ['confirmed', 'preparing', 'ready'],
+    'waiter': ['ready', 'delivered'],
+}
+
+HEARTBEAT_SECONDS = 15
+QUEUE_SIZE = 100
+# تغییرات پروسس‌های دیگر: یک کوئری در هر POLL_SECONDS برای هر پروسس، مستقل از تعداد تبلت‌ها
+POLL_SECONDS = 5
+
+
+def panel_role(user):
+    if user.role in ['manager', 'order_manager']:
+        return 'manager'
+    if user.role in ROLE_EVENTS:
+        return user.role
+    return None
+
+
+class OrderEventBroker:
+    """
+    صف‌های مشترکین داخل همین پروسس نگه داشته می‌شوند و رویداد این پروسس را فوراً
+    می‌رسانند. تغییرات workerهای دیگر را یک poller مشترک برای هر event loop (نه هر اتصال)
+    از دیتابیس می‌خواند و به صورت رویداد changed بین مشترکین همان loop پخش می‌کند.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._pollers = {}  # loop -> task
+
+    def subscribe(self, role):
+        loop = asyncio.get_running_loop()
+        subscriber = (loop, asyncio.Queue(maxsize=QUEUE_SIZE), role)
+        with self._lock:
+            self._subscribers.add(subscriber)
+            if loop not in self._pollers:
+                self._pollers[loop] = loop.create_task(self._poll(loop))
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        loop = subscriber[0]
+        with self._lock:
+            self._subscribers.discard(subscriber)
+            # آخرین مشترک این loop رفت؛ poller با مشترک بعدی دوباره ساخته می‌شود
+            if not any(other[0] is loop for other in self._subscribers):
+                poller = self._pollers.pop(loop, None)
+                if poller is not None:
+                    poller.cancel()
+
+    def publish(self, event):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for loop, queue, role in subscribers:
+            if event['event'] in ROLE_EVENTS[role]:
+                loop.call_soon_threadsafe(_offer, queue, event)
+
+    async def _poll(self, loop):
+        seen = None
+        while True:
+            try:
+                changes = await _recent_changes()
+            except DatabaseError:
+                # خطای گذرا نباید poller مشترک همه‌ی اتصال‌ها را از کار بیندازد
+                logger.exception('order events poll failed')
+                await asyncio.sleep(POLL_SECONDS)
+                continue
+            if seen is None:
+                seen = changes
+            fresh = changes - seen
+            seen = changes
+            if fresh:
+                self._fan_out(loop, fresh)
+            await asyncio.sleep(POLL_SECONDS)
+
+    def _fan_out(self, loop, fresh):
+        statuses = {status for _, _, status in fresh}
+        with self._lock:
+            subscribers = [subscriber for subscriber in self._subscribers if subscriber[0] is loop]
+        for _, queue, role in subscribers:
+            # status خالی = سفارش حذف‌شده، برای همه‌ی نقش‌ها
+            if ROLE_STATUSES[role] is None or '' in statuses or statuses.intersection(ROLE_STATUSES[role]):
+                _offer(queue, {'event': 'changed'})
+
+
+def _offer(queue, event):
+    # مشترک کند نباید بقیه را متوقف کند؛ رویداد قدیمی را دور بریز
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(event)
+
+
+async def _recent_changes():
+    # (شناسه، زمان، وضعیت) سفارش‌های تغییرکرده در پنجره‌ی cursor + حذف‌شده‌ها (وضعیت '') در یک کوئری؛
+    # تراکنشی که دیر commit شده با updated_at قدیمی هم یک عضو تازه در این مجموعه است
+    since = timezone.now() - timedelta(seconds=settings.ORDER_CURSOR_OVERLAP)
+    orders = Order.objects.filter(updated_at__gte=since).order_by().values_list('id', 'updated_at', 'status')
+    tombstones = (
+        OrderTombstone.objects.filter(deleted_at__gte=since).order_by()
+        .annotate(status=Value('', output_field=CharField()))
+        .values_list('order_id', 'deleted_at', 'status')
+    )
+    return {row async for row in orders.union(tombstones, all=True)}
+
+
+broker = OrderEventBroker()
+
+
+def publish_order_event(event, order_id, status=None):
+    payload = {'event': event, 'id': f"ORD-{order_id:03d}", 'status': status}
+    # فقط بعد از commit پخش شود تا پنل‌ها داده‌ی ثبت‌نشده نبینند
+    transaction.on_commit(lambda: broker.publish(payload))
+
+
+def format_sse(event):
+    return f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+async def event_stream(role):
+    subscriber = broker.subscribe(role)
+    queue = subscriber[1]
+    try:
+        yield 'retry: 3000\n\n'
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ': keep-alive\n\n'
+                continue
+            yield format_sse(event)
+    finally:
+        broker.unsubscribe(subscriber)
@@ -0,0 +1,119 @@
+# exports.py — خروجی جریانی سفارش‌ها (CSV / JSONL) با حافظه‌ی ثابت
+import csv
+import json
+
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Order
+from .reports import day_bounds
+from .serializers import CUSTOMER_NAME
+
+EXPORT_FORMATS = ('csv', 'jsonl')
+EXPORT_CHUNK_SIZE = 2000
+
+# آیتم‌ها از items_summary خود سفارش می‌آیند؛ بدون join به OrderItem/MenuItem
+EXPORT_FIELDS = (
+    'id',
+    'created_at',
+    'status',
+    'table_number',
+    'customer_name',
+    'customer_mobile',
+    'total_price',
+    'special_requests',
+    'items_summary',
+)
+
+CSV_HEADER = [
+    'order_id', 'created_at', 'status', 'table', 'customer', 'mobile', 'order_total',
+    'item_id', 'item_name', 'quantity', 'unit_price', 'line_total', 'special_requests',
+]
+
+
+def export_rows(start=None, end=None, statuses=None, chunk_size=EXPORT_CHUNK_SIZE):
+    # [start, end] روزهای محلی (هر کدام می‌تواند None باشد)؛ ترتیب روی ایندکس (created_at, id)
+    orders = Order.objects.order_by('created_at', 'id')
+    lower, upper = day_bounds(start, end)
+    if lower:
+        orders = orders.filter(created_at__gte=lower)
+    if upper:
+        orders = orders.filter(created_at__lt=upper)
+    if statuses:
+        orders = orders.filter(status__in=statuses)
+    return (
+        orders
+        .annotate(customer_name=CUSTOMER_NAME, customer_mobile=F('user__mobile'))
+        .values(*EXPORT_FIELDS)
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def _local_time(value):
+    return timezone.localtime(value).isoformat(timespec='seconds')
+
+
+class _Echo:
+    # csv.writer به جای نوشتن در فایل، سطر را برمی‌گرداند
+    def write(self, value):
+        return value
+
+
+# متنی که با این نویسه‌ها شروع شود را Excel/LibreOffice فرمول اجرا می‌کنند (CSV injection)؛
+# توضیحات سفارش و نام مشتری را خود مشتری می‌نویسد
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _safe_row(values):
+    return [
+        f"'{value}" if isinstance(value, str) and value.startswith(FORMULA_PREFIXES) else value
+        for value in values
+    ]
+
+
+def iter_csv(rows):
+    writer = csv.writer(_Echo())
+    # BOM تا Excel متن فارسی را درست نشان دهد
+    yield '\ufeff' + writer.writerow(CSV_HEADER)
+    for row in rows:
+        order = [
+            row['id'],
+            _local_time(row['created_at']),
+            row['status'],
+            row['table_number'],
+            row['customer_name'],
+            row['customer_mobile'],
+            int(row['total_price']),
+        ]
+        # یک سطر برای هر آیتم؛ سفارش بدون آیتم هم یک سطر دارد
+        for item in row['items_summary'] or [{}]:
+            quantity = item.get('quantity')
+            price = item.get('price')
+            line_total = quantity * price if quantity is not None and price is not None else ''
+            yield writer.writerow(_safe_row(order + [
+                item.get('id', ''),
+                item.get('name', ''),
+                quantity if quantity is not None else '',
+                price if price is not None else '',
+                line_total,
+                row['special_requests'],
+            ]))
+
+
+def iter_jsonl(rows):
+    for row in rows:
+        yield json.dumps({
+            'id': row['id'],
+            'created_at': _local_time(row['created_at']),
+            'status': row['status'],
+            'table': row['table_number'],
+            'customer': row['customer_name'],
+            'mobile': row['customer_mobile'],
+            'total': int(row['total_price']),
+            'special_requests': row['special_requests'],
+            'items': row['items_summary'],
+        }, ensure_ascii=False) + '\n'
+
+
+def iter_export(export_format, rows):
+    return iter_csv(rows) if export_format == 'csv' else iter_jsonl(rows)
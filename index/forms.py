@@ -1,16 +1,23 @@
+import json
+
 from django import forms
 
+from .models import Table
+
 
 class OrderForm(forms.Form):
     table_number = forms.CharField(
         max_length=10,
         label='شماره میز',
+        required=False,
         widget=forms.TextInput(attrs={
             'placeholder': 'مثلاً: 5',
             'class': 'form-control',
             'required': 'required'
         })
     )
+    # توکن QR روی میز (/order/?table=...)؛ اگر باشد بر شماره‌ی تایپ‌شده مقدم است
+    table_token = forms.CharField(widget=forms.HiddenInput, required=False)
     special_requests = forms.CharField(
         widget=forms.Textarea(attrs={
             'rows': 3,
@@ -19,4 +26,43 @@ class OrderForm(forms.Form):
         }),
         required=False,
         label='توضیحات'
-    )
\ No newline at end of file
+    )
+    # سبد سمت مرورگر: [{"id": ..., "quantity": ...}]؛ قیمت‌ها را سرور از MenuItem می‌خواند
+    cart = forms.CharField(widget=forms.HiddenInput, required=False)
+
+    def __init__(self, *args, table=None, **kwargs):
+        # table: میزی که از QR پیدا شده؛ شماره‌اش فقط نمایش داده می‌شود
+        if table is not None:
+            kwargs.setdefault('initial', {}).update(table_token=table.qr_token, table_number=table.number)
+        super().__init__(*args, **kwargs)
+        if table is not None:
+            self.fields['table_number'].widget.attrs['readonly'] = 'readonly'
+
+    def clean(self):
+        cleaned_data = super().clean()
+        token = cleaned_data.get('table_token')
+        number = (cleaned_data.get('table_number') or '').strip()
+        tables = Table.objects.filter(is_active=True)
+        if token:
+            table = tables.filter(qr_token=token).first()
+        elif number:
+            table = tables.filter(number=number).first()
+        else:
+            self.add_error('table_number', 'شماره میز را وارد کنید.')
+            return cleaned_data
+        if table is None:
+            self.add_error('table_number', 'میز نامعتبر است.')
+        cleaned_data['table'] = table
+        return cleaned_data
+
+    def clean_cart(self):
+        raw = self.cleaned_data['cart']
+        if not raw:
+            return []
+        try:
+            cart = json.loads(raw)
+        except ValueError:
+            raise forms.ValidationError('سبد خرید نامعتبر است.')
+        if not isinstance(cart, list) or not all(isinstance(line, dict) for line in cart):
+            raise forms.ValidationError('سبد خرید نامعتبر است.')
+        return cart
@@ -0,0 +1,155 @@
+# images.py — نسخه‌های کوچک و WebP/AVIF تصویر غذا با نام هش‌شده، ساخته‌شده در پس‌زمینه
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections
+from django.db.models import Q
+from PIL import Image, ImageOps, features
+
+from .models import MenuItem
+
+logger = logging.getLogger(__name__)
+
+NO_IMAGE_URL = '/static/no-image.jpg'
+VARIANTS_DIR = 'menu/variants'
+# فرمت: (فرمت Pillow، پسوند، MIME)
+IMAGE_FORMATS = {
+    'avif': ('AVIF', 'avif', 'image/avif'),
+    'webp': ('WEBP', 'webp', 'image/webp'),
+    'jpeg': ('JPEG', 'jpg', 'image/jpeg'),
+}
+FALLBACK_FORMAT = 'jpeg'
+
+
+def available_formats():
+    # فرمت‌هایی که Pillow نصب‌شده می‌تواند بنویسد؛ jpeg برای مرورگرهای قدیمی همیشه هست
+    formats = [fmt for fmt in settings.MENU_IMAGE_FORMATS if fmt == FALLBACK_FORMAT or features.check(fmt)]
+    if FALLBACK_FORMAT not in formats:
+        formats.append(FALLBACK_FORMAT)
+    return formats
+
+
+def needs_variants(item):
+    # تصویر عوض شده، اضافه شده یا پاک شده و نسخه‌ها مال تصویر قبلی‌اند
+    return (item.image.name or '') != item.image_variants.get('source', '')
+
+
+def _encode(source, width, fmt):
+    aspect_w, aspect_h = settings.MENU_IMAGE_ASPECT
+    image = ImageOps.fit(source, (width, round(width * aspect_h / aspect_w)), Image.Resampling.LANCZOS)
+    options = {'quality': settings.MENU_IMAGE_QUALITY}
+    if fmt == 'jpeg':
+        options.update(optimize=True, progressive=True)
+    buffer = BytesIO()
+    image.save(buffer, IMAGE_FORMATS[fmt][0], **options)
+    return buffer.getvalue()
+
+
+def build_variants(item_id):
+    """
+    نسخه‌های تصویر یک غذا را می‌سازد و در image_variants ثبت می‌کند. نام فایل‌ها شامل هش
+    محتوای تصویر اصلی است؛ فایلی که از قبل وجود دارد دوباره ساخته نمی‌شود.
+    """
+    item = MenuItem.objects.filter(id=item_id).only('id', 'image', 'image_variants').first()
+    if item is None:
+        return
+    old_variants = item.image_variants
+
+    if item.image:
+        with item.image.open('rb') as f:
+            data = f.read()
+        digest = hashlib.sha256(data).hexdigest()[:16]
+        source = ImageOps.exif_transpose(Image.open(BytesIO(data))).convert('RGB')
+        # بزرگ‌نمایی فایده ندارد؛ حداقل کوچک‌ترین اندازه ساخته می‌شود
+        widths = [w for w in settings.MENU_IMAGE_WIDTHS if w <= source.width] or [min(settings.MENU_IMAGE_WIDTHS)]
+        files = {}
+        for fmt in available_formats():
+            files[fmt] = {}
+            for width in widths:
+                name = f'{VARIANTS_DIR}/{item.id}-{digest}-{width}.{IMAGE_FORMATS[fmt][1]}'
+                if not default_storage.exists(name):
+                    name = default_storage.save(name, ContentFile(_encode(source, width, fmt)))
+                files[fmt][str(width)] = name
+        variants = {'source': item.image.name, 'files': files}
+        same_image = Q(image=item.image.name)
+    else:
+        variants = {}
+        same_image = Q(image='') | Q(image__isnull=True)
+
+    # اگر در این فاصله تصویر دوباره عوض شده باشد، نوبت بعدی صف آن را می‌سازد
+    if MenuItem.objects.filter(same_image, id=item.id).update(image_variants=variants):
+        from .menu import bump_menu_version  # menu.py خودش image_urls را از این ماژول می‌خواند
+
+        delete_variant_files(old_variants, keep=variants)
+        bump_menu_version()
+
+
+def delete_variant_files(variants, keep=None):
+    keep_names = {name for sizes in (keep or {}).get('files', {}).values() for name in sizes.values()}
+    for sizes in variants.get('files', {}).values():
+        for name in sizes.values():
+            if name not in keep_names:
+                default_storage.delete(name)
+
+
+def image_urls(item):
+    # آدرس‌های تصویر برای قالب و JSON منو؛ تا ساخته شدن نسخه‌ها، تصویر اصلی
+    files = item.image_variants.get('files') if item.image and not needs_variants(item) else None
+    if not files:
+        url = item.image.url if item.image else NO_IMAGE_URL
+        return {'image_url': url, 'image_thumb': url, 'image_sources': [], 'srcset': {}}
+
+    srcset = {
+        fmt: ', '.join(f'{default_storage.url(name)} {width}w' for width, name in sorted(sizes.items(), key=lambda s: int(s[0])))
+        for fmt, sizes in files.items()
+    }
+    fallback = sorted(files[FALLBACK_FORMAT].items(), key=lambda s: int(s[0]))
+    return {
+        # img src برای مرورگرهای بدون srcset: اندازه‌ی میانی
+        'image_url': default_storage.url(fallback[len(fallback) // 2][1]),
+        'image_thumb': default_storage.url(fallback[0][1]),
+        # <source> ها به ترتیب ترجیح؛ jpeg در خود <img> است
+        'image_sources': [
+            {'type': IMAGE_FORMATS[fmt][2], 'srcset': srcset[fmt]}
+            for fmt in settings.MENU_IMAGE_FORMATS if fmt in srcset and fmt != FALLBACK_FORMAT
+        ],
+        'srcset': srcset,
+    }
+
+
+# --- صف پس‌زمینه ---
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.MENU_IMAGE_WORKERS,
+                thread_name_prefix='menu-images',
+            )
+        return _executor
+
+
+def _build_in_background(item_id):
+    try:
+        build_variants(item_id)
+    except Exception:
+        logger.exception("ساخت نسخه‌های تصویر غذای %s ناموفق بود", item_id)
+    finally:
+        close_old_connections()
+
+
+def schedule_variants(item_id):
+    # درخواست ادمین منتظر تغییر اندازه‌ی تصویر نمی‌ماند؛ MENU_IMAGE_ASYNC=False برای اجرای هم‌زمان
+    if not settings.MENU_IMAGE_ASYNC:
+        return build_variants(item_id)
+    return _get_executor().submit(_build_in_background, item_id)
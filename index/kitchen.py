@@ -0,0 +1,86 @@
+# kitchen.py — جمع تعداد هر غذا در سفارش‌های تأییدشده و در حال پخت (نمایشگر آشپزخانه)
+import logging
+import time
+
+from django.core.cache import cache
+from django.db.models import Sum
+
+from .models import Order, OrderItem
+
+logger = logging.getLogger(__name__)
+
+KITCHEN_STATUSES = ('confirmed', 'preparing')
+KITCHEN_VERSION_KEY = 'kitchen:version'
+KITCHEN_LOCK_KEY = 'kitchen:lock'
+# اگر به‌روزرسانی تدریجی جایی خطا کرده باشد، حداکثر بعد از این مدت از دیتابیس بازسازی می‌شود
+KITCHEN_TIMEOUT = 10 * 60
+
+
+def _totals_key():
+    return f'kitchen:totals:{cache.get_or_set(KITCHEN_VERSION_KEY, time.time_ns, timeout=None)}'
+
+
+def invalidate_kitchen_totals():
+    # نسخه‌ی جدید = کلید جدید؛ نوشتن دیرهنگام روی نسخه‌ی قبلی بی‌اثر می‌شود
+    cache.set(KITCHEN_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def compute_kitchen_totals():
+    # یک GROUP BY روی OrderItem
+    rows = (
+        OrderItem.objects
+        .filter(order__status__in=KITCHEN_STATUSES)
+        .values('menu_item_id', 'menu_item__name', 'order__status')
+        .annotate(quantity=Sum('quantity'))
+        .order_by()
+    )
+    totals = {}
+    for row in rows:
+        entry = totals.setdefault(row['menu_item_id'], {'name': row['menu_item__name'], 'confirmed': 0, 'preparing': 0})
+        entry[row['order__status']] += row['quantity']
+    return totals
+
+
+def get_kitchen_totals():
+    key = _totals_key()
+    totals = cache.get(key)
+    if totals is None:
+        totals = compute_kitchen_totals()
+        cache.set(key, totals, KITCHEN_TIMEOUT)
+    return totals
+
+
+def apply_kitchen_change(order_id, from_status, to_status, items_summary=None):
+    # به‌روزرسانی تدریجی بعد از تغییر وضعیت یک سفارش (بعد از commit صدا زده شود)
+    if from_status not in KITCHEN_STATUSES and to_status not in KITCHEN_STATUSES:
+        return
+    if not cache.add(KITCHEN_LOCK_KEY, 1, 5):
+        # پروسس دیگری در حال نوشتن است؛ به جای انتظار، دفعه‌ی بعد از دیتابیس بخوان
+        invalidate_kitchen_totals()
+        return
+    try:
+        key = _totals_key()
+        totals = cache.get(key)
+        if totals is None:
+            invalidate_kitchen_totals()
+            return
+        if items_summary is None:
+            items_summary = Order.objects.filter(id=order_id).values_list('items_summary', flat=True).first() or []
+        if any('id' not in item for item in items_summary):
+            # سفارش قدیمی بدون شناسه‌ی غذا در خلاصه
+            invalidate_kitchen_totals()
+            return
+        for item in items_summary:
+            entry = totals.setdefault(item['id'], {'name': item['name'], 'confirmed': 0, 'preparing': 0})
+            if from_status in KITCHEN_STATUSES:
+                entry[from_status] = max(0, entry[from_status] - item['quantity'])
+            if to_status in KITCHEN_STATUSES:
+                entry[to_status] += item['quantity']
+            if not entry['confirmed'] and not entry['preparing']:
+                del totals[item['id']]
+        cache.set(key, totals, KITCHEN_TIMEOUT)
+    except Exception as e:
+        logger.warning("به‌روزرسانی نمایشگر آشپزخانه ناموفق بود: %s", e)
+        invalidate_kitchen_totals()
+    finally:
+        cache.delete(KITCHEN_LOCK_KEY)
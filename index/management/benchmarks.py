@@ -0,0 +1,170 @@
+# ابزار مشترک دستورهای benchmark / تست بار
+import os
+import random
+import tempfile
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test import override_settings
+from django.utils import timezone
+
+from index.models import Category, MenuItem, Order, OrderItem, Table
+from index.reports import rebuild_sales_rollups
+
+User = get_user_model()
+
+
+@contextmanager
+def temporary_database():
+    # همه‌ی benchmark ها روی یک دیتابیس موقت با پروفایل فعلی اجرا می‌شوند، نه دیتابیس اصلی؛
+    # کش هم یک LocMemCache خصوصی است تا منو/session دیتابیس موقت به کش مشترک (redis/file) نرسد
+    # و پاک کردن آن به کش سرویس اصلی دست نزند
+    if connection.vendor == 'sqlite':
+        # دیتابیس تست فایلی تا WAL و قفل‌های واقعی فایل سنجیده شوند (نه حافظه)
+        connection.settings_dict['TEST']['NAME'] = os.path.join(tempfile.mkdtemp(), 'benchmark.sqlite3')
+    old_name = connection.settings_dict['NAME']
+    private_cache = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'benchmark'}
+    with override_settings(CACHES={alias: private_cache for alias in settings.CACHES}):
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        if connection.vendor == 'sqlite':
+            # پروفایل استقرار (SQLITE_PATH) با WAL اجرا می‌شود؛ حالت journal روی خود فایل ماندگار است
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode=WAL')
+        try:
+            yield
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+# --- داده‌ی مصنوعی ---
+# (دسته، تعداد ایستگاه): [(غذا، قیمت، زمان پخت)]
+DEMO_MENU = {
+    ('پیش‌غذا', 2): [('سوپ جو', 120000, 5), ('سالاد شیرازی', 90000, 3), ('کشک بادمجان', 150000, 8)],
+    ('غذای اصلی', 4): [
+        ('کباب کوبیده', 250000, 15), ('جوجه کباب', 280000, 18),
+        ('قورمه سبزی', 220000, 10), ('زرشک پلو با مرغ', 260000, 12),
+    ],
+    ('نوشیدنی', 1): [('دوغ', 40000, 0), ('نوشابه', 35000, 0), ('چای', 20000, 0)],
+    ('دسر', 1): [('بستنی سنتی', 80000, 0), ('فالوده', 70000, 0)],
+}
+# ساعت‌های شلوغ (ناهار و شام) و وزنشان در توزیع سفارش‌های روز
+SERVICE_HOURS = [(12, 2), (13, 3), (14, 2), (19, 2), (20, 4), (21, 4), (22, 2)]
+
+
+def seed_menu():
+    menu_items = []
+    for (category_name, stations), items in DEMO_MENU.items():
+        category, _ = Category.objects.get_or_create(name=category_name, defaults={'stations': stations})
+        for name, price, cooking_time in items:
+            menu_item, _ = MenuItem.objects.get_or_create(
+                name=name, category=category, defaults={'price': price, 'cooking_time': cooking_time},
+            )
+            menu_items.append(menu_item)
+    return menu_items
+
+
+def seed_tables(count):
+    existing = set(Table.objects.values_list('number', flat=True))
+    Table.objects.bulk_create([
+        Table(number=str(number)) for number in range(1, count + 1) if str(number) not in existing
+    ])
+    return list(Table.objects.filter(is_active=True).order_by('id'))
+
+
+def seed_users(prefix, count, role='customer', first_name='کاربر'):
+    # شماره‌ها با پیش‌شماره‌ی ثابت ساخته می‌شوند تا اجرای دوباره کاربر تکراری نسازد
+    mobiles = [f'{prefix}{i:07d}' for i in range(count)]
+    User.objects.bulk_create([
+        User(mobile=mobile, username=mobile, role=role, first_name=first_name, last_name=str(i + 1))
+        for i, mobile in enumerate(mobiles)
+    ], ignore_conflicts=True)
+    return list(User.objects.filter(mobile__in=mobiles).order_by('id'))
+
+
+@contextmanager
+def _historic_timestamps():
+    # created_at/updated_at با auto_now پر می‌شوند؛ برای سفارش‌های ماه‌های گذشته مقدار خودمان نوشته شود
+    fields = [Order._meta.get_field('created_at'), Order._meta.get_field('updated_at')]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def seed_order_history(customers, waiters, tables, menu_items, days, orders_per_day, rng, batch_size=2000):
+    """
+    سفارش‌های تحویل‌شده‌ی days روز گذشته (تا دیروز) با آیتم‌ها و زمان هر مرحله، به صورت
+    bulk_create دسته‌ای. خلاصه‌های فروش بعد از آن بازسازی می‌شوند.
+    """
+    today = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+    hours, weights = zip(*SERVICE_HOURS)
+    pending = []
+    created = 0
+
+    def flush():
+        nonlocal created
+        with transaction.atomic():
+            Order.objects.bulk_create([order for order, _ in pending])
+            OrderItem.objects.bulk_create([item for order, items in pending for item in items])
+        created += len(pending)
+        pending.clear()
+
+    with _historic_timestamps():
+        for day in range(days, 0, -1):
+            day_start = today - timedelta(days=day)
+            for _ in range(orders_per_day):
+                created_at = day_start + timedelta(hours=rng.choices(hours, weights)[0], seconds=rng.randrange(3600))
+                table = rng.choice(tables)
+                order = Order(
+                    user=rng.choice(customers),
+                    table=table,
+                    table_number=table.number,
+                    status='delivered',
+                    created_at=created_at,
+                    updated_at=created_at,
+                    delivered_by=rng.choice(waiters),
+                )
+                items = [
+                    OrderItem(order=order, menu_item=menu_item, quantity=rng.randint(1, 3), price_at_order=menu_item.price)
+                    for menu_item in rng.sample(menu_items, rng.randint(1, 4))
+                ]
+                order.total_price = sum(item.quantity * item.price_at_order for item in items)
+                order.apply_item_summary(items)
+                order.confirmed_at = created_at + timedelta(minutes=rng.randint(1, 5))
+                order.cooking_start_time = order.confirmed_at + timedelta(minutes=rng.randint(0, 10))
+                order.ready_at = order.cooking_start_time + timedelta(minutes=order.estimated_cooking_time)
+                order.delivered_at = order.updated_at = order.ready_at + timedelta(minutes=rng.randint(1, 8))
+                pending.append((order, items))
+                if len(pending) >= batch_size:
+                    flush()
+        if pending:
+            flush()
+    rebuild_sales_rollups()
+    return created
+
+
+def seed_restaurant(customers=200, chefs=3, waiters=4, tables=30, days=90, orders_per_day=150, seed=0):
+    rng = random.Random(seed)
+    menu_items = seed_menu()
+    table_list = seed_tables(tables)
+    staff = {
+        'manager': seed_users('0991', 1, 'manager', 'مدیر'),
+        'chef': seed_users('0992', chefs, 'chef', 'آشپز'),
+        'waiter': seed_users('0993', waiters, 'waiter', 'گارسون'),
+    }
+    customer_list = seed_users('0990', customers)
+    orders = seed_order_history(customer_list, staff['waiter'], table_list, menu_items, days, orders_per_day, rng)
+    return {
+        'menu_items': menu_items,
+        'tables': table_list,
+        'customers': customer_list,
+        'staff': staff,
+        'orders': orders,
+    }
@@ -0,0 +1,80 @@
+import json
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from index.management.benchmarks import temporary_database
+from index.menu import bump_menu_version
+from index.models import Category, MenuItem
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'زمان رندر صفحه‌ی اصلی و منو (میلی‌ثانیه) روی دیتابیس موقت: منوی سرد (نسخه‌ی تازه، '
+        'snapshot و fragment ها ساخته می‌شوند) در برابر منوی گرم (fragment ها از کش). خروجی JSON.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=200)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        with temporary_database():
+            self._seed(options['items'], options['categories'])
+            client = Client()
+            client.force_login(User.objects.create_user('09000000000', role='customer'))
+            repeat = options['repeat']
+
+            results = {
+                'home': self._measure(client, '/', repeat),
+                'menu_cold': self._measure(client, '/order/', repeat, before=bump_menu_version),
+                'menu_warm': self._measure(client, '/order/', repeat),
+            }
+
+        self.stdout.write(json.dumps({
+            'items': options['items'],
+            'categories': options['categories'],
+            'repeat': options['repeat'],
+            'results': results,
+        }, indent=2))
+
+    def _seed(self, item_count, category_count):
+        categories = Category.objects.bulk_create([
+            Category(name=f'دسته {i}') for i in range(category_count)
+        ])
+        MenuItem.objects.bulk_create([
+            MenuItem(
+                name=f'غذای {i}',
+                price=100000 + i * 1000,
+                category=categories[i % category_count],
+                description='توضیح کوتاه غذا برای کارت منو',
+                cooking_time=10,
+            )
+            for i in range(item_count)
+        ])
+        bump_menu_version()
+
+    def _measure(self, client, url, repeat, before=None):
+        client.get(url)  # گرم کردن قالب‌ها در cached loader
+        timings = []
+        for _ in range(repeat):
+            if before:
+                before()
+            started = time.perf_counter()
+            response = client.get(url)
+            timings.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                raise CommandError(f'{url} پاسخ {response.status_code} داد.')
+        timings.sort()
+        return {
+            'p50_ms': round(statistics.median(timings), 3),
+            'p95_ms': round(timings[int(len(timings) * 0.95) - 1], 3),
+            'mean_ms': round(statistics.fmean(timings), 3),
+            'bytes': len(response.content),
+        }
@@ -0,0 +1,80 @@
+import json
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from index.management.benchmarks import temporary_database
+from index.models import Order
+from index.serializers import order_rows, serialize_order_rows
+
+User = get_user_model()
+
+ROLE_FEEDS = {
+    'manager': None,
+    'chef': ['confirmed', 'preparing', 'ready'],
+    'waiter': ['ready'],
+}
+STATUSES = ['pending', 'confirmed', 'preparing', 'ready']
+
+
+class Command(BaseCommand):
+    help = 'هزینه‌ی سریال‌سازی هر سفارش در فید پنل‌ها (میکروثانیه) برای تعداد سفارش‌های باز داده‌شده. خروجی JSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('sizes', nargs='*', type=int, default=[1000, 10000])
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        results = []
+        with temporary_database():
+            customers = User.objects.bulk_create([
+                User(mobile=f'0910{i:07d}', username=f'bench{i}', first_name='مشتری', last_name=str(i))
+                for i in range(200)
+            ])
+            created = 0
+            for size in sorted(options['sizes']):
+                self._seed(customers, created, size)
+                created = size
+                results.append({'orders': size, 'roles': self._measure(options['repeat'])})
+
+        self.stdout.write(json.dumps({'results': results}, indent=2))
+
+    def _seed(self, customers, start, stop):
+        items_summary = [
+            {'name': 'کباب کوبیده', 'quantity': 2, 'price': 250000},
+            {'name': 'دوغ', 'quantity': 1, 'price': 40000},
+        ]
+        now = timezone.now()
+        Order.objects.bulk_create([
+            Order(
+                user=customers[i % len(customers)],
+                table_number=str(i % 60 + 1),
+                status=STATUSES[i % len(STATUSES)],
+                total_price=540000,
+                estimated_cooking_time=20,
+                item_count=3,
+                items_summary=items_summary,
+                cooking_start_time=now if STATUSES[i % len(STATUSES)] == 'preparing' else None,
+            )
+            for i in range(start, stop)
+        ], batch_size=1000)
+
+    def _measure(self, repeat):
+        results = {}
+        for role, statuses in ROLE_FEEDS.items():
+            orders = Order.objects.all() if statuses is None else Order.objects.filter(status__in=statuses)
+            timings = []
+            count = 0
+            for _ in range(repeat):
+                started = time.perf_counter()
+                count = len(serialize_order_rows(order_rows(orders), role))
+                timings.append(time.perf_counter() - started)
+            best = min(timings)
+            results[role] = {
+                'orders': count,
+                'best_seconds': round(best, 4),
+                'us_per_order': round(best / count * 1_000_000, 2) if count else None,
+            }
+        return results
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from index.images import build_variants, needs_variants
+from index.models import MenuItem
+
+
+class Command(BaseCommand):
+    help = (
+        'ساخت نسخه‌های کوچک و WebP/AVIF تصویر غذاها (هم‌زمان، بدون صف پس‌زمینه). '
+        'پیش‌فرض فقط غذاهایی که نسخه‌هایشان به‌روز نیست.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='همه‌ی غذاها؛ مثلاً بعد از تغییر MENU_IMAGE_WIDTHS یا MENU_IMAGE_FORMATS',
+        )
+
+    def handle(self, *args, **options):
+        built = 0
+        for item in MenuItem.objects.only('id', 'image', 'image_variants').order_by('id'):
+            if not options['all'] and not needs_variants(item):
+                continue
+            try:
+                build_variants(item.id)
+            except Exception as e:
+                self.stderr.write(self.style.ERROR(f'{item}: {e}'))
+                continue
+            built += 1
+        self.stdout.write(self.style.SUCCESS(f'نسخه‌های تصویر {built} غذا ساخته شد.'))
@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from index.exports import EXPORT_CHUNK_SIZE, EXPORT_FORMATS, export_rows, iter_export
+from index.models import Order
+
+
+class Command(BaseCommand):
+    help = (
+        'خروجی سفارش‌ها و آیتم‌هایشان به CSV یا JSONL. سفارش‌ها تکه‌تکه خوانده و نوشته می‌شوند '
+        'و مصرف حافظه به حجم خروجی بستگی ندارد.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=EXPORT_FORMATS, default='csv')
+        parser.add_argument('--from', dest='start', help='YYYY-MM-DD')
+        parser.add_argument('--to', dest='end', help='YYYY-MM-DD')
+        parser.add_argument(
+            '--status', action='append', choices=[status for status, _ in Order.STATUS_CHOICES],
+            help='قابل تکرار؛ پیش‌فرض همه‌ی وضعیت‌ها',
+        )
+        parser.add_argument('--output', '-o', help='مسیر فایل خروجی (پیش‌فرض stdout)')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        start = self._date(options['start'])
+        end = self._date(options['end'])
+        rows = export_rows(start, end, options['status'], chunk_size=options['chunk_size'])
+        chunks = iter_export(options['format'], rows)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8', newline='') as output:
+                output.writelines(chunks)
+            self.stderr.write(self.style.SUCCESS(f"خروجی در {options['output']} نوشته شد."))
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+
+    def _date(self, value):
+        if not value:
+            return None
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise CommandError(f'تاریخ نامعتبر: {value} (باید YYYY-MM-DD باشد)')
+        return parsed
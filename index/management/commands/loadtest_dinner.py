@@ -0,0 +1,349 @@
+import json
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import HTTPRedirectHandler, Request, build_opener
+
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.db import close_old_connections, connection
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from index.management.benchmarks import seed_restaurant, temporary_database
+from index.models import Order
+
+# secret ثابت CSRF (۳۲ کاراکتر): کوکی و هدر X-CSRFToken یکی هستند، بدون خواندن صفحه
+CSRF_SECRET = 'dinner' * 5 + 'lt'
+
+
+class _NoRedirect(HTTPRedirectHandler):
+    # ریدایرکت بعد از ثبت سفارش موفقیت است؛ صفحه‌ی بعدی جزو زمان این درخواست نیست
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class _QuietRequestHandler(WSGIRequestHandler):
+    # پاسخ‌های 400 رقابت تبلت‌ها بخشی از سناریوست، نه خطای سرور
+    def log_message(self, format, *args):
+        pass
+
+
+# سروری که نتیجه را می‌سازد؛ در خروجی JSON هم نوشته می‌شود
+SERVERS = {
+    'wsgi': 'WSGIHandler روی ThreadedWSGIServer جنگو (یک thread برای هر درخواست)؛ SSE رد می‌شود و پنل‌ها فقط polling دارند',
+    'asgi': 'ASGIHandler روی uvicorn (ویوهای sync در executor جنگو)؛ پرسنل به /api/events/ وصل‌اند و با هر رویداد زودتر fetch می‌کنند',
+}
+
+
+@contextmanager
+def _wsgi_server():
+    httpd = ThreadedWSGIServer(('127.0.0.1', 0), _QuietRequestHandler, allow_reuse_address=False)
+    httpd.set_app(WSGIHandler())
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{httpd.server_port}'
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+        thread.join()
+
+
+@contextmanager
+def _asgi_server():
+    try:
+        import uvicorn
+    except ImportError:
+        raise CommandError('برای --server asgi بسته‌ی uvicorn لازم است (pip install uvicorn).')
+    server = uvicorn.Server(uvicorn.Config(
+        ASGIHandler(), host='127.0.0.1', port=0, lifespan='off', log_level='warning', timeout_graceful_shutdown=1,
+    ))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise CommandError('سرور uvicorn بالا نیامد.')
+        time.sleep(0.05)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f'http://127.0.0.1:{port}'
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+class _Recorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {}  # endpoint -> [ثانیه]
+        self.errors = {}
+        self.events = 0  # پیام‌های SSE دریافتی پرسنل
+
+    def record(self, endpoint, seconds, ok):
+        with self._lock:
+            self.samples.setdefault(endpoint, []).append(seconds)
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def record_event(self):
+        with self._lock:
+            self.events += 1
+
+    def summary(self, elapsed):
+        return {
+            endpoint: {
+                'requests': len(samples),
+                'errors': self.errors.get(endpoint, 0),
+                'throughput': round(len(samples) / elapsed, 1) if elapsed else None,
+                **_distribution(samples, 1000, '_ms'),
+            }
+            for endpoint, samples in sorted(self.samples.items())
+        }
+
+
+def _percentile(ordered, p):
+    # nearest-rank
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def _distribution(samples, scale, suffix):
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+    stats = {f'p{p}': _percentile(ordered, p) for p in (50, 95, 99)}
+    stats['max'] = ordered[-1]
+    return {f'{key}{suffix}': round(value * scale, 2) for key, value in stats.items()}
+
+
+class _VirtualUser:
+    # یک کاربر HTTP با session از پیش لاگین‌شده روی سرور محلی
+    def __init__(self, base_url, user, recorder):
+        client = Client()
+        client.force_login(user)
+        self.base_url = base_url
+        self.recorder = recorder
+        self.cookie = (
+            f'{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}; '
+            f'{settings.CSRF_COOKIE_NAME}={CSRF_SECRET}'
+        )
+        self.opener = build_opener(_NoRedirect)
+
+    def request(self, endpoint, path, data=None, params=None):
+        headers = {'Cookie': self.cookie}
+        body = None
+        if data is not None:
+            headers['X-CSRFToken'] = CSRF_SECRET
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+            body = urlencode(data).encode()
+        url = self.base_url + path + (f'?{urlencode(params)}' if params else '')
+        started = time.perf_counter()
+        try:
+            with self.opener.open(Request(url, data=body, headers=headers), timeout=30) as response:
+                status, payload = response.status, response.read()
+        except HTTPError as e:
+            status, payload = e.code, e.read()
+        except URLError:
+            status, payload = None, b''
+        self.recorder.record(endpoint, time.perf_counter() - started, status is not None and status < 400)
+        return status, payload
+
+    def listen(self, path, wake, streams):
+        # مثل EventSource پنل: هر پیام data یک fetch زودتر؛ با بستن stream (پایان سناریو) تمام می‌شود
+        try:
+            stream = self.opener.open(Request(self.base_url + path, headers={'Cookie': self.cookie}), timeout=60)
+        except (HTTPError, URLError):
+            return
+        streams.append(stream)
+        try:
+            for line in stream:
+                if line.startswith(b'data:'):
+                    self.recorder.record_event()
+                    wake.set()
+        except (OSError, ValueError, AttributeError):
+            pass  # stream از thread سناریو بسته شد (http.client در این حالت fp را None می‌کند)
+
+
+class Command(BaseCommand):
+    help = (
+        'شبیه‌سازی سرویس شام روی یک سرور محلی و دیتابیس موقت (با تاریخچه‌ی مصنوعی): مشتری‌ها منو را '
+        'باز و سفارش ثبت می‌کنند، مدیر/آشپزها/گارسون‌ها با polling پنل‌ها سفارش‌ها را تا تحویل جلو می‌برند. '
+        'خروجی JSON: throughput و p50/p95/p99 هر endpoint. --server انتخاب می‌کند کدام مسیر سنجیده شود: '
+        'wsgi (پیش‌فرض، WSGIHandler) یا asgi (ASGIHandler روی uvicorn، همراه SSE پنل‌ها).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--customers', type=int, default=40)
+        parser.add_argument('--orders-per-customer', type=int, default=1)
+        parser.add_argument('--concurrency', type=int, default=16, help='مشتری‌های همزمان')
+        parser.add_argument('--arrival-window', type=float, default=10, help='ثانیه؛ پخش ورود مشتری‌ها')
+        parser.add_argument('--chefs', type=int, default=2)
+        parser.add_argument('--waiters', type=int, default=3)
+        parser.add_argument('--poll-interval', type=float, default=0.5)
+        parser.add_argument('--history-days', type=int, default=30)
+        parser.add_argument('--orders-per-day', type=int, default=150)
+        parser.add_argument('--timeout', type=float, default=300)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--server', choices=sorted(SERVERS), default='wsgi')
+        parser.add_argument('--output', help='نوشتن نتیجه‌ی JSON در فایل برای مقایسه بین نسخه‌ها')
+
+    def handle(self, *args, **options):
+        with temporary_database():
+            data = seed_restaurant(
+                customers=options['customers'],
+                chefs=options['chefs'],
+                waiters=options['waiters'],
+                days=options['history_days'],
+                orders_per_day=options['orders_per_day'],
+                seed=options['seed'],
+            )
+            serve = _asgi_server if options['server'] == 'asgi' else _wsgi_server
+            with serve() as base_url:
+                result = self._run(base_url, data, options)
+
+        output = json.dumps(result, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(output + '\n')
+        self.stdout.write(output)
+
+    def _run(self, base_url, data, options):
+        recorder = _Recorder()
+        rng = random.Random(options['seed'])
+        menu_ids = [item.id for item in data['menu_items']]
+        expected = options['customers'] * options['orders_per_customer']
+        progress = {'placed': 0, 'delivered': 0, 'customers_done': False}
+        lock = threading.Lock()
+        stop = threading.Event()
+        streams = []  # اتصال‌های SSE باز، برای بستن در پایان
+
+        def customer(user, arrival, table, carts):
+            client = _VirtualUser(base_url, user, recorder)
+            time.sleep(max(0, started + arrival - time.perf_counter()))
+            for cart in carts:
+                client.request('order_menu', reverse('index:order_menu'), params={'table': table.qr_token})
+                status, _ = client.request('place_order', reverse('index:place_order'), {
+                    'table_token': table.qr_token,
+                    'special_requests': '',
+                    'cart': json.dumps(cart),
+                })
+                if status == 302:
+                    with lock:
+                        progress['placed'] += 1
+            close_old_connections()
+
+        def staff(user, role, index, count):
+            client = _VirtualUser(base_url, user, recorder)
+            feed, actions = STAFF_FLOWS[role]
+            orders, cursor = {}, None
+            wake = threading.Event()
+            if options['server'] == 'asgi':
+                threading.Thread(
+                    target=client.listen, args=(reverse('index:order_events'), wake, streams), daemon=True,
+                ).start()
+            while not stop.is_set():
+                status, payload = client.request(feed, reverse(f'index:{feed}'), params={'since': cursor} if cursor else None)
+                if status == 200:
+                    body = json.loads(payload)
+                    cursor = body['cursor']
+                    for order_id in body['removed']:
+                        orders.pop(order_id, None)
+                    for order in body['orders']:
+                        orders[int(order['id'].split('-')[1])] = order['status']
+                for order_id, order_status in list(orders.items()):
+                    action = actions.get(order_status)
+                    if action is None or order_id % count != index:
+                        continue
+                    status, payload = client.request(action, reverse(f'index:{action}', args=[order_id]), {})
+                    if status != 200:
+                        continue
+                    orders[order_id] = json.loads(payload)['order_status']
+                    if action == 'deliver_order':
+                        with lock:
+                            progress['delivered'] += 1
+                with lock:
+                    if progress['customers_done'] and progress['delivered'] >= progress['placed']:
+                        stop.set()
+                # poll بعدی، یا زودتر اگر رویداد SSE رسید
+                if wake.wait(options['poll_interval']):
+                    wake.clear()
+            close_old_connections()
+
+        staff_users = [
+            (user, role, index, len(users))
+            for role, users in data['staff'].items()
+            for index, user in enumerate(users)
+        ]
+        customer_args = [
+            (
+                user,
+                rng.uniform(0, options['arrival_window']),
+                rng.choice(data['tables']),
+                [
+                    [{'id': item_id, 'quantity': rng.randint(1, 3)} for item_id in rng.sample(menu_ids, rng.randint(1, 4))]
+                    for _ in range(options['orders_per_customer'])
+                ],
+            )
+            for user in data['customers']
+        ]
+
+        started = time.perf_counter()
+        staff_threads = [threading.Thread(target=staff, args=args, daemon=True) for args in staff_users]
+        for thread in staff_threads:
+            thread.start()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            list(pool.map(lambda args: customer(*args), customer_args))
+        with lock:
+            progress['customers_done'] = True
+        stop.wait(options['timeout'])
+        stop.set()
+        for thread in staff_threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        for stream in list(streams):
+            stream.close()
+
+        today = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+        turnaround = [
+            (delivered_at - created_at).total_seconds()
+            for created_at, delivered_at in Order.objects
+            .filter(created_at__gte=today, delivered_at__isnull=False)
+            .values_list('created_at', 'delivered_at')
+        ]
+        return {
+            'profile': connection.vendor,
+            'server': {'name': options['server'], 'measures': SERVERS[options['server']], 'sse_events': recorder.events},
+            'scenario': {
+                key: options[key]
+                for key in ('customers', 'orders_per_customer', 'concurrency', 'arrival_window', 'chefs',
+                            'waiters', 'poll_interval', 'history_days', 'orders_per_day', 'seed')
+            },
+            'seconds': round(elapsed, 3),
+            'orders': {
+                'expected': expected,
+                'placed': progress['placed'],
+                'delivered': progress['delivered'],
+                'history': data['orders'],
+                # از ثبت تا تحویل
+                'turnaround': _distribution(turnaround, 1, '_seconds'),
+            },
+            'endpoints': recorder.summary(elapsed),
+        }
+
+
+# نقش -> (فید پنل، {وضعیت در فید: اقدام})؛ فید آشپز سفارش تأییدشده را pending نشان می‌دهد
+STAFF_FLOWS = {
+    'manager': ('get_manager_orders', {'pending': 'confirm_order'}),
+    'chef': ('get_chef_orders', {'pending': 'start_cooking', 'preparing': 'finish_cooking'}),
+    'waiter': ('get_waiter_orders', {'ready': 'deliver_order'}),
+}
@@ -0,0 +1,96 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+from django.test import Client
+
+from index.management.benchmarks import temporary_database
+from index.models import MenuItem, Order
+
+User = get_user_model()
+
+# (نام endpoint، نقش، مسیر) به ترتیب چرخه‌ی عمر سفارش
+TRANSITIONS = [
+    ('confirm_order', 'manager', '/api/manager/confirm/{}/'),
+    ('start_cooking', 'chef', '/api/chef/start/{}/'),
+    ('finish_cooking', 'chef', '/api/chef/finish/{}/'),
+    ('deliver_order', 'waiter', '/api/waiter/deliver/{}/'),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'تست بار endpoint های تغییر وضعیت سفارش روی یک دیتابیس موقت با پروفایل فعلی '
+        '(DJANGO_DB=sqlite|postgres). خروجی JSON است.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=200)
+        parser.add_argument('--threads', type=int, default=8)
+
+    def handle(self, *args, **options):
+        with temporary_database():
+            results = self._run(options['orders'], options['threads'])
+
+        self.stdout.write(json.dumps({
+            'profile': connection.vendor,
+            'orders': options['orders'],
+            'threads': options['threads'],
+            'results': results,
+        }, indent=2))
+
+    def _run(self, order_count, threads):
+        staff = {
+            role: User.objects.create_user(f'0900000000{i}', role=role, first_name=role)
+            for i, role in enumerate(['manager', 'chef', 'waiter'])
+        }
+        menu_item = MenuItem.objects.create(name='loadtest', price=100000, cooking_time=10)
+        orders = Order.objects.bulk_create([
+            Order(
+                user=staff['manager'],
+                table_number=str(i % 60 + 1),
+                total_price=menu_item.price,
+                estimated_cooking_time=menu_item.cooking_time,
+                item_count=1,
+                items_summary=[{'id': menu_item.id, 'name': menu_item.name, 'quantity': 1, 'price': int(menu_item.price)}],
+            )
+            for i in range(order_count)
+        ])
+        order_ids = [order.id for order in orders]
+
+        # هر thread کلاینت لاگین‌شده‌ی خودش را دارد؛ لاگین خارج از زمان‌سنجی انجام می‌شود
+        clients = {}
+        for role, user in staff.items():
+            clients[role] = []
+            for _ in range(threads):
+                client = Client()
+                client.force_login(user)
+                clients[role].append(client)
+
+        results = {}
+        for name, role, url in TRANSITIONS:
+            chunks = [order_ids[i::threads] for i in range(threads)]
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                statuses = pool.map(
+                    lambda args: self._worker(*args),
+                    [(clients[role][i], url, chunk) for i, chunk in enumerate(chunks)],
+                )
+                statuses = [status for chunk in statuses for status in chunk]
+            elapsed = time.perf_counter() - started
+            results[name] = {
+                'requests': len(statuses),
+                'errors': sum(1 for status in statuses if status != 200),
+                'seconds': round(elapsed, 4),
+                'throughput': round(len(statuses) / elapsed, 1) if elapsed else None,
+            }
+        return results
+
+    def _worker(self, client, url, order_ids):
+        statuses = [client.post(url.format(order_id)).status_code for order_id in order_ids]
+        close_old_connections()
+        connection.close()
+        return statuses
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from index.reports import rebuild_sales_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        'بازسازی جدول‌های خلاصه‌ی فروش (روزانه، ساعتی، غذا، گارسون) از روی سفارش‌های تحویل‌شده. '
+        'بدون --from/--to کل تاریخچه بازسازی می‌شود.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='start', help='YYYY-MM-DD')
+        parser.add_argument('--to', dest='end', help='YYYY-MM-DD')
+
+    def handle(self, *args, **options):
+        try:
+            start = parse_date(options['start']) if options['start'] else None
+            end = parse_date(options['end']) if options['end'] else None
+        except ValueError as e:
+            raise CommandError(e)
+        if (options['start'] and start is None) or (options['end'] and end is None):
+            raise CommandError('تاریخ باید به شکل YYYY-MM-DD باشد.')
+
+        counts = rebuild_sales_rollups(start, end)
+        self.stdout.write(self.style.SUCCESS(
+            'بازسازی شد: {daily} روز، {hourly} ساعت، {items} ردیف غذا، {waiters} ردیف گارسون'.format(**counts)
+        ))
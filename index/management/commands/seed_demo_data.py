@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from index.management.benchmarks import seed_restaurant
+
+
+class Command(BaseCommand):
+    help = (
+        'ساخت داده‌ی مصنوعی در دیتابیس فعلی: منو، میزها، کارکنان، مشتری‌ها و سفارش‌های تحویل‌شده‌ی '
+        'روزهای گذشته (برای توسعه و benchmark). اجرای دوباره کاربر/غذای تکراری نمی‌سازد ولی سفارش اضافه می‌کند.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--customers', type=int, default=200)
+        parser.add_argument('--chefs', type=int, default=3)
+        parser.add_argument('--waiters', type=int, default=4)
+        parser.add_argument('--tables', type=int, default=30)
+        parser.add_argument('--days', type=int, default=90)
+        parser.add_argument('--orders-per-day', type=int, default=150)
+        parser.add_argument('--seed', type=int, default=0, help='seed تصادفی برای تکرارپذیری')
+
+    def handle(self, *args, **options):
+        if min(options['customers'], options['chefs'], options['waiters'], options['tables']) < 1:
+            raise CommandError('تعداد مشتری، آشپز، گارسون و میز باید حداقل ۱ باشد.')
+
+        started = time.perf_counter()
+        data = seed_restaurant(
+            customers=options['customers'],
+            chefs=options['chefs'],
+            waiters=options['waiters'],
+            tables=options['tables'],
+            days=options['days'],
+            orders_per_day=options['orders_per_day'],
+            seed=options['seed'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"ساخته شد: {len(data['menu_items'])} غذا، {len(data['tables'])} میز، "
+            f"{len(data['customers'])} مشتری، {data['orders']} سفارش "
+            f"({time.perf_counter() - started:.1f} ثانیه)"
+        ))
@@ -0,0 +1,58 @@
+# menu.py — snapshot کش‌شده‌ی منو، با نسخه‌ای که با هر تغییر غذا/دسته‌بندی عوض می‌شود
+import json
+import time
+
+from django.core.cache import cache
+
+from .images import image_urls
+from .models import Category, MenuItem
+
+MENU_VERSION_KEY = 'menu:version'
+MENU_SNAPSHOT_TIMEOUT = 60 * 60 * 24
+
+
+def get_menu_version():
+    # اگر کلید از کش پاک شده باشد نسخه‌ی تازه ساخته می‌شود؛ snapshot قدیمی دیگر خوانده نمی‌شود
+    return cache.get_or_set(MENU_VERSION_KEY, time.time_ns, timeout=None)
+
+
+def bump_menu_version():
+    cache.set(MENU_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def _build_snapshot():
+    categories = [{'id': cat.id, 'name': cat.name} for cat in Category.objects.all()]
+    menu_items = [{
+        'id': item.id,
+        'name': item.name,
+        'price': int(item.price),
+        'description': item.description,
+        'category_id': item.category_id,
+        **image_urls(item),
+    } for item in MenuItem.objects.filter(is_available=True)]
+
+    # image: کوچک‌ترین نسخه برای سبد خرید؛ srcset: {فرمت: "url 320w, url 640w, ..."}
+    menu_items_json = json.dumps([{
+        'id': item['id'],
+        'name': item['name'],
+        'price': item['price'],
+        'image': item['image_thumb'],
+        'srcset': item['srcset'],
+    } for item in menu_items], ensure_ascii=False)
+
+    return {
+        'categories': categories,
+        'menu_items': menu_items,
+        'menu_items_json': menu_items_json,
+    }
+
+
+def get_menu_snapshot():
+    # context قالب منو شامل JSON از پیش ساخته‌شده و نسخه‌ی منو
+    version = get_menu_version()
+    key = f'menu:snapshot:{version}'
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = {**_build_snapshot(), 'menu_version': version}
+        cache.set(key, snapshot, MENU_SNAPSHOT_TIMEOUT)
+    return snapshot
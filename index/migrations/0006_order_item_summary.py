@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("index", "0005_order_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="order",
+            name="estimated_cooking_time",
+            field=models.PositiveIntegerField(
+                default=0, help_text="زمان پخت تخمینی به دقیقه"
+            ),
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="item_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="items_summary",
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
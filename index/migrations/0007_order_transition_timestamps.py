@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("index", "0006_order_item_summary"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="order",
+            name="confirmed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="delivered_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="ready_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
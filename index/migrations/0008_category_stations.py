@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("index", "0007_order_transition_timestamps"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="stations",
+            field=models.PositiveIntegerField(
+                default=1, help_text="تعداد ایستگاه پخت همزمان برای این دسته"
+            ),
+        ),
+    ]
@@ -0,0 +1,152 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("index", "0008_category_stations"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailySales",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField(unique=True)),
+                ("order_count", models.PositiveIntegerField(default=0)),
+                (
+                    "revenue",
+                    models.DecimalField(decimal_places=0, default=0, max_digits=14),
+                ),
+            ],
+            options={
+                "verbose_name": "فروش روزانه",
+                "verbose_name_plural": "فروش روزانه",
+            },
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="delivered_by",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="delivered_orders",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.CreateModel(
+            name="HourlySales",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("hour", models.PositiveSmallIntegerField()),
+                ("order_count", models.PositiveIntegerField(default=0)),
+                (
+                    "revenue",
+                    models.DecimalField(decimal_places=0, default=0, max_digits=14),
+                ),
+            ],
+            options={
+                "verbose_name": "فروش ساعتی",
+                "verbose_name_plural": "فروش ساعتی",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("date", "hour"), name="hourly_sales_date_hour_uniq"
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="ItemSales",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("menu_item_id", models.PositiveIntegerField()),
+                ("name", models.CharField(max_length=100)),
+                ("quantity", models.PositiveIntegerField(default=0)),
+                (
+                    "revenue",
+                    models.DecimalField(decimal_places=0, default=0, max_digits=14),
+                ),
+            ],
+            options={
+                "verbose_name": "فروش غذا",
+                "verbose_name_plural": "فروش غذاها",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("date", "menu_item_id"),
+                        name="item_sales_date_item_uniq",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="WaiterSales",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("order_count", models.PositiveIntegerField(default=0)),
+                (
+                    "revenue",
+                    models.DecimalField(decimal_places=0, default=0, max_digits=14),
+                ),
+                (
+                    "waiter",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "فروش گارسون",
+                "verbose_name_plural": "فروش گارسون\u200cها",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("date", "waiter"), name="waiter_sales_date_waiter_uniq"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("index", "0009_sales_rollups"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="menuitem",
+            name="image_variants",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
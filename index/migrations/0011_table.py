@@ -0,0 +1,84 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:34
+
+import django.db.models.deletion
+import index.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+def link_existing_orders(apps, schema_editor):
+    # برای هر شماره‌ی میز ثبت‌شده در سفارش‌های قبلی یک Table ساخته و سفارش‌ها به آن وصل می‌شوند
+    Order = apps.get_model("index", "Order")
+    Table = apps.get_model("index", "Table")
+    raw_numbers = {
+        raw: raw.strip()
+        for raw in Order.objects.values_list("table_number", flat=True).distinct()
+        if raw.strip()
+    }
+    tables = {
+        table.number: table
+        for table in Table.objects.bulk_create(
+            [Table(number=number) for number in set(raw_numbers.values())]
+        )
+    }
+    for raw, number in raw_numbers.items():
+        Order.objects.filter(table_number=raw).update(table=tables[number])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("index", "0010_menuitem_image_variants"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Table",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("number", models.CharField(max_length=10, unique=True)),
+                ("seats", models.PositiveSmallIntegerField(default=4)),
+                (
+                    "qr_token",
+                    models.CharField(
+                        default=index.models.new_table_token,
+                        editable=False,
+                        max_length=32,
+                        unique=True,
+                    ),
+                ),
+                ("is_active", models.BooleanField(default=True)),
+            ],
+            options={
+                "verbose_name": "میز",
+                "verbose_name_plural": "میزها",
+            },
+        ),
+        migrations.AddField(
+            model_name="order",
+            name="table",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="orders",
+                to="index.table",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["status", "table"], name="order_status_table_idx"
+            ),
+        ),
+        migrations.RunPython(link_existing_orders, migrations.RunPython.noop),
+    ]
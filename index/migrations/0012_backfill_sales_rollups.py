@@ -0,0 +1,95 @@
+from django.db import migrations
+from django.db.models import Count, DecimalField, F, Max, Sum
+from django.db.models.functions import Coalesce, ExtractHour, TruncDate
+from django.utils import timezone
+
+
+def backfill_sales_rollups(apps, schema_editor):
+    # جدول‌های خلاصه (0009) برای سفارش‌های تحویل‌شده‌ی قبلی خالی ساخته شدند. همان GROUP BY های
+    # index.reports.rebuild_sales_rollups، ولی با مدل‌های تاریخی تا فیلدهای بعدی migrate را نشکنند.
+    Order = apps.get_model("index", "Order")
+    OrderItem = apps.get_model("index", "OrderItem")
+    DailySales = apps.get_model("index", "DailySales")
+    HourlySales = apps.get_model("index", "HourlySales")
+    ItemSales = apps.get_model("index", "ItemSales")
+    WaiterSales = apps.get_model("index", "WaiterSales")
+
+    tz = timezone.get_current_timezone()
+    totals = {"order_count": Count("id"), "revenue": Sum("total_price")}
+    orders = (
+        Order.objects.filter(status="delivered")
+        .annotate(sold_at=Coalesce("delivered_at", "created_at"))
+        .annotate(day=TruncDate("sold_at", tzinfo=tz))
+    )
+    items = (
+        OrderItem.objects.filter(order__status="delivered")
+        .annotate(sold_at=Coalesce("order__delivered_at", "order__created_at"))
+        .annotate(day=TruncDate("sold_at", tzinfo=tz))
+    )
+
+    daily = [
+        DailySales(
+            date=row["day"], order_count=row["order_count"], revenue=row["revenue"]
+        )
+        for row in orders.values("day").annotate(**totals).order_by()
+    ]
+    hourly = [
+        HourlySales(
+            date=row["day"],
+            hour=row["hour"],
+            order_count=row["order_count"],
+            revenue=row["revenue"],
+        )
+        for row in orders.annotate(hour=ExtractHour("sold_at", tzinfo=tz))
+        .values("day", "hour")
+        .annotate(**totals)
+        .order_by()
+    ]
+    waiters = [
+        WaiterSales(
+            date=row["day"],
+            waiter_id=row["delivered_by"],
+            order_count=row["order_count"],
+            revenue=row["revenue"],
+        )
+        for row in orders.values("day", "delivered_by").annotate(**totals).order_by()
+    ]
+    item_rows = [
+        ItemSales(
+            date=row["day"],
+            menu_item_id=row["menu_item"],
+            name=row["name"],
+            quantity=row["sold"],
+            revenue=row["revenue"],
+        )
+        for row in items.values("day", "menu_item")
+        .annotate(
+            name=Max("menu_item__name"),
+            sold=Sum("quantity"),
+            revenue=Sum(
+                F("quantity") * F("price_at_order"),
+                output_field=DecimalField(max_digits=14, decimal_places=0),
+            ),
+        )
+        .order_by()
+    ]
+
+    for model, rows in (
+        (DailySales, daily),
+        (HourlySales, hourly),
+        (WaiterSales, waiters),
+        (ItemSales, item_rows),
+    ):
+        model.objects.all().delete()
+        model.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("index", "0011_table"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_sales_rollups, migrations.RunPython.noop),
+    ]
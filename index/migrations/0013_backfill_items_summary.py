@@ -0,0 +1,51 @@
+from django.db import migrations
+
+
+def backfill_items_summary(apps, schema_editor):
+    # 0006 فیلدهای خلاصه را برای سفارش‌های قبلی خالی گذاشت؛ پنل‌ها فقط items_summary را می‌خوانند.
+    # همان محاسبه‌ی Order.apply_item_summary از روی ردیف‌های OrderItem (مدل تاریخی متد ندارد)
+    Order = apps.get_model("index", "Order")
+    OrderItem = apps.get_model("index", "OrderItem")
+    order_ids = Order.objects.filter(items_summary=[]).values_list("id", flat=True)
+    items_by_order = {}
+    for item in (
+        OrderItem.objects.filter(order_id__in=list(order_ids))
+        .select_related("menu_item")
+        .order_by("id")
+    ):
+        items_by_order.setdefault(item.order_id, []).append(item)
+
+    orders = []
+    for order in Order.objects.filter(id__in=items_by_order):
+        items = items_by_order[order.id]
+        unique_items = {item.menu_item.id: item.menu_item for item in items}
+        order.estimated_cooking_time = sum(
+            menu_item.cooking_time for menu_item in unique_items.values()
+        )
+        order.item_count = sum(item.quantity for item in items)
+        order.items_summary = [
+            {
+                "id": item.menu_item.id,
+                "name": item.menu_item.name,
+                "quantity": item.quantity,
+                "price": int(item.price_at_order),
+            }
+            for item in items
+        ]
+        orders.append(order)
+    Order.objects.bulk_update(
+        orders,
+        ["estimated_cooking_time", "item_count", "items_summary"],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("index", "0012_backfill_sales_rollups"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_items_summary, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,8 @@
+import secrets
+
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.urls import reverse
 
 User = get_user_model()
 
@@ -7,6 +10,7 @@ User = get_user_model()
 class Category(models.Model):
     name = models.CharField(max_length=50, unique=True)
     icon = models.CharField(max_length=50, blank=True, help_text="مثلاً: fa-utensils")
+    stations = models.PositiveIntegerField(default=1, help_text="تعداد ایستگاه پخت همزمان برای این دسته")
 
     def __str__(self):
         return self.name
@@ -20,6 +24,8 @@ class MenuItem(models.Model):
     name = models.CharField(max_length=100)
     price = models.DecimalField(max_digits=10, decimal_places=0)
     image = models.ImageField(upload_to='menu/', blank=True, null=True)
+    # نسخه‌های کوچک/WebP/AVIF تصویر (index.images)؛ {'source': نام تصویر اصلی, 'files': {فرمت: {عرض: نام}}}
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, related_name='items')
     description = models.TextField(blank=True)
     cooking_time = models.PositiveIntegerField(default=0, help_text="زمان پخت به دقیقه")
@@ -33,6 +39,28 @@ class MenuItem(models.Model):
         verbose_name_plural = "غذاها"
 
 
+def new_table_token():
+    return secrets.token_urlsafe(16)
+
+
+class Table(models.Model):
+    number = models.CharField(max_length=10, unique=True)
+    seats = models.PositiveSmallIntegerField(default=4)
+    # کد QR روی میز به order_url اشاره می‌کند؛ با توکن تصادفی، نه شماره‌ی قابل حدس
+    qr_token = models.CharField(max_length=32, unique=True, default=new_table_token, editable=False)
+    is_active = models.BooleanField(default=True)
+
+    def __str__(self):
+        return f"میز {self.number}"
+
+    def order_url(self):
+        return f"{reverse('index:order_menu')}?table={self.qr_token}"
+
+    class Meta:
+        verbose_name = "میز"
+        verbose_name_plural = "میزها"
+
+
 class Order(models.Model):
     STATUS_CHOICES = (
         ('pending', 'در انتظار تأیید'),
@@ -43,12 +71,27 @@ class Order(models.Model):
     )
 
     user = models.ForeignKey(User, on_delete=models.CASCADE)
+    table = models.ForeignKey(Table, on_delete=models.PROTECT, null=True, blank=True, related_name='orders')
+    # شماره‌ی میز هنگام ثبت از Table کپی می‌شود تا فیدها و خروجی‌ها join نزنند
     table_number = models.CharField(max_length=10)
     special_requests = models.TextField(blank=True)
     total_price = models.DecimalField(max_digits=10, decimal_places=0, default=0)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     created_at = models.DateTimeField(auto_now_add=True)
+    # زمان هر تغییر وضعیت (توسط index.services.transition_order ثبت می‌شود)
+    confirmed_at = models.DateTimeField(null=True, blank=True)
     cooking_start_time = models.DateTimeField(null=True, blank=True)
+    ready_at = models.DateTimeField(null=True, blank=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+    delivered_by = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, related_name='delivered_orders'
+    )
+    # نشانگر تغییر برای API های «تغییرات از زمان ...» پنل‌ها
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # خلاصه‌ی آیتم‌ها هنگام ثبت سفارش محاسبه و ذخیره می‌شود تا فیدها به OrderItem/MenuItem join نزنند
+    estimated_cooking_time = models.PositiveIntegerField(default=0, help_text="زمان پخت تخمینی به دقیقه")
+    item_count = models.PositiveIntegerField(default=0)
+    items_summary = models.JSONField(default=list, blank=True)
 
     def __str__(self):
         return f"سفارش {self.id} - میز {self.table_number}"
@@ -56,15 +99,115 @@ class Order(models.Model):
     def calculate_total(self):
         total = sum(item.quantity * item.price_at_order for item in self.items.all())
         self.total_price = total
-        self.save(update_fields=['total_price'])
+        self.save(update_fields=['total_price', 'updated_at'])
 
     def calculate_cooking_time(self):
         # زمان کل = مجموع زمان پخت آیتم‌های منحصر به فرد (بدون ضرب در quantity، چون همزمان پخته می‌شوند)
         unique_items = set(item.menu_item for item in self.items.all())
         return sum(item.cooking_time for item in unique_items)
 
+    def apply_item_summary(self, items):
+        # items: OrderItem هایی که menu_item آن‌ها از قبل بارگذاری شده (بدون کوئری اضافه)
+        unique_items = {item.menu_item.id: item.menu_item for item in items}
+        self.estimated_cooking_time = sum(menu_item.cooking_time for menu_item in unique_items.values())
+        self.item_count = sum(item.quantity for item in items)
+        self.items_summary = [{
+            'id': item.menu_item.id,
+            'name': item.menu_item.name,
+            'quantity': item.quantity,
+            'price': int(item.price_at_order),
+        } for item in items]
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # فیلتر وضعیت پنل‌ها + مرتب‌سازی زمانی
+            models.Index(fields=['status', 'created_at'], name='order_status_created_idx'),
+            # صفحه‌بندی keyset لیست مدیر
+            models.Index(fields=['created_at', 'id'], name='order_created_id_idx'),
+            # حساب باز میزها (GROUP BY table روی سفارش‌های تحویل‌نشده) و صورت‌حساب یک میز
+            models.Index(fields=['status', 'table'], name='order_status_table_idx'),
+        ]
+
+
+class OrderTombstone(models.Model):
+    # سفارش حذف‌شده (ردشده یا حذف از ادمین/با کاربر) از delta پنل‌ها دیده نمی‌شود؛ این ردیف
+    # (از سیگنال post_delete) به پنل‌ها خبر می‌دهد که آن را از لیست بردارند
+    order_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"سفارش حذف‌شده {self.order_id}"
+
+
+# --- جدول‌های خلاصه‌ی فروش ---
+# با تحویل هر سفارش (index.reports.record_delivery) به‌صورت تدریجی به‌روز می‌شوند؛
+# گزارش‌ها به‌جای اسکن Order فقط این ردیف‌ها را می‌خوانند. روز و ساعت به وقت محلی (TIME_ZONE) هستند.
+class DailySales(models.Model):
+    date = models.DateField(unique=True)
+    order_count = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=0, default=0)
+
+    def __str__(self):
+        return f"فروش {self.date}"
+
+    class Meta:
+        verbose_name = "فروش روزانه"
+        verbose_name_plural = "فروش روزانه"
+
+
+class HourlySales(models.Model):
+    date = models.DateField()
+    hour = models.PositiveSmallIntegerField()
+    order_count = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=0, default=0)
+
+    def __str__(self):
+        return f"فروش {self.date} ساعت {self.hour}"
+
+    class Meta:
+        verbose_name = "فروش ساعتی"
+        verbose_name_plural = "فروش ساعتی"
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'hour'], name='hourly_sales_date_hour_uniq'),
+        ]
+
+
+class ItemSales(models.Model):
+    # شناسه و نام غذا کپی می‌شوند تا حذف غذا از منو سابقه‌ی فروش را پاک نکند
+    date = models.DateField()
+    menu_item_id = models.PositiveIntegerField()
+    name = models.CharField(max_length=100)
+    quantity = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=0, default=0)
+
+    def __str__(self):
+        return f"{self.name} - {self.date}"
+
+    class Meta:
+        verbose_name = "فروش غذا"
+        verbose_name_plural = "فروش غذاها"
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'menu_item_id'], name='item_sales_date_item_uniq'),
+        ]
+
+
+class WaiterSales(models.Model):
+    # waiter خالی: سفارش‌هایی که قبل از ثبت delivered_by تحویل شده‌اند
+    date = models.DateField()
+    waiter = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    order_count = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=0, default=0)
+
+    def __str__(self):
+        return f"فروش {self.waiter} - {self.date}"
+
+    class Meta:
+        verbose_name = "فروش گارسون"
+        verbose_name_plural = "فروش گارسون‌ها"
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'waiter'], name='waiter_sales_date_waiter_uniq'),
+        ]
 
 
 class OrderItem(models.Model):
@@ -0,0 +1,149 @@
+# reports.py — نگهداری جدول‌های خلاصه‌ی فروش و گزارش مدیر از روی آن‌ها
+from datetime import datetime, time, timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DecimalField, F, Max, Sum
+from django.db.models.functions import Coalesce, ExtractHour, TruncDate
+from django.utils import timezone
+
+from .models import DailySales, HourlySales, ItemSales, Order, OrderItem, WaiterSales
+from .serializers import display_name
+
+REVENUE_FIELD = DecimalField(max_digits=14, decimal_places=0)
+
+
+def _bump(model, keys, deltas, defaults=None, create=True):
+    # UPDATE ... SET x = x + delta؛ اگر ردیف نبود INSERT (در رقابت دو INSERT، دومی UPDATE می‌شود)
+    increments = {field: F(field) + value for field, value in deltas.items()}
+    if model.objects.filter(**keys).update(**increments) or not create:
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**keys, **deltas, **(defaults or {}))
+    except IntegrityError:
+        model.objects.filter(**keys).update(**increments)
+
+
+def record_delivery(total_price, items_summary, delivered_at, waiter_id, sign=1):
+    """
+    سفارش تحویل‌شده را به خلاصه‌های روز/ساعت/غذا/گارسون اضافه می‌کند (sign=-1 برای
+    برگرداندن، مثلاً وقتی سفارش تحویل‌شده حذف می‌شود). باید در همان تراکنش تغییر وضعیت صدا زده شود.
+    """
+    local = timezone.localtime(delivered_at)
+    day = local.date()
+    create = sign > 0
+    order_deltas = {'order_count': sign, 'revenue': sign * total_price}
+
+    _bump(DailySales, {'date': day}, order_deltas, create=create)
+    _bump(HourlySales, {'date': day, 'hour': local.hour}, order_deltas, create=create)
+    _bump(WaiterSales, {'date': day, 'waiter_id': waiter_id}, order_deltas, create=create)
+    for item in items_summary:
+        if item.get('id') is None:
+            continue  # خلاصه‌ی قدیمی بدون شناسه‌ی غذا
+        _bump(
+            ItemSales,
+            {'date': day, 'menu_item_id': item['id']},
+            {'quantity': sign * item['quantity'], 'revenue': sign * item['quantity'] * item['price']},
+            defaults={'name': item['name']},
+            create=create,
+        )
+
+
+# --- بازسازی از روی تاریخچه ---
+def day_bounds(start, end):
+    # بازه‌ی روزهای محلی [start, end] به بازه‌ی زمانی aware برای فیلتر روی ایندکس
+    tz = timezone.get_current_timezone()
+    lower = timezone.make_aware(datetime.combine(start, time.min), tz) if start else None
+    upper = timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min), tz) if end else None
+    return lower, upper
+
+
+def rebuild_sales_rollups(start=None, end=None):
+    """
+    خلاصه‌های بازه‌ی [start, end] (یا همه) را پاک و با چند GROUP BY روی Order/OrderItem
+    دوباره می‌سازد. سفارش‌های قدیمی که delivered_at ندارند به روز ثبتشان حساب می‌شوند.
+    """
+    tz = timezone.get_current_timezone()
+    lower, upper = day_bounds(start, end)
+    date_range = {}
+    if start:
+        date_range['date__gte'] = start
+    if end:
+        date_range['date__lte'] = end
+
+    orders = Order.objects.filter(status='delivered').annotate(sold_at=Coalesce('delivered_at', 'created_at'))
+    items = OrderItem.objects.filter(order__status='delivered').annotate(
+        sold_at=Coalesce('order__delivered_at', 'order__created_at'),
+    )
+    if lower:
+        orders = orders.filter(sold_at__gte=lower)
+        items = items.filter(sold_at__gte=lower)
+    if upper:
+        orders = orders.filter(sold_at__lt=upper)
+        items = items.filter(sold_at__lt=upper)
+    orders = orders.annotate(day=TruncDate('sold_at', tzinfo=tz))
+    totals = {'order_count': Count('id'), 'revenue': Sum('total_price')}
+
+    daily = [DailySales(date=row['day'], order_count=row['order_count'], revenue=row['revenue'])
+             for row in orders.values('day').annotate(**totals).order_by()]
+    hourly = [HourlySales(date=row['day'], hour=row['hour'], order_count=row['order_count'], revenue=row['revenue'])
+              for row in orders.annotate(hour=ExtractHour('sold_at', tzinfo=tz))
+              .values('day', 'hour').annotate(**totals).order_by()]
+    waiters = [WaiterSales(date=row['day'], waiter_id=row['delivered_by'],
+                           order_count=row['order_count'], revenue=row['revenue'])
+               for row in orders.values('day', 'delivered_by').annotate(**totals).order_by()]
+    item_rows = [ItemSales(date=row['day'], menu_item_id=row['menu_item'], name=row['name'],
+                           quantity=row['sold'], revenue=row['revenue'])
+                 for row in items.annotate(day=TruncDate('sold_at', tzinfo=tz))
+                 .values('day', 'menu_item')
+                 .annotate(
+                     name=Max('menu_item__name'),
+                     sold=Sum('quantity'),
+                     revenue=Sum(F('quantity') * F('price_at_order'), output_field=REVENUE_FIELD),
+                 ).order_by()]
+
+    with transaction.atomic():
+        for model, rows in ((DailySales, daily), (HourlySales, hourly), (WaiterSales, waiters), (ItemSales, item_rows)):
+            model.objects.filter(**date_range).delete()
+            model.objects.bulk_create(rows, batch_size=500)
+    return {'daily': len(daily), 'hourly': len(hourly), 'waiters': len(waiters), 'items': len(item_rows)}
+
+
+# --- گزارش مدیر ---
+def get_today_revenue():
+    today = timezone.localdate()
+    return DailySales.objects.filter(date=today).values_list('revenue', flat=True).first() or 0
+
+
+def sales_report(start, end, top_items=20):
+    # فقط جدول‌های خلاصه خوانده می‌شوند؛ هزینه به تعداد روزهای بازه بستگی دارد نه تعداد سفارش‌ها
+    date_range = {'date__gte': start, 'date__lte': end}
+    totals = {'order_count': Sum('order_count'), 'revenue': Sum('revenue')}
+
+    daily = list(DailySales.objects.filter(**date_range).order_by('date').values('date', 'order_count', 'revenue'))
+    hourly = list(HourlySales.objects.filter(**date_range).values('hour').annotate(**totals).order_by('hour'))
+    items = list(
+        ItemSales.objects.filter(**date_range)
+        .values('menu_item_id')
+        .annotate(name=Max('name'), quantity=Sum('quantity'), revenue=Sum('revenue'))
+        .order_by('-revenue')[:top_items]
+    )
+    waiters = list(
+        WaiterSales.objects.filter(**date_range)
+        .values('waiter_id')
+        .annotate(name=Max(display_name('waiter')), **totals)
+        .order_by('-revenue')
+    )
+
+    return {
+        'from': start.isoformat(),
+        'to': end.isoformat(),
+        'totals': {
+            'order_count': sum(row['order_count'] for row in daily),
+            'revenue': int(sum(row['revenue'] for row in daily)),
+        },
+        'daily': [{**row, 'date': row['date'].isoformat(), 'revenue': int(row['revenue'])} for row in daily],
+        'hourly': [{**row, 'revenue': int(row['revenue'])} for row in hourly],
+        'items': [{**row, 'revenue': int(row['revenue'])} for row in items],
+        'waiters': [{**row, 'revenue': int(row['revenue'])} for row in waiters],
+    }
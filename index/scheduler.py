@@ -0,0 +1,201 @@
+# scheduler.py — پیش‌بینی زمان شروع/آماده شدن سفارش‌ها با توجه به صف و تعداد ایستگاه‌های پخت
+import heapq
+import threading
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+
+from .menu import get_menu_version
+from .models import Category, MenuItem, Order
+
+# هر غذای منحصربه‌فرد یک سفارش یک «کار» است که یک ایستگاه از دسته‌ی خودش را به اندازه‌ی
+# cooking_time اشغال می‌کند (تعداد همزمان پخته می‌شود). سفارش‌ها به ترتیب تأیید (FIFO) زمان‌بندی
+# می‌شوند و سفارش در حال پخت ایستگاه‌هایش را از cooking_start_time گرفته است.
+
+
+class KitchenScheduler:
+    # زمان‌ها داخل کلاس ثانیه‌ی epoch (float) هستند تا بازمحاسبه‌ی صدها سفارش زیر یک میلی‌ثانیه بماند
+    def __init__(self, capacities, now, default_capacity=1):
+        self.capacities = capacities
+        self.default_capacity = default_capacity
+        self.now = now.timestamp()
+        self._orders = {}  # order_id -> (tasks, started_at)؛ ترتیب درج = ترتیب صف
+        self._reset()
+
+    def _reset(self):
+        self._stations = {}
+        self.plans = {}
+        self.sequence = []
+
+    def _schedule(self, order_id, tasks, started_at):
+        # tasks: [(menu_item_id, category_id, minutes, name)]
+        now = self.now
+        stations = self._stations
+        order_start = order_ready = None
+        for menu_item_id, category_id, minutes, name in tasks:
+            heap = stations.get(category_id)
+            if heap is None:
+                capacity = max(1, self.capacities.get(category_id, self.default_capacity))
+                heap = stations[category_id] = [now] * capacity
+            if started_at is None:
+                start = heap[0] if heap[0] > now else now
+                self.sequence.append((start, order_id, menu_item_id, name))
+            else:
+                start = started_at
+            end = start + minutes * 60
+            heapq.heapreplace(heap, end if end > now else now)
+            if order_start is None:
+                order_start, order_ready = start, end
+            else:
+                order_start = min(order_start, start)
+                order_ready = max(order_ready, end)
+        self.plans[order_id] = (order_start or now, order_ready or now)
+
+    def add_order(self, order_id, tasks, started_at=None):
+        # افزودن به انتهای صف: فقط کارهای همین سفارش زمان‌بندی می‌شوند
+        started_at = started_at.timestamp() if started_at is not None else None
+        self._orders[order_id] = (tasks, started_at)
+        self._schedule(order_id, tasks, started_at)
+
+    def start_order(self, order_id, started_at):
+        tasks, _ = self._orders[order_id]
+        self._orders[order_id] = (tasks, started_at.timestamp())
+        self.recompute()
+
+    def finish_order(self, order_id):
+        # ایستگاه‌ها آزاد می‌شوند و سفارش‌های بعدی جلو می‌افتند
+        if self._orders.pop(order_id, None) is not None:
+            self.recompute()
+
+    def recompute(self, now=None):
+        if now is not None:
+            self.now = now.timestamp()
+        self._reset()
+        started = [(order_id, entry) for order_id, entry in self._orders.items() if entry[1] is not None]
+        queued = [(order_id, entry) for order_id, entry in self._orders.items() if entry[1] is None]
+        for order_id, (tasks, started_at) in started + queued:
+            self._schedule(order_id, tasks, started_at)
+
+    def order_plans(self):
+        # {order_id: (شروع پیش‌بینی‌شده, آماده شدن پیش‌بینی‌شده)} به صورت datetime
+        return {
+            order_id: (_to_datetime(start), _to_datetime(ready))
+            for order_id, (start, ready) in self.plans.items()
+        }
+
+    def recommended_sequence(self):
+        return [
+            (_to_datetime(start), order_id, menu_item_id, name)
+            for start, order_id, menu_item_id, name in sorted(self.sequence)
+        ]
+
+
+def _to_datetime(ts):
+    return datetime.fromtimestamp(ts, tz=dt_timezone.utc)
+
+
+def _order_tasks(row, menu):
+    tasks = []
+    seen = set()
+    for item in row['items_summary']:
+        menu_item_id = item.get('id')
+        if menu_item_id is None or menu_item_id in seen:
+            continue
+        seen.add(menu_item_id)
+        cooking_time, category_id = menu.get(menu_item_id, (0, None))
+        tasks.append((menu_item_id, category_id, cooking_time, item['name']))
+    if not tasks:
+        # خلاصه‌ی قدیمی بدون شناسه‌ی غذا: کل سفارش یک کار روی ایستگاه پیش‌فرض
+        tasks.append((None, None, row['estimated_cooking_time'], ''))
+    return tasks
+
+
+def build_kitchen_scheduler(now=None):
+    now = now or timezone.now()
+    menu = {item['id']: (item['cooking_time'], item['category_id'])
+            for item in MenuItem.objects.values('id', 'cooking_time', 'category_id')}
+    capacities = dict(Category.objects.values_list('id', 'stations'))
+    scheduler = KitchenScheduler(capacities, now, settings.KITCHEN_DEFAULT_STATIONS)
+
+    rows = (
+        Order.objects
+        .filter(status__in=['confirmed', 'preparing'])
+        .order_by(F('confirmed_at').asc(nulls_first=True), 'id')
+        .values('id', 'status', 'cooking_start_time', 'items_summary', 'estimated_cooking_time')
+    )
+    started, queued = [], []
+    for row in rows:
+        (started if row['status'] == 'preparing' else queued).append(row)
+    for row in started + queued:
+        started_at = (row['cooking_start_time'] or now) if row['status'] == 'preparing' else None
+        scheduler.add_order(row['id'], _order_tasks(row, menu), started_at)
+    return scheduler
+
+
+# --- نمونه‌ی زنده در هر پروسس ---
+# هر تغییر وضعیت آشپزخانه شمارنده‌ی SCHEDULE_SEQ_KEY را در کش یک واحد بالا می‌برد. اگر شمارنده
+# با نسخه‌ی محلی برابر باشد همه‌ی تغییرات در همین پروسس به‌صورت تدریجی اعمال شده‌اند و نیازی
+# به خواندن دوباره از دیتابیس نیست؛ در غیر این صورت (تغییر در پروسس دیگر یا تغییر منو/ایستگاه‌ها)
+# بازسازی می‌شود. حذف سفارش (ادمین، CASCADE) هم از سیگنال post_delete همین مسیر را می‌رود.
+# تشخیص تغییر پروسس‌های دیگر فقط با کش مشترک (DJANGO_CACHE=file|redis) کار می‌کند؛ با locmem
+# پیش‌فرض (یک پروسس) هر worker شمارنده‌ی خودش را دارد و تغییرات بقیه را نمی‌بیند.
+SCHEDULE_SEQ_KEY = 'kitchen:schedule_seq'
+_live = {'scheduler': None, 'seq': None, 'menu_version': None}
+_live_lock = threading.Lock()
+
+
+def _current_seq():
+    return cache.get_or_set(SCHEDULE_SEQ_KEY, 0, timeout=None)
+
+
+def get_kitchen_schedule(now=None):
+    # (plans, sequence) به صورت داده‌ی مستقل؛ نمونه‌ی زنده مشترک بین threadهاست و فقط زیر قفل خوانده می‌شود
+    now = now or timezone.now()
+    with _live_lock:
+        seq = _current_seq()
+        menu_version = get_menu_version()
+        scheduler = _live['scheduler']
+        if scheduler is None or _live['seq'] != seq or _live['menu_version'] != menu_version:
+            scheduler = build_kitchen_scheduler(now)
+            _live.update(scheduler=scheduler, seq=seq, menu_version=menu_version)
+        else:
+            scheduler.recompute(now)
+        return scheduler.order_plans(), scheduler.recommended_sequence()
+
+
+def apply_schedule_change(order_id, from_status, to_status, started_at=None):
+    # بعد از commit یک تغییر وضعیت صدا زده می‌شود
+    if from_status not in ('confirmed', 'preparing') and to_status not in ('confirmed', 'preparing'):
+        return
+    with _live_lock:
+        try:
+            seq = cache.incr(SCHEDULE_SEQ_KEY)
+        except ValueError:
+            cache.set(SCHEDULE_SEQ_KEY, 1, timeout=None)
+            _live.update(scheduler=None, seq=None)
+            return
+        scheduler = _live['scheduler']
+        if scheduler is None or _live['seq'] != seq - 1:
+            # تغییری از پروسس دیگر را ندیده‌ایم؛ خواندن بعدی بازسازی می‌کند
+            _live.update(scheduler=None, seq=None)
+            return
+
+        if to_status != 'confirmed' and order_id not in scheduler.plans:
+            _live.update(scheduler=None, seq=None)
+            return
+        if to_status == 'confirmed':
+            row = Order.objects.filter(id=order_id).values('items_summary', 'estimated_cooking_time').first()
+            if row is None:
+                return
+            menu = {item['id']: (item['cooking_time'], item['category_id'])
+                    for item in MenuItem.objects.filter(id__in=[i.get('id') for i in row['items_summary']])
+                    .values('id', 'cooking_time', 'category_id')}
+            scheduler.add_order(order_id, _order_tasks(row, menu))
+        elif to_status == 'preparing':
+            scheduler.start_order(order_id, started_at or timezone.now())
+        else:
+            scheduler.finish_order(order_id)
+        _live['seq'] = seq
@@ -0,0 +1,87 @@
+# serializers.py — سریال‌سازی مشترک فید سفارش برای همه‌ی پنل‌ها
+from django.db.models import CharField, Value
+from django.db.models.functions import Coalesce, Concat, NullIf, Trim
+from django.utils import timezone
+
+# فقط ستون‌هایی که فیدها لازم دارند؛ آیتم‌ها از items_summary خود Order می‌آیند
+ORDER_FEED_FIELDS = (
+    'id',
+    'table_number',
+    'total_price',
+    'status',
+    'created_at',
+    'cooking_start_time',
+    'estimated_cooking_time',
+    'items_summary',
+    'customer_name',
+)
+
+def display_name(relation):
+    # نام کاربر در خود کوئری ساخته می‌شود: «نام نام‌خانوادگی» یا username
+    return Coalesce(
+        NullIf(
+            Trim(Concat(f'{relation}__first_name', Value(' '), f'{relation}__last_name', output_field=CharField())),
+            Value(''),
+        ),
+        f'{relation}__username',
+        output_field=CharField(),
+    )
+
+
+CUSTOMER_NAME = display_name('user')
+
+
+def order_rows(orders):
+    return orders.annotate(customer_name=CUSTOMER_NAME).values(*ORDER_FEED_FIELDS)
+
+
+def serialize_order_rows(rows, role):
+    # یک گذر روی ردیف‌های values()؛ role یکی از manager / chef / waiter
+    with_price = role == 'manager'
+    is_chef = role == 'chef'
+    now = timezone.now()
+    orders_data = []
+    for row in rows:
+        if with_price:
+            items = [{
+                'name': item['name'],
+                'quantity': item['quantity'],
+                'price': item['price'],
+                'notes': '',
+            } for item in row['items_summary']]
+        else:
+            items = [{
+                'name': item['name'],
+                'quantity': item['quantity'],
+                'notes': '',
+            } for item in row['items_summary']]
+
+        status = row['status']
+        data = {
+            'id': f"ORD-{row['id']:03d}",
+            'customer': row['customer_name'],
+            'table': row['table_number'],
+            'items': items,
+            'total': int(row['total_price']),
+            'status': status,
+            'time': row['created_at'].strftime('%H:%M'),
+            'urgent': False,
+        }
+
+        if is_chef:
+            cooking_time = row['estimated_cooking_time']
+            cooking_start_time = row['cooking_start_time']
+            # اگر در حال پخت است، زمان باقی‌مانده را محاسبه کن (برای استفاده در JS سمت کلاینت)
+            remaining_time = None
+            if status == 'preparing' and cooking_start_time:
+                elapsed = (now - cooking_start_time).total_seconds() / 60
+                remaining_time = max(0, cooking_time - elapsed)
+            data.update({
+                'status': 'pending' if status == 'confirmed' else status,
+                'cooking_time': cooking_time,
+                'remaining_time': remaining_time,
+                'cooking_start_time': cooking_start_time.isoformat() if cooking_start_time else None,
+            })
+
+        orders_data.append(data)
+    return orders_data
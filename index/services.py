@@ -0,0 +1,112 @@
+# services.py — منطق ثبت سفارش جدا از view
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from .kitchen import apply_kitchen_change
+from .models import MenuItem, Order, OrderItem
+from .reports import record_delivery
+from .scheduler import apply_schedule_change
+
+MAX_ITEM_QUANTITY = 50
+
+
+def _normalize_cart(cart):
+    # سطرهای تکراری یک غذا را یکی می‌کند: {menu_item_id: quantity}
+    quantities = {}
+    for line in cart:
+        try:
+            item_id = int(line['id'])
+            quantity = int(line['quantity'])
+        except (KeyError, TypeError, ValueError):
+            raise ValidationError('سبد خرید نامعتبر است.')
+        if quantity < 1:
+            raise ValidationError('تعداد هر غذا باید حداقل ۱ باشد.')
+        quantities[item_id] = quantities.get(item_id, 0) + quantity
+        if quantities[item_id] > MAX_ITEM_QUANTITY:
+            raise ValidationError(f'حداکثر {MAX_ITEM_QUANTITY} عدد از هر غذا قابل سفارش است.')
+    if not quantities:
+        raise ValidationError('سبد خرید خالی است.')
+    return quantities
+
+
+def create_order(user, table, special_requests, cart):
+    """
+    ثبت سفارش در یک تراکنش: یک SELECT برای غذاها، یک INSERT برای سفارش
+    و یک bulk INSERT برای آیتم‌ها. قیمت‌ها از MenuItem خوانده می‌شوند، نه از سبد.
+    جمع، زمان پخت و خلاصه‌ی آیتم‌ها همین‌جا روی Order ذخیره می‌شوند.
+    """
+    quantities = _normalize_cart(cart)
+
+    with transaction.atomic():
+        menu_items = MenuItem.objects.only('id', 'name', 'price', 'cooking_time', 'is_available').in_bulk(list(quantities))
+        unavailable = [
+            menu_items[item_id].name if item_id in menu_items else str(item_id)
+            for item_id in quantities
+            if item_id not in menu_items or not menu_items[item_id].is_available
+        ]
+        if unavailable:
+            raise ValidationError(f"این غذاها در دسترس نیستند: {'، '.join(unavailable)}")
+
+        order = Order(
+            user=user,
+            table=table,
+            table_number=table.number,
+            special_requests=special_requests,
+        )
+        items = [
+            OrderItem(
+                order=order,
+                menu_item=menu_items[item_id],
+                quantity=quantity,
+                price_at_order=menu_items[item_id].price,
+            )
+            for item_id, quantity in quantities.items()
+        ]
+        order.total_price = sum(item.quantity * item.price_at_order for item in items)
+        order.apply_item_summary(items)
+        order.save()
+        OrderItem.objects.bulk_create(items)
+
+    return order
+
+
+# --- ماشین حالت سفارش ---
+# action: (وضعیت لازم، وضعیت جدید، فیلد زمان)
+ORDER_TRANSITIONS = {
+    'confirm': ('pending', 'confirmed', 'confirmed_at'),
+    'start_cooking': ('confirmed', 'preparing', 'cooking_start_time'),
+    'finish_cooking': ('preparing', 'ready', 'ready_at'),
+    'deliver': ('ready', 'delivered', 'delivered_at'),
+}
+
+
+def transition_order(order_id, action, user=None):
+    """
+    تغییر وضعیت با یک UPDATE شرطی (WHERE status=<وضعیت لازم>)؛ از دو تبلت هم‌زمان
+    فقط یکی موفق می‌شود. خروجی: (وضعیت جدید، زمان تغییر) یا None اگر وضعیت سفارش
+    دیگر وضعیت لازم نبود. در تحویل، user گارسون است و خلاصه‌های فروش در همان تراکنش به‌روز می‌شوند.
+    """
+    from_status, to_status, time_field = ORDER_TRANSITIONS[action]
+
+    with transaction.atomic():
+        # زمان بعد از گرفتن قفل نوشتن (BEGIN IMMEDIATE ممکن است تا busy_timeout منتظر بماند)؛
+        # وگرنه updated_at ثبت‌شده چند ثانیه عقب‌تر از commit می‌افتد و cursor پنل‌ها آن را جا می‌اندازد
+        now = timezone.now()
+        fields = {time_field: now}
+        if to_status == 'delivered':
+            fields['delivered_by'] = user
+        updated = Order.objects.filter(id=order_id, status=from_status).update(
+            status=to_status,
+            updated_at=now,
+            **fields,
+        )
+        if not updated:
+            return None
+        if to_status == 'delivered':
+            row = Order.objects.filter(id=order_id).values('total_price', 'items_summary').get()
+            record_delivery(row['total_price'], row['items_summary'], now, user.id if user else None)
+
+    transaction.on_commit(lambda: apply_kitchen_change(order_id, from_status, to_status), robust=True)
+    transaction.on_commit(lambda: apply_schedule_change(order_id, from_status, to_status, now), robust=True)
+    return to_status, now
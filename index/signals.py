@@ -0,0 +1,43 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .images import delete_variant_files, needs_variants, schedule_variants
+from .kitchen import apply_kitchen_change
+from .menu import bump_menu_version
+from .models import Category, MenuItem, Order, OrderTombstone
+from .reports import record_delivery
+from .scheduler import apply_schedule_change
+
+
+# هر ذخیره/حذف غذا یا دسته‌بندی (از جمله list_editable در ادمین) نسخه‌ی منو را عوض می‌کند؛
+# بعد از commit، تا snapshot جدید از داده‌ی ثبت‌نشده ساخته نشود
+@receiver([post_save, post_delete], sender=MenuItem)
+@receiver([post_save, post_delete], sender=Category)
+def menu_changed(sender, **kwargs):
+    transaction.on_commit(bump_menu_version)
+
+
+# تصویر جدید/عوض‌شده: ساخت نسخه‌های کوچک در صف پس‌زمینه، بعد از commit
+@receiver(post_save, sender=MenuItem)
+def menu_item_image_changed(sender, instance, **kwargs):
+    if needs_variants(instance):
+        transaction.on_commit(lambda: schedule_variants(instance.id))
+
+
+@receiver(post_delete, sender=MenuItem)
+def menu_item_deleted(sender, instance, **kwargs):
+    if instance.image_variants:
+        transaction.on_commit(lambda: delete_variant_files(instance.image_variants))
+
+
+# هر حذف سفارش (رد توسط مدیر، ادمین، CASCADE حذف کاربر) به پنل‌ها، جمع و زمان‌بندی آشپزخانه خبر داده می‌شود؛
+# سفارش تحویل‌شده در همان تراکنش از خلاصه‌های فروش هم کم می‌شود
+@receiver(post_delete, sender=Order)
+def order_deleted(sender, instance, **kwargs):
+    order_id, status, items_summary = instance.id, instance.status, instance.items_summary
+    OrderTombstone.objects.create(order_id=order_id)
+    if status == 'delivered' and instance.delivered_at:
+        record_delivery(instance.total_price, items_summary, instance.delivered_at, instance.delivered_by_id, sign=-1)
+    transaction.on_commit(lambda: apply_kitchen_change(order_id, status, None, items_summary), robust=True)
+    transaction.on_commit(lambda: apply_schedule_change(order_id, status, None), robust=True)
@@ -0,0 +1,58 @@
+# tables.py — حساب باز میزها از روی سفارش‌های تحویل‌نشده
+from django.db.models import Count, Min, Q, Sum
+
+from .models import Order
+
+# سفارش‌هایی که هنوز روی حساب میز باز هستند
+OPEN_STATUSES = ['pending', 'confirmed', 'preparing', 'ready']
+
+
+def open_tabs():
+    # یک GROUP BY روی ایندکس (status, table)؛ میزهای بدون سفارش باز در خروجی نیستند
+    rows = (
+        Order.objects
+        .filter(status__in=OPEN_STATUSES, table__isnull=False)
+        .values('table_id', 'table__number', 'table__seats')
+        .annotate(
+            order_count=Count('id'),
+            item_count=Sum('item_count'),
+            total=Sum('total_price'),
+            ready_count=Count('id', filter=Q(status='ready')),
+            opened_at=Min('created_at'),
+        )
+        .order_by('table__number')
+    )
+    return [{
+        'table': row['table__number'],
+        'seats': row['table__seats'],
+        'orders': row['order_count'],
+        'items': row['item_count'],
+        'total': int(row['total']),
+        'ready': row['ready_count'],
+        'opened_at': row['opened_at'].isoformat(),
+    } for row in rows]
+
+
+def table_bill(table):
+    # صورت‌حساب باز یک میز: آیتم‌های همه‌ی سفارش‌های باز، از items_summary و بدون join
+    rows = (
+        Order.objects
+        .filter(status__in=OPEN_STATUSES, table=table)
+        .order_by('created_at')
+        .values('id', 'status', 'total_price', 'items_summary')
+    )
+    lines = {}
+    orders = []
+    for row in rows:
+        orders.append({'id': f"ORD-{row['id']:03d}", 'status': row['status'], 'total': int(row['total_price'])})
+        for item in row['items_summary']:
+            key = (item.get('id'), item['name'], item['price'])
+            line = lines.setdefault(key, {'name': item['name'], 'price': item['price'], 'quantity': 0})
+            line['quantity'] += item['quantity']
+    return {
+        'table': table.number,
+        'seats': table.seats,
+        'orders': orders,
+        'items': list(lines.values()),
+        'total': sum(order['total'] for order in orders),
+    }
@@ -1,3 +1,729 @@
-from django.test import TestCase
+import asyncio
+import csv
+import hashlib
+import io
+import json
+import shutil
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.metrics import registry
+from core.testing import QueryBudgetMixin
+
+from PIL import Image
+
+from . import events, images, scheduler
+from .kitchen import compute_kitchen_totals, get_kitchen_totals
+from .menu import get_menu_snapshot
+from .models import Category, DailySales, ItemSales, MenuItem, Order, OrderItem, Table, WaiterSales
+from .reports import rebuild_sales_rollups, sales_report
+from .services import transition_order
+
+User = get_user_model()
+
+
+def make_order(user, items, **fields):
+    # items: [(غذا، تعداد)]؛ مثل ثبت سفارش واقعی، خلاصه‌ی آیتم‌ها هم روی سفارش ذخیره می‌شود
+    order_items = [
+        OrderItem(menu_item=menu_item, quantity=quantity, price_at_order=menu_item.price)
+        for menu_item, quantity in items
+    ]
+    fields.setdefault('table_number', '1')
+    fields.setdefault('total_price', sum(item.quantity * item.price_at_order for item in order_items))
+    order = Order(user=user, **fields)
+    order.apply_item_summary(order_items)
+    order.save()
+    for item in order_items:
+        item.order = order
+    OrderItem.objects.bulk_create(order_items)
+    return order
+
+
+@override_settings(SMS_BACKEND='user.sms.LocMemBackend', SMS_ASYNC=False, MENU_IMAGE_ASYNC=False)
+class IndexQueryBudgetTests(QueryBudgetMixin, TestCase):
+    # درخواست لاگین‌شده با کش سرد: ۲ کوئری ثابت برای session و کاربر
+    statuses = [status for status, _ in Order.STATUS_CHOICES]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = User.objects.create_user('09120000000', role='customer', first_name='مشتری')
+        cls.manager = User.objects.create_user('09120000001', role='manager', first_name='مدیر')
+        cls.chef = User.objects.create_user('09120000002', role='chef', first_name='آشپز')
+        cls.waiter = User.objects.create_user('09120000003', role='waiter', first_name='گارسون')
+        cls.categories = [
+            Category.objects.create(name='غذای اصلی', stations=2),
+            Category.objects.create(name='نوشیدنی'),
+        ]
+
+    def setUp(self):
+        self.menu_items = []
+        self.tables = []
+        self.orders = 0
+
+    def reset_caches(self):
+        super().reset_caches()
+        scheduler._live.update(scheduler=None, seq=None, menu_version=None)
+
+    def grow(self, size):
+        # size غذا، size میز و size سفارش (هر کدام دو آیتم) در همه‌ی وضعیت‌ها
+        start = len(self.menu_items)
+        self.menu_items += MenuItem.objects.bulk_create([
+            MenuItem(name=f'غذا {i}', price=100000 + i, cooking_time=i % 15, category=self.categories[i % 2])
+            for i in range(start, size)
+        ])
+        self.tables += Table.objects.bulk_create([Table(number=str(i + 1)) for i in range(len(self.tables), size)])
+
+        now = timezone.now()
+        orders = []
+        for i in range(self.orders, size):
+            status = self.statuses[i % len(self.statuses)]
+            table = self.tables[i]
+            items = [
+                OrderItem(menu_item=menu_item, quantity=j + 1, price_at_order=menu_item.price)
+                for j, menu_item in enumerate({self.menu_items[i], self.menu_items[i // 2]})
+            ]
+            order = Order(
+                user=self.customer,
+                table=table,
+                table_number=table.number,
+                status=status,
+                total_price=sum(item.quantity * item.price_at_order for item in items),
+                confirmed_at=now if status != 'pending' else None,
+                cooking_start_time=now if status in ('preparing', 'ready', 'delivered') else None,
+                delivered_at=now if status == 'delivered' else None,
+                delivered_by=self.waiter if status == 'delivered' else None,
+            )
+            order.apply_item_summary(items)
+            orders.append((order, items))
+        Order.objects.bulk_create([order for order, _ in orders])
+        for order, items in orders:
+            for item in items:
+                item.order = order
+        OrderItem.objects.bulk_create([item for _, items in orders for item in items])
+        self.orders = size
+        rebuild_sales_rollups()
+
+    def new_order(self, status='pending'):
+        order = make_order(
+            self.customer,
+            [(self.menu_items[0], 1)],
+            table=self.tables[0],
+            table_number=self.tables[0].number,
+            status=status,
+            cooking_start_time=timezone.now() if status != 'pending' else None,
+        )
+        return {'order_id': order.id}
+
+    # --- منو و ثبت سفارش ---
+    def test_home(self):
+        self.assertQueryBudget(0, lambda: self.client.get(reverse('index:home')))
+
+    def test_order_menu(self):
+        self.client.force_login(self.customer)
+        self.assertQueryBudget(5, lambda: self.client.get(
+            reverse('index:order_menu'), {'table': self.tables[-1].qr_token},
+        ))
+
+    def test_sync_cart(self):
+        self.client.force_login(self.customer)
+        self.assertQueryBudget(5, lambda: self.client.post(
+            reverse('index:sync_cart'),
+            json.dumps({'cart': [{'id': item.id, 'quantity': 1} for item in self.menu_items]}),
+            content_type='application/json',
+        ))
+
+    def test_place_order(self):
+        # سبد به اندازه‌ی منو: size آیتم در یک سفارش
+        self.client.force_login(self.customer)
+        self.assertQueryBudget(8, lambda: self.client.post(reverse('index:place_order'), {
+            'table_token': self.tables[-1].qr_token,
+            'cart': json.dumps([{'id': item.id, 'quantity': 2} for item in self.menu_items]),
+        }))
+        self.assertEqual(Order.objects.filter(item_count=200).count(), 1)
+
+    # --- پنل مدیر ---
+    def test_manage_orders_page(self):
+        self.client.force_login(self.manager)
+        self.assertQueryBudget(2, lambda: self.client.get(reverse('index:manage_orders')))
+
+    def test_manager_orders_feed(self):
+        self.client.force_login(self.manager)
+        self.assertQueryBudget(3, lambda: self.client.get(reverse('index:get_manager_orders'), {'limit': 200}))
+
+    def test_manager_orders_delta(self):
+        self.client.force_login(self.manager)
+        since = int((timezone.now() - timezone.timedelta(minutes=1)).timestamp() * 1_000_000)
+        self.assertQueryBudget(5, lambda: self.client.get(reverse('index:get_manager_orders'), {'since': since}))
+
+    def test_confirm_order(self):
+        self.client.force_login(self.manager)
+        self.assertQueryBudget(5, lambda order_id: self.client.post(
+            reverse('index:confirm_order', args=[order_id]),
+        ), prepare=lambda size: self.new_order())
+
+    def test_reject_order(self):
+        self.client.force_login(self.manager)
+        self.assertQueryBudget(9, lambda order_id: self.client.post(
+            reverse('index:reject_order', args=[order_id]),
+        ), prepare=lambda size: self.new_order())
+
+    def test_sales_report(self):
+        self.client.force_login(self.manager)
+        self.assertQueryBudget(6, lambda: self.client.get(reverse('index:sales_report')))
+
+    def test_export_orders(self):
+        self.client.force_login(self.manager)
+        for export_format in ('csv', 'jsonl'):
+            with self.subTest(format=export_format):
+                self.assertQueryBudget(3, lambda: self.client.get(
+                    reverse('index:export_orders'), {'format': export_format},
+                ))
+
+    # --- پنل آشپز ---
+    def test_chef_panel_page(self):
+        self.client.force_login(self.chef)
+        self.assertQueryBudget(2, lambda: self.client.get(reverse('index:chef_panel')))
+
+    def test_chef_orders_feed(self):
+        self.client.force_login(self.chef)
+        self.assertQueryBudget(3, lambda: self.client.get(reverse('index:get_chef_orders')))
+
+    def test_start_cooking(self):
+        self.client.force_login(self.chef)
+        self.assertQueryBudget(5, lambda order_id: self.client.post(
+            reverse('index:start_cooking', args=[order_id]),
+        ), prepare=lambda size: self.new_order('confirmed'))
+
+    def test_finish_cooking(self):
+        self.client.force_login(self.chef)
+        self.assertQueryBudget(5, lambda order_id: self.client.post(
+            reverse('index:finish_cooking', args=[order_id]),
+        ), prepare=lambda size: self.new_order('preparing'))
+
+    def test_kitchen_summary(self):
+        self.client.force_login(self.chef)
+        self.assertQueryBudget(3, lambda: self.client.get(reverse('index:kitchen_summary')))
+
+    def test_kitchen_schedule(self):
+        self.client.force_login(self.chef)
+        self.assertQueryBudget(5, lambda: self.client.get(reverse('index:kitchen_schedule')))
+
+    # --- پنل گارسون ---
+    def test_waiter_panel_page(self):
+        self.client.force_login(self.waiter)
+        self.assertQueryBudget(3, lambda: self.client.get(reverse('index:waiter_panel')))
+
+    def test_waiter_orders_feed(self):
+        self.client.force_login(self.waiter)
+        self.assertQueryBudget(3, lambda: self.client.get(reverse('index:get_waiter_orders')))
+
+    def test_deliver_order(self):
+        # ردیف‌های خلاصه‌ی فروش این ساعت/غذا/گارسون از قبل هستند (حالت پایدار: فقط UPDATE)
+        self.client.force_login(self.waiter)
+
+        def ready_order(size):
+            transition_order(self.new_order('ready')['order_id'], 'deliver', user=self.waiter)
+            return self.new_order('ready')
+
+        self.assertQueryBudget(10, lambda order_id: self.client.post(
+            reverse('index:deliver_order', args=[order_id]),
+        ), prepare=ready_order)
+
+    def test_open_tabs(self):
+        self.client.force_login(self.waiter)
+        self.assertQueryBudget(3, lambda: self.client.get(reverse('index:open_tabs')))
+
+    def test_table_bill(self):
+        # همه‌ی سفارش‌ها روی یک میز: صورت‌حساب size سفارش دارد
+        self.client.force_login(self.waiter)
+        def seat_all(size):
+            Order.objects.update(table=self.tables[0], table_number=self.tables[0].number)
+            return {}
+
+        self.assertQueryBudget(4, lambda: self.client.get(
+            reverse('index:table_bill', args=[self.tables[0].number]),
+        ), prepare=seat_all)
+
+
+class OrderDeltaTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = User.objects.create_user('09120000000', role='customer', first_name='مشتری')
+        cls.manager = User.objects.create_user('09120000001', role='manager', first_name='مدیر')
+        cls.menu_item = MenuItem.objects.create(name='کباب', price=100000)
+
+    def setUp(self):
+        self.client.force_login(self.manager)
+
+    def new_order(self, user=None, status='pending'):
+        return make_order(user or self.customer, [(self.menu_item, 1)], status=status)
+
+    def delta(self, since, **params):
+        response = self.client.get(reverse('index:get_manager_orders'), {'since': since, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_late_commit_inside_overlap(self):
+        # تراکنشی که پشت قفل منتظر مانده: updated_at آن قبل از cursor پاسخ قبلی است
+        cursor = self.delta(int(timezone.now().timestamp() * 1_000_000))['cursor']
+        order = self.new_order()
+        Order.objects.filter(id=order.id).update(updated_at=timezone.now() - timezone.timedelta(seconds=20))
+        self.assertIn(f'ORD-{order.id:03d}', [row['id'] for row in self.delta(cursor)['orders']])
+
+    def test_removed_contents(self):
+        since = int(timezone.now().timestamp() * 1_000_000)
+        old = self.new_order(status='delivered')
+        Order.objects.filter(id=old.id).update(created_at=timezone.now() - timezone.timedelta(days=2))
+        fresh = self.new_order()
+        # سفارش تحویل‌شده‌ی دیروز از پنجره‌ی پیش‌فرض بیرون می‌رود ولی در window=all می‌ماند
+        self.assertEqual(self.delta(since)['removed'], [f'ORD-{old.id:03d}'])
+        data = self.delta(since, window='all')
+        self.assertEqual(data['removed'], [])
+        self.assertEqual(sorted(row['id'] for row in data['orders']), sorted(f'ORD-{o.id:03d}' for o in (old, fresh)))
+
+    def test_deletes_outside_reject_are_removed(self):
+        since = int(timezone.now().timestamp() * 1_000_000)
+        guest = User.objects.create_user('09350000001')
+        expected = sorted(f'ORD-{order.id:03d}' for order in (self.new_order(), self.new_order(user=guest)))
+        Order.objects.filter(user=self.customer).delete()
+        guest.delete()
+        self.assertEqual(sorted(self.delta(since)['removed']), expected)
+
+
+class OrderEventsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = User.objects.create_user('09120000000', role='customer', first_name='مشتری')
+        cls.waiter = User.objects.create_user('09120000003', role='waiter', first_name='گارسون')
+        cls.order = Order.objects.create(user=cls.customer, table_number='1', status='preparing', total_price=100000)
+
+    def test_wsgi_refuses_stream(self):
+        self.client.force_login(self.waiter)
+        self.assertEqual(self.client.get(reverse('index:order_events')).status_code, 204)
+
+    @mock.patch.object(events, 'POLL_SECONDS', 0.05)
+    async def test_change_from_other_process(self):
+        # تغییر بدون broker این پروسس (مثل worker دیگر) باید از دیتابیس به همه‌ی اتصال‌ها برسد
+        streams = [events.event_stream('waiter'), events.event_stream('manager')]
+        for stream in streams:
+            self.assertEqual(await anext(stream), 'retry: 3000\n\n')
+        pending = [asyncio.ensure_future(anext(stream)) for stream in streams]
+        await asyncio.sleep(0.2)
+        # یک poller برای همه‌ی اتصال‌های این loop، نه یکی برای هر تبلت
+        self.assertEqual(len(events.broker._pollers), 1)
+        self.assertFalse(any(task.done() for task in pending))
+        await Order.objects.filter(id=self.order.id).aupdate(status='ready', updated_at=timezone.now())
+        for task in pending:
+            self.assertEqual(await asyncio.wait_for(task, 2), events.format_sse({'event': 'changed'}))
+        for stream in streams:
+            await stream.aclose()
+        self.assertEqual(events.broker._pollers, {})
+
+    @mock.patch.object(events, 'POLL_SECONDS', 0.05)
+    async def test_role_filter(self):
+        # سفارش تازه‌ی pending به پنل آشپز ربطی ندارد؛ تأیید سفارش دارد
+        stream = events.event_stream('chef')
+        await anext(stream)
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.2)
+        await Order.objects.acreate(user=self.customer, table_number='2', total_price=1)
+        await asyncio.sleep(0.2)
+        self.assertFalse(pending.done())
+        await Order.objects.filter(id=self.order.id).aupdate(status='confirmed', updated_at=timezone.now())
+        self.assertEqual(await asyncio.wait_for(pending, 2), events.format_sse({'event': 'changed'}))
+        await stream.aclose()
+
+
+class RejectOrderTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = User.objects.create_user('09120000000', role='customer', first_name='مشتری')
+        cls.manager = User.objects.create_user('09120000001', role='manager', first_name='مدیر')
+        cls.waiter = User.objects.create_user('09120000003', role='waiter', first_name='گارسون')
+        cls.menu_item = MenuItem.objects.create(name='کباب', price=100000)
+
+    def setUp(self):
+        self.client.force_login(self.manager)
+        self.order = make_order(self.customer, [(self.menu_item, 2)], status='ready')
+
+    def reject(self):
+        return self.client.post(reverse('index:reject_order', args=[self.order.id]))
+
+    def test_delivered_order_leaves_rollups_once(self):
+        transition_order(self.order.id, 'deliver', user=self.waiter)
+        self.assertEqual(DailySales.objects.get().revenue, 200000)
+        self.assertEqual(self.reject().status_code, 200)
+        self.assertEqual(self.reject().status_code, 404)
+        self.assertEqual(list(DailySales.objects.values_list('order_count', 'revenue')), [(0, 0)])
+        self.assertEqual(list(ItemSales.objects.values_list('quantity', 'revenue')), [(0, 0)])
+        self.assertEqual(list(WaiterSales.objects.values_list('order_count', 'revenue')), [(0, 0)])
+
+    def test_delete_outside_reject_leaves_rollups(self):
+        # حذف از ادمین یا CASCADE حذف کاربر هم باید فروش را کم کند
+        transition_order(self.order.id, 'deliver', user=self.waiter)
+        self.customer.delete()
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(list(DailySales.objects.values_list('order_count', 'revenue')), [(0, 0)])
+        self.assertEqual(list(ItemSales.objects.values_list('quantity', 'revenue')), [(0, 0)])
+        self.assertEqual(list(WaiterSales.objects.values_list('order_count', 'revenue')), [(0, 0)])
+
+    def test_open_order_does_not_touch_rollups(self):
+        self.assertEqual(self.reject().status_code, 200)
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(DailySales.objects.exists())
+
+
+class KitchenScheduleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = User.objects.create_user('09120000000', role='customer', first_name='مشتری')
+        cls.menu_item = MenuItem.objects.create(name='کباب', price=100000, cooking_time=10)
+
+    def setUp(self):
+        cache.clear()
+        scheduler._live.update(scheduler=None, seq=None, menu_version=None)
+
+    def new_order(self):
+        return make_order(self.customer, [(self.menu_item, 1)]).id
+
+    def test_snapshot_is_not_shared(self):
+        first, second = self.new_order(), self.new_order()
+        with self.captureOnCommitCallbacks(execute=True):
+            transition_order(first, 'confirm')
+            transition_order(second, 'confirm')
+        plans, sequence = scheduler.get_kitchen_schedule()
+        self.assertEqual(list(plans), [first, second])
+        self.assertEqual([order_id for _, order_id, _, _ in sequence], [first, second])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            transition_order(first, 'start_cooking')
+            transition_order(first, 'finish_cooking')
+        # نمونه‌ی زنده عوض شده ولی پاسخ قبلی دست نخورده است
+        self.assertEqual(list(plans), [first, second])
+        self.assertEqual(list(scheduler.get_kitchen_schedule()[0]), [second])
+
+    def test_delete_outside_reject(self):
+        # حذف از ادمین/CASCADE از مسیر تدریجی هم باید از زمان‌بندی زنده خارج شود
+        first, second, third = self.new_order(), self.new_order(), self.new_order()
+        with self.captureOnCommitCallbacks(execute=True):
+            transition_order(first, 'confirm')
+            transition_order(second, 'confirm')
+        scheduler.get_kitchen_schedule()
+        with self.captureOnCommitCallbacks(execute=True):
+            Order.objects.filter(id=first).delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            transition_order(third, 'confirm')
+        self.assertEqual(list(scheduler.get_kitchen_schedule()[0]), [second, third])
+
+
+class ExportOrdersTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = User.objects.create_user('09120000000', role='customer', first_name='=HYPERLINK("x")')
+        cls.manager = User.objects.create_user('09120000001', role='manager', first_name='مدیر')
+        cls.menu_item = MenuItem.objects.create(name='کباب', price=100000)
+        cls.order = make_order(cls.customer, [(cls.menu_item, 2)], special_requests='@SUM(A1:A9)')
+
+    def export(self, export_format):
+        self.client.force_login(self.manager)
+        response = self.client.get(reverse('index:export_orders'), {'format': export_format})
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode('utf-8-sig')
+
+    def test_csv_rows(self):
+        rows = list(csv.reader(io.StringIO(self.export('csv'))))
+        self.assertEqual(len(rows), 2)
+        row = dict(zip(rows[0], rows[1]))
+        self.assertEqual(row['order_id'], str(self.order.id))
+        self.assertEqual((row['item_name'], row['quantity'], row['unit_price'], row['line_total']),
+                         ('کباب', '2', '100000', '200000'))
+        # متن کاربر به شکل فرمول اجرا نشود
+        self.assertTrue(row['customer'].startswith("'="))
+        self.assertEqual(row['special_requests'], "'@SUM(A1:A9)")
+
+    def test_jsonl_rows(self):
+        lines = self.export('jsonl').splitlines()
+        self.assertEqual(len(lines), 1)
+        row = json.loads(lines[0])
+        self.assertEqual((row['id'], row['total'], row['special_requests']), (self.order.id, 200000, '@SUM(A1:A9)'))
+        self.assertEqual([(item['name'], item['quantity']) for item in row['items']], [('کباب', 2)])
+
+
+class OrderTransitionTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = User.objects.create_user('09120000000', role='customer', first_name='مشتری')
+        cls.manager = User.objects.create_user('09120000001', role='manager', first_name='مدیر')
+        cls.waiters = [
+            User.objects.create_user(f'0912000001{i}', role='waiter', first_name='گارسون', last_name=str(i))
+            for i in range(2)
+        ]
+        cls.kebab = MenuItem.objects.create(name='کباب', price=100000)
+        cls.doogh = MenuItem.objects.create(name='دوغ', price=40000)
+
+    def new_order(self, status='pending', items=((0, 1),)):
+        menu = [self.kebab, self.doogh]
+        return make_order(self.customer, [(menu[index], quantity) for index, quantity in items], status=status).id
+
+    def post(self, user, action, order_id):
+        self.client.force_login(user)
+        return self.client.post(reverse(f'index:{action}', args=[order_id]))
+
+    def test_losing_tablet_gets_400(self):
+        # دو تبلت یک سفارش را تأیید/تحویل می‌کنند؛ دومی وضعیت لازم را پیدا نمی‌کند
+        order_id = self.new_order()
+        self.assertEqual(self.post(self.manager, 'confirm_order', order_id).json()['order_status'], 'confirmed')
+        self.assertEqual(self.post(self.manager, 'confirm_order', order_id).status_code, 400)
+
+        ready = self.new_order('ready')
+        responses = [self.post(waiter, 'deliver_order', ready).status_code for waiter in self.waiters]
+        self.assertEqual(responses, [200, 400])
+        self.assertEqual(Order.objects.get(id=ready).delivered_by, self.waiters[0])
+        self.assertEqual(DailySales.objects.get().order_count, 1)
+
+    def test_missing_order_is_404(self):
+        self.assertEqual(self.post(self.manager, 'confirm_order', 999).status_code, 404)
+
+    def test_rollups_match_rebuild(self):
+        # خلاصه‌های تدریجی هنگام تحویل باید با بازسازی از تاریخچه یکی باشند
+        orders = [
+            (self.new_order('ready', ((0, 2), (1, 1))), self.waiters[0]),
+            (self.new_order('ready', ((0, 1),)), self.waiters[1]),
+            (self.new_order('ready', ((1, 3),)), self.waiters[1]),
+        ]
+        self.new_order('ready', ((0, 5),))  # تحویل‌نشده، جزو فروش نیست
+        for order_id, waiter in orders:
+            transition_order(order_id, 'deliver', user=waiter)
+
+        today = timezone.localdate()
+        report = sales_report(today, today)
+        self.assertEqual(report['totals'], {'order_count': 3, 'revenue': 240000 + 100000 + 120000})
+        self.assertEqual(
+            {row['name']: (row['quantity'], row['revenue']) for row in report['items']},
+            {'کباب': (3, 300000), 'دوغ': (4, 160000)},
+        )
+        self.assertEqual(
+            {row['waiter_id']: (row['order_count'], row['revenue']) for row in report['waiters']},
+            {self.waiters[0].id: (1, 240000), self.waiters[1].id: (2, 220000)},
+        )
+
+        rebuild_sales_rollups()
+        self.assertEqual(sales_report(today, today), report)
+
+
+class KitchenTotalsTests(TestCase):
+    # جمع تدریجی کش‌شده باید همیشه با GROUP BY از دیتابیس یکی باشد
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = User.objects.create_user('09120000000', role='customer', first_name='مشتری')
+        cls.manager = User.objects.create_user('09120000001', role='manager', first_name='مدیر')
+        cls.chef = User.objects.create_user('09120000002', role='chef', first_name='آشپز')
+        cls.menu_items = [MenuItem.objects.create(name=name, price=100000) for name in ('کباب', 'دوغ')]
+
+    def setUp(self):
+        cache.clear()
+
+    def new_order(self, quantities):
+        items = [(menu_item, quantity) for menu_item, quantity in zip(self.menu_items, quantities) if quantity]
+        return make_order(self.customer, items).id
+
+    def step(self, user, action, order_id):
+        self.client.force_login(user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.post(reverse(f'index:{action}', args=[order_id])).status_code, 200)
+        self.assertEqual(get_kitchen_totals(), compute_kitchen_totals(), action)
+
+    def test_totals_follow_transitions(self):
+        orders = [self.new_order((2, 1)), self.new_order((1, 3)), self.new_order((4, 0))]
+        self.assertEqual(get_kitchen_totals(), {})
+        for order_id in orders:
+            self.step(self.manager, 'confirm_order', order_id)
+        self.step(self.chef, 'start_cooking', orders[0])
+        self.step(self.manager, 'reject_order', orders[1])
+        self.step(self.chef, 'finish_cooking', orders[0])
+        self.assertEqual(get_kitchen_totals(), {self.menu_items[0].id: {'name': 'کباب', 'confirmed': 4, 'preparing': 0}})
+
+    def test_delete_outside_reject(self):
+        orders = [self.new_order((2, 0)), self.new_order((2, 0))]
+        for order_id in orders:
+            self.step(self.manager, 'confirm_order', order_id)
+        with self.captureOnCommitCallbacks(execute=True):
+            Order.objects.filter(id=orders[0]).delete()
+        self.assertEqual(get_kitchen_totals(), compute_kitchen_totals())
+        self.assertEqual(get_kitchen_totals()[self.menu_items[0].id]['confirmed'], 2)
+
+
+class PlaceOrderTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = User.objects.create_user('09120000000', role='customer', first_name='مشتری')
+        cls.menu_item = MenuItem.objects.create(name='کباب', price=100000)
+        cls.table = Table.objects.create(number='5')
+
+    def setUp(self):
+        self.client.force_login(self.customer)
+        self.cart = [{'id': self.menu_item.id, 'quantity': 2}]
+
+    def place(self, **data):
+        return self.client.post(reverse('index:place_order'), {'cart': json.dumps(self.cart), **data})
+
+    def test_invalid_table_keeps_posted_cart(self):
+        response = self.place(table_number='99')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['cart'], self.cart)
+        self.assertContains(response, 'میز نامعتبر است.')
+        self.assertFalse(Order.objects.exists())
+
+    def test_success_clears_browser_cart_on_next_page(self):
+        response = self.place(table_number='5')
+        self.assertRedirects(response, reverse('index:home'), fetch_redirect_response=False)
+        self.assertEqual(Order.objects.get().item_count, 2)
+        home = self.client.get(reverse('index:home'))
+        self.assertContains(home, 'با موفقیت ثبت شد')
+        self.assertContains(home, "sessionStorage.removeItem('django_cart')")
+
+
+class OrderMenuETagTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = User.objects.create_user('09120000000', role='customer', first_name='مشتری')
+        cls.menu_item = MenuItem.objects.create(name='کباب', price=100000)
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.customer)
+
+    def test_menu_change_invalidates_etag(self):
+        first = self.client.get(reverse('index:order_menu'))
+        self.assertContains(first, '100000 تومان')
+        etag = first['ETag']
+        cached = self.client.get(reverse('index:order_menu'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+
+        # نسخه‌ی منو بعد از commit عوض می‌شود
+        with self.captureOnCommitCallbacks(execute=True):
+            self.menu_item.price = 120000
+            self.menu_item.save()
+        fresh = self.client.get(reverse('index:order_menu'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(fresh.status_code, 200)
+        self.assertNotEqual(fresh['ETag'], etag)
+        self.assertContains(fresh, '120000 تومان')
+
+
+@override_settings(MENU_IMAGE_ASYNC=False, MENU_IMAGE_FORMATS=('jpeg',), MENU_IMAGE_WIDTHS=(320, 640))
+class MenuImageVariantsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        media_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        cls.enterClassContext(override_settings(MEDIA_ROOT=media_root))
+
+    def setUp(self):
+        cache.clear()
+
+    def upload(self, color):
+        buffer = io.BytesIO()
+        Image.new('RGB', (800, 450), color).save(buffer, 'PNG')
+        return SimpleUploadedFile('kabab.png', buffer.getvalue(), content_type='image/png')
+
+    def new_item(self, color='red'):
+        with self.captureOnCommitCallbacks(execute=True):
+            item = MenuItem.objects.create(name='کباب', price=100000, image=self.upload(color))
+        item.refresh_from_db()
+        return item
+
+    def variant_names(self, item):
+        return [name for sizes in item.image_variants['files'].values() for name in sizes.values()]
+
+    def test_variants_are_built_with_hashed_names(self):
+        item = self.new_item()
+        with item.image.open('rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()[:16]
+        self.assertEqual(item.image_variants['source'], item.image.name)
+        self.assertEqual(item.image_variants['files'], {'jpeg': {
+            '320': f'{images.VARIANTS_DIR}/{item.id}-{digest}-320.jpg',
+            '640': f'{images.VARIANTS_DIR}/{item.id}-{digest}-640.jpg',
+        }})
+        for name in self.variant_names(item):
+            self.assertTrue(default_storage.exists(name))
+            with default_storage.open(name) as f:
+                width, height = Image.open(f).size
+            self.assertEqual(height * 16, width * 9)
+
+        menu = json.loads(get_menu_snapshot()['menu_items_json'])
+        self.assertEqual(menu[0]['image'], default_storage.url(item.image_variants['files']['jpeg']['320']))
+        self.assertRegex(menu[0]['srcset']['jpeg'], r'-320\.jpg 320w, .*-640\.jpg 640w$')
+
+    def test_replaced_image_deletes_old_variants(self):
+        item = self.new_item()
+        old_names = self.variant_names(item)
+        with self.captureOnCommitCallbacks(execute=True):
+            item.image = self.upload('blue')
+            item.save()
+        item.refresh_from_db()
+        self.assertEqual(item.image_variants['source'], item.image.name)
+        self.assertTrue(set(old_names).isdisjoint(self.variant_names(item)))
+        for name in old_names:
+            self.assertFalse(default_storage.exists(name))
+        for name in self.variant_names(item):
+            self.assertTrue(default_storage.exists(name))
+
+    def test_image_changed_during_build_keeps_newer_row(self):
+        item = self.new_item()
+        MenuItem.objects.filter(id=item.id).update(image_variants={})
+        encode = images._encode
+
+        def encode_then_replace(*args):
+            # ادمین وسط ساخت، تصویر را عوض می‌کند؛ UPDATE شرطی نباید نتیجه‌ی قدیمی را بنویسد
+            MenuItem.objects.filter(id=item.id).update(image='menu/other.png')
+            return encode(*args)
+
+        for name in self.variant_names(item):
+            default_storage.delete(name)
+        with mock.patch.object(images, '_encode', side_effect=encode_then_replace):
+            images.build_variants(item.id)
+        item.refresh_from_db()
+        self.assertEqual(item.image_variants, {})
+        self.assertEqual(images.image_urls(item)['srcset'], {})
+
+
+class MetricsMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.customer = User.objects.create_user('09120000000', role='customer', first_name='مشتری')
+        MenuItem.objects.create(name='کباب', price=100000)
+
+    def setUp(self):
+        cache.clear()
+        registry.reset()
+
+    def observed_queries(self):
+        stats = registry._views[('index:order_menu', 'GET')]
+        return stats.queries.count, stats.queries.sum
+
+    def fetch_menu_sync(self):
+        self.client.force_login(self.customer)
+        self.client.get(reverse('index:order_menu'))
+        return self.observed_queries()
+
+    async def test_async_chain_counts_queries(self):
+        # زنجیره‌ی ASGI همان کوئری‌های مسیر sync را می‌شمارد
+        sync_count, sync_queries = await sync_to_async(self.fetch_menu_sync)()
+        self.assertGreater(sync_queries, 0)
+
+        cache.clear()
+        registry.reset()
+        await self.async_client.aforce_login(self.customer)
+        response = await self.async_client.get(reverse('index:order_menu'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.observed_queries(), (sync_count, sync_queries))
@@ -15,15 +15,24 @@ urlpatterns = [
     path('api/manager/orders/', views.get_manager_orders, name='get_manager_orders'),
     path('api/manager/confirm/<int:order_id>/', views.confirm_order, name='confirm_order'),
     path('api/manager/reject/<int:order_id>/', views.reject_order, name='reject_order'),
+    path('api/manager/reports/', views.sales_report_view, name='sales_report'),
+    path('api/manager/export/', views.export_orders, name='export_orders'),
     
     # پنل آشپز
     path('chef-panel/', views.chef_panel, name='chef_panel'),
     path('api/chef/orders/', views.get_chef_orders, name='get_chef_orders'),
     path('api/chef/start/<int:order_id>/', views.start_cooking, name='start_cooking'),
     path('api/chef/finish/<int:order_id>/', views.finish_cooking, name='finish_cooking'),
+    path('api/chef/kitchen/', views.kitchen_summary, name='kitchen_summary'),
+    path('api/chef/schedule/', views.kitchen_schedule, name='kitchen_schedule'),
     
     # پنل گارسون
     path('waiter-panel/', views.waiter_panel, name='waiter_panel'),
     path('api/waiter/orders/', views.get_waiter_orders, name='get_waiter_orders'),
     path('api/waiter/deliver/<int:order_id>/', views.deliver_order, name='deliver_order'),
+    path('api/waiter/tables/', views.get_open_tabs, name='open_tabs'),
+    path('api/waiter/tables/<str:number>/', views.get_table_bill, name='table_bill'),
+
+    # رویدادهای لحظه‌ای سفارش برای همه‌ی پنل‌ها
+    path('api/events/', views.order_events, name='order_events'),
 ]
\ No newline at end of file
@@ -1,15 +1,34 @@
 # views.py (بروزرسانی شده برای پنل‌های جدید)
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required, user_passes_test
+from django.conf import settings
 from django.contrib import messages
+from django.core.exceptions import ValidationError
+from django.core.handlers.asgi import ASGIRequest
 from django.utils import timezone
-from django.db.models import Sum
-from django.http import JsonResponse
+from django.utils.dateparse import parse_date
+from django.utils.functional import SimpleLazyObject
+from django.db import transaction
+from django.db.models import Q
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.middleware.csrf import get_token
+from django.views.decorators.http import condition
+import hashlib
 import json
 import logging
 
-from .models import MenuItem, Category, Order, OrderItem
+from .models import Order, OrderTombstone, Table
 from .forms import OrderForm
+from .events import event_stream, panel_role, publish_order_event
+from .services import create_order, transition_order
+from .menu import MENU_SNAPSHOT_TIMEOUT, get_menu_snapshot, get_menu_version
+from .serializers import order_rows, serialize_order_rows
+from .kitchen import get_kitchen_totals
+from .scheduler import get_kitchen_schedule
+from .reports import get_today_revenue, sales_report
+from .exports import EXPORT_FORMATS, export_rows, iter_export
+from .tables import open_tabs, table_bill
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +42,69 @@ def is_chef(user):
 def is_waiter(user):
     return user.role == 'waiter'
 
+def is_floor_staff(user):
+    # گارسون و مدیر (صندوق) حساب میزها را می‌بینند
+    return is_waiter(user) or is_manager(user)
+
+
+# --- cursor برای API های تغییرات سفارش ---
+# cursor عدد میکروثانیه‌ی UTC است؛ ORDER_CURSOR_OVERLAP عقب‌تر از شروع پرس‌وجو برمی‌گردد تا
+# تراکنشی که پشت قفل منتظر مانده و دیرتر commit شده از دست نرود (تکرار یک سفارش برای پنل بی‌ضرر است).
+CURSOR_OVERLAP = timedelta(seconds=settings.ORDER_CURSOR_OVERLAP)
+TOMBSTONE_TTL = timedelta(days=1)
+
+
+def _parse_cursor(request):
+    since = request.GET.get('since')
+    if not since:
+        return None
+    try:
+        since = datetime.fromtimestamp(int(since) / 1_000_000, tz=dt_timezone.utc)
+    except (ValueError, OverflowError, OSError):
+        return None
+    # از عمر tombstone ها قدیمی‌تر است؛ پنل باید کل لیست را دوباره بگیرد
+    if since < timezone.now() - TOMBSTONE_TTL:
+        return None
+    return since
+
+
+def _next_cursor():
+    return str(int((timezone.now() - CURSOR_OVERLAP).timestamp() * 1_000_000))
+
+
+def _changes_since(orders, since, feed=None):
+    # سفارش‌های تغییرکرده داخل فیلتر پنل (feed) + شناسه‌ی سفارش‌هایی که باید از لیست حذف شوند
+    if since is None:
+        return orders, []
+    removed = list(OrderTombstone.objects.filter(deleted_at__gte=since).values_list('order_id', flat=True))
+    # feed خالی (?window=all) فیلتری ندارد؛ هیچ سفارش موجودی از آن بیرون نمی‌رود
+    if feed:
+        removed += Order.objects.filter(updated_at__gte=since).exclude(feed).values_list('id', flat=True)
+    return orders.filter(updated_at__gte=since), [f"ORD-{order_id:03d}" for order_id in removed]
+
+
+# --- صفحه‌بندی keyset روی (created_at, id) برای لیست مدیر ---
+MANAGER_PAGE_SIZE = 50
+
+
+def _manager_window():
+    # پیش‌فرض: سفارش‌های باز + همه‌ی سفارش‌های امروز
+    today_start = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+    return ~Q(status='delivered') | Q(created_at__gte=today_start)
+
+
+def _parse_page_cursor(value):
+    try:
+        created_us, order_id = value.split('_')
+        created_at = datetime.fromtimestamp(int(created_us) / 1_000_000, tz=dt_timezone.utc)
+        return created_at, int(order_id)
+    except (ValueError, OverflowError, OSError):
+        return None
+
+
+def _page_cursor(created_at, order_id):
+    return f"{int(created_at.timestamp() * 1_000_000)}_{order_id}"
+
 
 # --- صفحه اصلی ---
 def home(request):
@@ -30,29 +112,45 @@ def home(request):
 
 
 # --- منوی سفارش ---
-@login_required
-def order_menu(request):
-    categories = Category.objects.all()
-    menu_items = MenuItem.objects.filter(is_available=True).select_related('category')
+def _menu_etag(request):
+    # صفحه به نسخه‌ی منو، سبد session، توکن CSRF و میز QR وابسته است؛
+    # راز CSRF همانی است که صفحه با آن رندر می‌شود (در اولین درخواست هنوز کوکی‌ای نیست)
+    get_token(request)
+    version = get_menu_version()
+    cart = json.dumps(request.session.get('cart', []), sort_keys=True)
+    digest = hashlib.md5(
+        f"{version}:{request.user.pk}:{request.META['CSRF_COOKIE']}:{cart}:{request.GET.get('table', '')}".encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    return f"menu-{digest}"
+
+
+def _menu_context():
+    # کارت‌ها، دسته‌ها و JSON منو در قالب با کلید نسخه‌ی منو fragment-cache می‌شوند؛
+    # snapshot فقط وقتی خوانده می‌شود که یکی از fragment ها در کش نباشد
+    return {
+        'menu': SimpleLazyObject(get_menu_snapshot),
+        'menu_version': get_menu_version(),
+        'menu_cache_timeout': MENU_SNAPSHOT_TIMEOUT,
+    }
 
-    menu_items_json = json.dumps([{
-        'id': item.id,
-        'name': item.name,
-        'price': int(item.price),
-        'image': item.image.url if item.image else '/static/no-image.jpg'
-    } for item in menu_items], ensure_ascii=False)
 
-    form = OrderForm()
+@login_required
+@condition(etag_func=_menu_etag)
+def order_menu(request):
+    # از QR روی میز: /order/?table=<qr_token>
+    token = request.GET.get('table')
+    table = Table.objects.filter(qr_token=token, is_active=True).first() if token else None
+    form = OrderForm(table=table)
     cart = request.session.get('cart', [])
 
-    return render(request, 'muno.html', {
-        'menu_items': menu_items,
-        'categories': categories,
+    response = render(request, 'muno.html', {
+        **_menu_context(),
         'form': form,
-        'menu_items_json': menu_items_json,
         'cart': cart,
-        'csrf_token': request.COOKIES.get('csrftoken', '')
     })
+    response['Cache-Control'] = 'private, no-cache'
+    return response
 
 
 # --- API برای همگام‌سازی سبد خرید ---
@@ -64,10 +162,10 @@ def sync_cart(request):
             cart = data.get('cart', [])
             request.session['cart'] = cart
             request.session.modified = True
-            logger.info(f"سبد خرید همگام شد برای کاربر {request.user}: {cart}")
+            logger.debug("سبد خرید همگام شد برای کاربر %s: %s", request.user.pk, cart)
             return JsonResponse({'status': 'ok', 'cart': cart})
         except Exception as e:
-            logger.error(f"خطا در sync_cart: {e}")
+            logger.error("خطا در sync_cart: %s", e)
             return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
     return JsonResponse({'status': 'error'}, status=405)
 
@@ -76,52 +174,50 @@ def sync_cart(request):
 @login_required
 def place_order(request):
     cart = request.session.get('cart', [])
-    logger.warning(f"سبد خرید در place_order: {cart}")  # دیباگ
-    print("CART IN SESSION:", cart)
-
-    if not cart:
-        messages.warning(request, "سبد خرید خالی است.")
-        return redirect('index:order_menu')
 
     if request.method == 'POST':
         form = OrderForm(request.POST)
         if form.is_valid():
+            # سبد از فرم می‌آید؛ سبد session فقط برای صفحه‌های قدیمی که هنوز sync_cart می‌کنند
+            cart = form.cleaned_data['cart'] or cart
             try:
-                order = Order.objects.create(
-                    user=request.user,
-                    table_number=form.cleaned_data['table_number'],
-                    special_requests=form.cleaned_data['special_requests']
+                order = create_order(
+                    request.user,
+                    form.cleaned_data['table'],
+                    form.cleaned_data['special_requests'],
+                    cart,
                 )
+                publish_order_event('place_order', order.id, order.status)
+                # فقط اگر سبدی در session بوده، session دوباره نوشته شود
+                request.session.pop('cart', None)
 
-                for item in cart:
-                    menu_item = get_object_or_404(MenuItem, id=item['id'])
-                    OrderItem.objects.create(
-                        order=order,
-                        menu_item=menu_item,
-                        quantity=item['quantity'],
-                        price_at_order=menu_item.price
-                    )
-
-                order.calculate_total()
-                request.session['cart'] = []
-                request.session.modified = True
-
-                messages.success(request, f"سفارش #{order.id} با موفقیت ثبت شد!")
-                logger.info(f"سفارش {order.id} توسط {request.user} ثبت شد.")
+                # صفحه‌ی بعد با این برچسب سبد مرورگر را پاک می‌کند (فقط بعد از ثبت موفق)
+                messages.success(request, f"سفارش #{order.id} با موفقیت ثبت شد!", extra_tags='order_placed')
+                logger.info("سفارش %s توسط کاربر %s ثبت شد.", order.id, request.user.pk)
                 return redirect('index:home')
 
+            except ValidationError as e:
+                messages.error(request, e.messages[0])
             except Exception as e:
-                logger.error(f"خطا در ثبت سفارش: {e}")
+                logger.exception("خطا در ثبت سفارش: %s", e)
                 messages.error(request, "خطایی رخ داد. دوباره تلاش کنید.")
+        else:
+            # سبد ارسالی برمی‌گردد تا مهمان با خطای فرم (مثلاً میز نامعتبر) سبدش را از دست ندهد
+            cart = form.cleaned_data.get('cart') or cart
+            for errors in form.errors.values():
+                messages.error(request, errors[0])
     else:
+        if not cart:
+            messages.warning(request, "سبد خرید خالی است.")
+            return redirect('index:order_menu')
         form = OrderForm()
 
+    # سبد برگشتی به قالب فقط شناسه و تعداد دارد
+    cart = [{'id': line.get('id'), 'quantity': line.get('quantity')} for line in cart]
     return render(request, 'muno.html', {
+        **_menu_context(),
         'form': form,
         'cart': cart,
-        'menu_items': MenuItem.objects.filter(is_available=True),
-        'categories': Category.objects.all(),
-        'csrf_token': request.COOKIES.get('csrftoken', '')
     })
 
 
@@ -136,52 +232,126 @@ def manage_orders(request):
 @login_required
 @user_passes_test(is_manager)
 def get_manager_orders(request):
-    orders = Order.objects.all().select_related('user').prefetch_related('items__menu_item')
-    orders_data = []
-    for order in orders:
-        customer_name = f"{order.user.first_name} {order.user.last_name}".strip() or order.user.username
-        items = [{
-            'name': item.menu_item.name,
-            'quantity': item.quantity,
-            'price': int(item.price_at_order),
-            'notes': ''  # اگر یادداشتی دارید اضافه کنید
-        } for item in order.items.all()]
-        
-        orders_data.append({
-            'id': f"ORD-{order.id:03d}",
-            'customer': customer_name,
-            'table': order.table_number,
-            'items': items,
-            'total': int(order.total_price),
-            'status': order.status,
-            'time': order.created_at.strftime('%H:%M'),
-            'urgent': False  # می‌توانید منطق فوری اضافه کنید
-        })
-    
-    return JsonResponse({'orders': orders_data})
+    since = _parse_cursor(request)
+    cursor = _next_cursor()
+    # ?window=all کل تاریخچه را (صفحه به صفحه) برمی‌گرداند
+    feed = Q() if request.GET.get('window') == 'all' else _manager_window()
+    orders = Order.objects.filter(feed).order_by('-created_at', '-id')
+    orders, removed = _changes_since(orders, since, feed)
+
+    next_page = None
+    if since is None:
+        before = _parse_page_cursor(request.GET.get('before', ''))
+        if before:
+            created_at, order_id = before
+            orders = orders.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=order_id))
+        try:
+            limit = min(max(int(request.GET.get('limit', MANAGER_PAGE_SIZE)), 1), MANAGER_PAGE_SIZE * 4)
+        except ValueError:
+            limit = MANAGER_PAGE_SIZE
+        rows = list(order_rows(orders)[:limit + 1])
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_page = _page_cursor(rows[-1]['created_at'], rows[-1]['id'])
+    else:
+        rows = order_rows(orders)
+
+    orders_data = serialize_order_rows(rows, 'manager')
+
+    return JsonResponse({
+        'orders': orders_data,
+        'removed': removed,
+        'cursor': cursor,
+        'full': since is None,
+        'next': next_page,
+    })
 
 
 # --- API برای تایید سفارش توسط مدیر ---
 @login_required
 @user_passes_test(is_manager)
 def confirm_order(request, order_id):
-    order = get_object_or_404(Order, id=order_id)
-    if order.status == 'pending':
-        order.status = 'confirmed'
-        order.save()
-        return JsonResponse({'status': 'success'})
-    return JsonResponse({'status': 'error'}, status=400)
+    result = transition_order(order_id, 'confirm')
+    if result is None:
+        # سفارش وجود ندارد (404) یا در وضعیت مناسب نیست (400)
+        get_object_or_404(Order.objects.only('id'), id=order_id)
+        return JsonResponse({'status': 'error'}, status=400)
+    new_status = result[0]
+    publish_order_event('confirm_order', order_id, new_status)
+    return JsonResponse({'status': 'success', 'order_status': new_status})
 
 
 # --- API برای رد سفارش توسط مدیر ---
 @login_required
 @user_passes_test(is_manager)
 def reject_order(request, order_id):
-    order = get_object_or_404(Order, id=order_id)
-    order.delete()
+    with transaction.atomic():
+        # وضعیت زیر قفل خوانده می‌شود تا تغییر هم‌زمان (مثلاً تحویل) بین خواندن و حذف نیفتد؛
+        # در SQLite تراکنش IMMEDIATE از ابتدا قفل نوشتن را دارد
+        order = get_object_or_404(Order.objects.select_for_update(), id=order_id)
+        deleted, _ = order.delete()
+        if not deleted:
+            return JsonResponse({'status': 'error'}, status=400)
+    OrderTombstone.objects.filter(deleted_at__lt=timezone.now() - TOMBSTONE_TTL).delete()
+    publish_order_event('reject_order', order_id)
     return JsonResponse({'status': 'success'})
 
 
+# --- بازه‌ی تاریخ گزارش‌ها: ?from=YYYY-MM-DD&to=YYYY-MM-DD ---
+def _parse_date_range(request):
+    # پارامتر خالی None است؛ تاریخ بدشکل ValueError می‌دهد
+    dates = []
+    for name in ('from', 'to'):
+        value = request.GET.get(name)
+        parsed = parse_date(value) if value else None
+        if value and parsed is None:
+            raise ValueError(value)
+        dates.append(parsed)
+    return dates
+
+
+# --- API گزارش فروش مدیر (از جدول‌های خلاصه) ---
+REPORT_MAX_DAYS = 366
+
+
+@login_required
+@user_passes_test(is_manager)
+def sales_report_view(request):
+    try:
+        start, end = _parse_date_range(request)
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'تاریخ نامعتبر است.'}, status=400)
+    start = start or timezone.localdate()
+    end = end or start
+    if end < start or (end - start).days >= REPORT_MAX_DAYS:
+        return JsonResponse({'status': 'error', 'message': 'بازه‌ی تاریخ نامعتبر است.'}, status=400)
+    return JsonResponse(sales_report(start, end))
+
+
+# --- خروجی جریانی سفارش‌ها برای حسابداری (CSV / JSONL) ---
+@login_required
+@user_passes_test(is_manager)
+def export_orders(request):
+    export_format = request.GET.get('format', 'csv')
+    # ?status=delivered&status=ready یا ?status=delivered,ready
+    statuses = [status for value in request.GET.getlist('status') for status in value.split(',') if status]
+    if export_format not in EXPORT_FORMATS or any(status not in dict(Order.STATUS_CHOICES) for status in statuses):
+        return JsonResponse({'status': 'error', 'message': 'فرمت یا وضعیت نامعتبر است.'}, status=400)
+    try:
+        start, end = _parse_date_range(request)
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': 'تاریخ نامعتبر است.'}, status=400)
+    if start and end and end < start:
+        return JsonResponse({'status': 'error', 'message': 'بازه‌ی تاریخ نامعتبر است.'}, status=400)
+
+    # سفارش‌ها تکه‌تکه (iterator) خوانده و نوشته می‌شوند؛ حافظه به حجم خروجی بستگی ندارد
+    rows = export_rows(start, end, statuses)
+    content_type = 'text/csv' if export_format == 'csv' else 'application/x-ndjson'
+    response = StreamingHttpResponse(iter_export(export_format, rows), content_type=f'{content_type}; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="orders-{start or "all"}-{end or "now"}.{export_format}"'
+    return response
+
+
 # --- پنل آشپز ---
 @login_required
 @user_passes_test(is_chef)
@@ -193,78 +363,86 @@ def chef_panel(request):
 @login_required
 @user_passes_test(is_chef)
 def get_chef_orders(request):
-    orders = Order.objects.filter(status__in=['confirmed', 'preparing', 'ready']).select_related('user').prefetch_related('items__menu_item')
-    orders_data = []
-    for order in orders:
-        customer_name = f"{order.user.first_name} {order.user.last_name}".strip() or order.user.username
-        items = [{
-            'name': item.menu_item.name,
-            'quantity': item.quantity,
-            'notes': ''  # اگر یادداشتی دارید اضافه کنید
-        } for item in order.items.all()]
-        
-        cooking_time = order.calculate_cooking_time()  # زمان کل پخت
-        
-        # اگر در حال پخت است، زمان باقی‌مانده را محاسبه کن (برای استفاده در JS سمت کلاینت)
-        remaining_time = None
-        if order.status == 'preparing' and order.cooking_start_time:
-            elapsed = (timezone.now() - order.cooking_start_time).total_seconds() / 60
-            remaining_time = max(0, cooking_time - elapsed)
-        
-        orders_data.append({
-            'id': f"ORD-{order.id:03d}",
-            'customer': customer_name,
-            'table': order.table_number,
-            'items': items,
-            'total': int(order.total_price),
-            'status': 'pending' if order.status == 'confirmed' else order.status,
-            'time': order.created_at.strftime('%H:%M'),
-            'cooking_time': cooking_time,  # زمان کل برای تایمر در JS
-            'remaining_time': remaining_time,  # اگر در حال پخت، زمان باقی‌مانده اولیه
-            'cooking_start_time': order.cooking_start_time.isoformat() if order.cooking_start_time else None,
-            'urgent': False  # می‌توانید منطق فوری اضافه کنید
-        })
-    
-    return JsonResponse({'orders': orders_data})
+    since = _parse_cursor(request)
+    cursor = _next_cursor()
+    feed = Q(status__in=['confirmed', 'preparing', 'ready'])
+    orders = Order.objects.filter(feed)
+    orders, removed = _changes_since(orders, since, feed)
+    orders_data = serialize_order_rows(order_rows(orders), 'chef')
+
+    return JsonResponse({'orders': orders_data, 'removed': removed, 'cursor': cursor, 'full': since is None})
 
 
 # --- API برای شروع پخت توسط آشپز ---
 @login_required
 @user_passes_test(is_chef)
 def start_cooking(request, order_id):
-    order = get_object_or_404(Order, id=order_id)
-    if order.status == 'confirmed':
-        order.status = 'preparing'
-        order.cooking_start_time = timezone.now()
-        order.save()
-        return JsonResponse({'status': 'success', 'cooking_time': order.calculate_cooking_time()})
-    return JsonResponse({'status': 'error'}, status=400)
+    result = transition_order(order_id, 'start_cooking')
+    if result is None:
+        # سفارش وجود ندارد (404) یا در وضعیت مناسب نیست (400)
+        get_object_or_404(Order.objects.only('id'), id=order_id)
+        return JsonResponse({'status': 'error'}, status=400)
+    new_status, changed_at = result
+    publish_order_event('start_cooking', order_id, new_status)
+    return JsonResponse({'status': 'success', 'order_status': new_status, 'cooking_start_time': changed_at.isoformat()})
 
 
 # --- API برای اتمام پخت توسط آشپز ---
 @login_required
 @user_passes_test(is_chef)
 def finish_cooking(request, order_id):
-    order = get_object_or_404(Order, id=order_id)
-    if order.status == 'preparing':
-        order.status = 'ready'
-        order.save()
-        return JsonResponse({'status': 'success'})
-    return JsonResponse({'status': 'error'}, status=400)
+    result = transition_order(order_id, 'finish_cooking')
+    if result is None:
+        # سفارش وجود ندارد (404) یا در وضعیت مناسب نیست (400)
+        get_object_or_404(Order.objects.only('id'), id=order_id)
+        return JsonResponse({'status': 'error'}, status=400)
+    new_status = result[0]
+    publish_order_event('finish_cooking', order_id, new_status)
+    return JsonResponse({'status': 'success', 'order_status': new_status})
+
+
+# --- API نمایشگر آشپزخانه: جمع هر غذا در سفارش‌های تأییدشده و در حال پخت ---
+@login_required
+@user_passes_test(is_chef)
+def kitchen_summary(request):
+    items = sorted((
+        {
+            'id': item_id,
+            'name': entry['name'],
+            'waiting': entry['confirmed'],
+            'cooking': entry['preparing'],
+            'total': entry['confirmed'] + entry['preparing'],
+        }
+        for item_id, entry in get_kitchen_totals().items()
+    ), key=lambda item: -item['total'])
+    return JsonResponse({'items': items})
+
+
+# --- API زمان‌بندی آشپزخانه: زمان پیش‌بینی‌شده‌ی شروع/آماده شدن و ترتیب پیشنهادی پخت ---
+@login_required
+@user_passes_test(is_chef)
+def kitchen_schedule(request):
+    plans, sequence = get_kitchen_schedule()
+    orders = [{
+        'id': f"ORD-{order_id:03d}",
+        'predicted_start': start.isoformat(),
+        'predicted_ready': ready.isoformat(),
+    } for order_id, (start, ready) in plans.items()]
+    sequence = [{
+        'order': f"ORD-{order_id:03d}",
+        'item': name,
+        'start': start.isoformat(),
+    } for start, order_id, menu_item_id, name in sequence]
+    return JsonResponse({'orders': orders, 'sequence': sequence})
 
 
 # --- پنل گارسون ---
 @login_required
 @user_passes_test(is_waiter)
 def waiter_panel(request):
-    today = timezone.now().date()
-    delivered_today = Order.objects.filter(
-        status='delivered',
-        created_at__date=today
-    ).aggregate(total=Sum('total_price'))['total'] or 0
-
+    # از جدول خلاصه‌ی فروش روزانه (یک ردیف) به‌جای جمع زدن سفارش‌های امروز
     return render(request, 'manager_garson.html', {
-        'delivered_today': int(delivered_today)
+        'delivered_today': int(get_today_revenue())
     })  # فایل HTML جدید برای گارسون
 
 
@@ -272,37 +450,56 @@ def waiter_panel(request):
 @login_required
 @user_passes_test(is_waiter)
 def get_waiter_orders(request):
-    orders = Order.objects.filter(status='ready').select_related('user').prefetch_related('items__menu_item')
-    orders_data = []
-    for order in orders:
-        customer_name = f"{order.user.first_name} {order.user.last_name}".strip() or order.user.username
-        items = [{
-            'name': item.menu_item.name,
-            'quantity': item.quantity,
-            'notes': ''  # اگر یادداشتی دارید اضافه کنید
-        } for item in order.items.all()]
-        
-        orders_data.append({
-            'id': f"ORD-{order.id:03d}",
-            'customer': customer_name,
-            'table': order.table_number,
-            'items': items,
-            'total': int(order.total_price),
-            'status': order.status,
-            'time': order.created_at.strftime('%H:%M'),
-            'urgent': False  # می‌توانید منطق فوری اضافه کنید
-        })
-    
-    return JsonResponse({'orders': orders_data})
+    since = _parse_cursor(request)
+    cursor = _next_cursor()
+    feed = Q(status='ready')
+    orders = Order.objects.filter(feed)
+    orders, removed = _changes_since(orders, since, feed)
+    orders_data = serialize_order_rows(order_rows(orders), 'waiter')
+
+    return JsonResponse({'orders': orders_data, 'removed': removed, 'cursor': cursor, 'full': since is None})
 
 
 # --- API برای تحویل سفارش توسط گارسون ---
 @login_required
 @user_passes_test(is_waiter)
 def deliver_order(request, order_id):
-    order = get_object_or_404(Order, id=order_id)
-    if order.status == 'ready':
-        order.status = 'delivered'
-        order.save()
-        return JsonResponse({'status': 'success'})
-    return JsonResponse({'status': 'error'}, status=400)
\ No newline at end of file
+    result = transition_order(order_id, 'deliver', user=request.user)
+    if result is None:
+        # سفارش وجود ندارد (404) یا در وضعیت مناسب نیست (400)
+        get_object_or_404(Order.objects.only('id'), id=order_id)
+        return JsonResponse({'status': 'error'}, status=400)
+    new_status = result[0]
+    publish_order_event('deliver_order', order_id, new_status)
+    return JsonResponse({'status': 'success', 'order_status': new_status})
+
+
+# --- حساب باز میزها ---
+@login_required
+@user_passes_test(is_floor_staff)
+def get_open_tabs(request):
+    return JsonResponse({'tables': open_tabs()})
+
+
+@login_required
+@user_passes_test(is_floor_staff)
+def get_table_bill(request, number):
+    table = get_object_or_404(Table, number=number)
+    return JsonResponse(table_bill(table))
+
+
+# --- جریان رویداد سفارشات (SSE) برای همه‌ی پنل‌ها ---
+async def order_events(request):
+    if not isinstance(request, ASGIRequest):
+        # زیر WSGI جریان بی‌پایان بافر می‌شود و یک worker را برای همیشه نگه می‌دارد؛
+        # با 204 مرورگر دوباره وصل نمی‌شود و پنل با polling کار می‌کند
+        return HttpResponse(status=204)
+    user = await request.auser()
+    role = panel_role(user) if user.is_authenticated else None
+    if role is None:
+        return JsonResponse({'status': 'error'}, status=403)
+
+    response = StreamingHttpResponse(event_stream(role), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,61 @@
+// common.js — توابع مشترک پنل‌های کارکنان؛ هر پنل fetchOrders خودش را تعریف می‌کند
+
+// ادغام تغییرات دریافتی (cursor) با لیست فعلی
+let ordersCursor = null;
+function ordersUrl(base) {
+    return ordersCursor ? `${base}?since=${ordersCursor}` : base;
+}
+
+function mergeOrders(current, data) {
+    ordersCursor = data.cursor;
+    if (data.full) return data.orders;
+    const changed = new Set(data.orders.map(order => order.id));
+    const removed = new Set(data.removed);
+    const kept = current.filter(order => !changed.has(order.id) && !removed.has(order.id));
+    const orderNumber = id => parseInt(id.replace('ORD-', ''), 10);
+    return kept.concat(data.orders).sort((a, b) => orderNumber(b.id) - orderNumber(a.id));
+}
+
+// دریافت CSRF token
+function getCookie(name) {
+    let cookieValue = null;
+    if (document.cookie && document.cookie !== '') {
+        const cookies = document.cookie.split(';');
+        for (let i = 0; i < cookies.length; i++) {
+            const cookie = cookies[i].trim();
+            if (cookie.substring(0, name.length + 1) === (name + '=')) {
+                cookieValue = decodeURIComponent(cookie.substring(name.length + 1));
+                break;
+            }
+        }
+    }
+    return cookieValue;
+}
+
+// اشتراک در رویدادهای سفارش (SSE)؛ polling فقط به‌عنوان پشتیبان
+let refreshTimer = null;
+function scheduleFetch() {
+    clearTimeout(refreshTimer);
+    refreshTimer = setTimeout(fetchOrders, 300);
+}
+
+// تا وقتی جریان وصل است polling فقط تور ایمنی است و این چند برابر کندتر اجرا می‌شود
+const CONNECTED_POLL_FACTOR = 10;
+
+function subscribeOrderEvents(fallbackInterval) {
+    let source = null;
+    if (window.EventSource) {
+        source = new EventSource('/api/events/');
+        source.onmessage = scheduleFetch;
+        // بعد از اتصال مجدد ممکن است رویدادی از دست رفته باشد
+        source.onopen = scheduleFetch;
+    }
+    // بدون جریان (مرورگر قدیمی، سرور WSGI با 204، قطع اتصال) با همان فاصله‌ی قبلی poll می‌شود
+    let lastPoll = Date.now();
+    setInterval(() => {
+        const connected = source && source.readyState === EventSource.OPEN;
+        if (connected && Date.now() - lastPoll < fallbackInterval * CONNECTED_POLL_FACTOR) return;
+        lastPoll = Date.now();
+        fetchOrders();
+    }, fallbackInterval);
+}
@@ -0,0 +1,259 @@
+// waiter.js — پنل گارسون؛ بعد از common.js بارگذاری می‌شود
+// داده‌های نمونه برای میزها
+let tables = Array.from({length: 20}, (_, i) => ({ number: i+1, status: 'empty' }));
+
+// المنت‌های DOM
+const readyOrdersContainer = document.getElementById('readyOrdersContainer');
+const tablesContainer = document.getElementById('tablesContainer');
+const refreshBtn = document.getElementById('refreshBtn');
+const markAllDeliveredBtn = document.getElementById('markAllDeliveredBtn');
+const notificationToast = document.getElementById('notificationToast');
+const toastTitle = document.getElementById('toastTitle');
+const toastMessage = document.getElementById('toastMessage');
+const closeToast = document.getElementById('closeToast');
+const readyOrdersCount = document.getElementById('readyOrdersCount');
+const deliveredOrdersCount = document.getElementById('deliveredOrdersCount');
+const waitingOrdersCount = document.getElementById('waitingOrdersCount');
+
+let readyOrders = [];
+let deliveredOrders = 0;
+
+// دریافت سفارشات از API
+async function fetchOrders() {
+    try {
+        const response = await fetch(ordersUrl('/api/waiter/orders/'));
+        const data = await response.json();
+        readyOrders = mergeOrders(readyOrders, data);
+        renderReadyOrders();
+        renderTables();
+        updateStats();
+    } catch (error) {
+        console.error('خطا در دریافت سفارشات:', error);
+        showNotification('خطا', 'دریافت سفارشات با مشکل مواجه شد.');
+    }
+}
+
+// نمایش سفارشات آماده
+function renderReadyOrders() {
+    readyOrdersContainer.innerHTML = '';
+    
+    if (readyOrders.length === 0) {
+        readyOrdersContainer.innerHTML = `
+            <div style="text-align: center; color: #999; padding: 3rem 1rem;">
+                <i class="fas fa-check-circle" style="font-size: 3rem; margin-bottom: 1rem; opacity: 0.5;"></i>
+                <p>هیچ سفارش آماده‌ای برای تحویل وجود ندارد</p>
+            </div>
+        `;
+        return;
+    }
+    
+    readyOrders.forEach(order => {
+        const orderCard = document.createElement('div');
+        orderCard.className = `order-card fade-in ${order.urgent ? 'urgent' : ''}`;
+        
+        orderCard.innerHTML = `
+            <div class="order-header">
+                <div class="order-id">${order.id}</div>
+                <div class="order-time">${order.time}</div>
+            </div>
+            <div class="order-body">
+                <div class="order-info">
+                    <div class="info-item">
+                        <span class="info-label">مشتری</span>
+                        <span class="info-value">${order.customer}</span>
+                    </div>
+                    <div class="info-item">
+                        <span class="info-label">وضعیت</span>
+                        <span class="order-badge ${order.urgent ? 'badge-urgent' : 'badge-ready'}">
+                            ${order.urgent ? 'فوری' : 'آماده'}
+                        </span>
+                    </div>
+                    <div class="info-item">
+                        <span class="info-label">مبلغ</span>
+                        <span class="info-value">${order.total.toLocaleString()} تومان</span>
+                    </div>
+                    <div class="info-item">
+                        <span class="info-label">شماره میز</span>
+                        <div class="table-number">${order.table}</div>
+                    </div>
+                </div>
+                <div class="order-items">
+                    <div class="items-title">محصولات سفارش:</div>
+                    <ul class="item-list">
+                        ${order.items.map(item => `
+                            <li>
+                                <span class="item-name">${item.name}</span>
+                                <span class="item-quantity">${item.quantity}</span>
+                            </li>
+                            ${item.notes ? `<div class="item-notes">${item.notes}</div>` : ''}
+                        `).join('')}
+                    </ul>
+                </div>
+            </div>
+            <div class="order-footer">
+                <div class="order-total">${order.total.toLocaleString()} تومان</div>
+                <div class="action-buttons">
+                    <button class="btn btn-success btn-sm" onclick="deliverOrder('${order.id}')">
+                        <i class="fas fa-check"></i>
+                        تحویل داده شد
+                    </button>
+                    <button class="btn btn-primary btn-sm" onclick="viewTableLocation(${order.table})">
+                        <i class="fas fa-map-marker-alt"></i>
+                        موقعیت میز
+                    </button>
+                </div>
+            </div>
+        `;
+        
+        readyOrdersContainer.appendChild(orderCard);
+    });
+}
+
+// نمایش میزها
+function renderTables() {
+    tablesContainer.innerHTML = '';
+    
+    tables.forEach(table => {
+        const tableItem = document.createElement('div');
+        
+        const hasReadyOrder = readyOrders.some(order => order.table === table.number);
+        table.status = hasReadyOrder ? 'ready' : 'empty';
+        
+        let statusText = '';
+        let statusClass = '';
+        
+        switch(table.status) {
+            case 'empty':
+                statusText = 'خالی';
+                statusClass = 'status-empty';
+                break;
+            case 'waiting':
+                statusText = 'منتظر غذا';
+                statusClass = 'status-waiting';
+                break;
+            case 'ready':
+                statusText = 'آماده تحویل';
+                statusClass = 'status-ready';
+                break;
+        }
+        
+        tableItem.className = `table-item ${hasReadyOrder ? 'has-order' : ''}`;
+        tableItem.onclick = () => viewTableOrders(table.number);
+        
+        tableItem.innerHTML = `
+            <div class="table-number-large">${table.number}</div>
+            <div class="table-status ${statusClass}">${statusText}</div>
+            ${hasReadyOrder ? '<div style="margin-top: 0.5rem;"><i class="fas fa-utensils" style="color: var(--success);"></i></div>' : ''}
+        `;
+        
+        tablesContainer.appendChild(tableItem);
+    });
+}
+
+// به‌روزرسانی آمار
+function updateStats() {
+    readyOrdersCount.textContent = readyOrders.length;
+    deliveredOrdersCount.textContent = deliveredOrders;
+    waitingOrdersCount.textContent = readyOrders.length;
+}
+
+// تحویل سفارش
+async function deliverOrder(orderId) {
+    try {
+        const response = await fetch(`/api/waiter/deliver/${orderId.replace('ORD-', '')}/`, {
+            method: 'POST',
+            headers: {
+                'X-CSRFToken': getCookie('csrftoken'),
+                'Content-Type': 'application/json'
+            }
+        });
+        const data = await response.json();
+        if (data.status === 'success') {
+            deliveredOrders++;
+            await fetchOrders();
+            showNotification('تحویل سفارش', `سفارش ${orderId} تحویل داده شد.`);
+        } else {
+            showNotification('خطا', 'عملیات ناموفق بود.');
+        }
+    } catch (error) {
+        console.error('خطا:', error);
+        showNotification('خطا', 'ارتباط با سرور برقرار نشد.');
+    }
+}
+
+// مشاهده سفارشات یک میز خاص
+function viewTableOrders(tableNumber) {
+    const tableOrders = readyOrders.filter(order => order.table === tableNumber);
+    
+    if (tableOrders.length === 0) {
+        showNotification('میز ' + tableNumber, 'هیچ سفارش آماده‌ای برای این میز وجود ندارد.');
+        return;
+    }
+    
+    let message = `سفارشات آماده برای میز ${tableNumber}:\n`;
+    tableOrders.forEach(order => {
+        message += `- ${order.id}: ${order.items.map(item => item.name).join('، ')}\n`;
+    });
+    
+    showNotification('سفارشات میز ' + tableNumber, message);
+}
+
+// مشاهده موقعیت میز
+function viewTableLocation(tableNumber) {
+    showNotification('موقعیت میز', `میز شماره ${tableNumber} در بخش غربی سالن قرار دارد.`);
+    
+    const tableItems = document.querySelectorAll('.table-item');
+    tableItems.forEach(item => {
+        item.classList.remove('active');
+        if (item.querySelector('.table-number-large').textContent == tableNumber) {
+            item.classList.add('active');
+            item.scrollIntoView({ behavior: 'smooth', block: 'center' });
+        }
+    });
+}
+
+// تحویل همه سفارشات
+async function markAllDelivered() {
+    if (readyOrders.length === 0) {
+        showNotification('تحویل سفارشات', 'هیچ سفارشی برای تحویل وجود ندارد.');
+        return;
+    }
+    
+    if (confirm(`آیا از تحویل همه ${readyOrders.length} سفارش اطمینان دارید؟`)) {
+        for (const order of readyOrders) {
+            await deliverOrder(order.id);
+        }
+        showNotification('تحویل سفارشات', 'همه سفارشات با موفقیت تحویل داده شدند.');
+    }
+}
+
+// نمایش نوتیفیکیشن
+function showNotification(title, message) {
+    toastTitle.textContent = title;
+    toastMessage.textContent = message;
+    notificationToast.classList.add('show');
+    
+    setTimeout(() => {
+        notificationToast.classList.remove('show');
+    }, 5000);
+}
+
+// بستن نوتیفیکیشن
+closeToast.addEventListener('click', () => {
+    notificationToast.classList.remove('show');
+});
+
+// بارگذاری اولیه
+document.addEventListener('DOMContentLoaded', () => {
+    fetchOrders();
+    
+    refreshBtn.addEventListener('click', () => {
+        fetchOrders();
+        showNotification('بروزرسانی', 'لیست سفارشات بروزرسانی شد.');
+    });
+    
+    markAllDeliveredBtn.addEventListener('click', markAllDelivered);
+    
+    // بروزرسانی لحظه‌ای با رویدادهای سرور
+    subscribeOrderEvents(15000);
+});
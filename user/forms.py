@@ -11,6 +11,10 @@ class MobileForm(forms.Form):
     )
 
 
+# ارقام فارسی و عربی کیبورد گوشی -> ASCII
+DIGITS = str.maketrans('۰۱۲۳۴۵۶۷۸۹٠١٢٣٤٥٦٧٨٩', '0123456789' * 2)
+
+
 class OTPForm(forms.Form):
     code = forms.CharField(
         max_length=4,
@@ -18,6 +22,12 @@ class OTPForm(forms.Form):
         widget=forms.TextInput(attrs={'placeholder': '1234'})
     )
 
+    def clean_code(self):
+        code = self.cleaned_data['code'].strip().translate(DIGITS)
+        if len(code) != 4 or not (code.isascii() and code.isdigit()):
+            raise forms.ValidationError('کد تأیید باید ۴ رقم باشد.')
+        return code
+
 
 class UserRegistrationForm(forms.ModelForm):
     class Meta:
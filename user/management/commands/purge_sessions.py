@@ -0,0 +1,24 @@
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'پاک کردن session های منقضی؛ با --interval به‌صورت دوره‌ای اجرا می‌شود'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='فاصله‌ی اجرا به ثانیه (0 یعنی فقط یک‌بار)',
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+        while True:
+            # clearsessions روی backend فعلی کار می‌کند؛ backend های کش خودشان TTL دارند
+            call_command('clearsessions')
+            self.stdout.write(self.style.SUCCESS('session های منقضی پاک شدند.'))
+            if not interval:
+                break
+            time.sleep(interval)
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="otpcode",
+            name="expires_at",
+            field=models.DateTimeField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="otpcode",
+            name="mobile",
+            field=models.CharField(db_index=True, max_length=15),
+        ),
+    ]
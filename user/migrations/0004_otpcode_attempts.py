@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 12:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0003_user_list_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="otpcode",
+            name="attempts",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
@@ -3,8 +3,6 @@ from django.contrib.auth.models import AbstractUser, UserManager
 from django.db import models
 from django.utils import timezone
 import random
-from kavenegar import KavenegarAPI, APIException
-from django.conf import settings
 
 
 class CustomUserManager(UserManager):
@@ -73,41 +71,25 @@ class User(AbstractUser):
         db_table = 'user_user'
         verbose_name = 'کاربر'
         verbose_name_plural = 'کاربران'
+        indexes = [
+            # لیست کاربران پنل مدیر: فیلتر نقش + جدیدترین‌ها
+            models.Index(fields=['role', 'date_joined'], name='user_role_joined_idx'),
+            models.Index(fields=['status'], name='user_status_idx'),
+            # جستجو با پیشوند کد ملی
+            models.Index(fields=['national_code'], name='user_national_code_idx'),
+        ]
 
 
-# مدل OTPCode — کامل و با پیامک واقعی
+# مدل OTPCode — وقتی کش بین پروسس‌ها مشترک نیست (locmem) یا در دسترس نیست (user.otp)
 class OTPCode(models.Model):
-    mobile = models.CharField(max_length=15)
+    mobile = models.CharField(max_length=15, db_index=True)
     code = models.CharField(max_length=4)
+    attempts = models.PositiveSmallIntegerField(default=0)  # تلاش‌های اشتباه
     created_at = models.DateTimeField(auto_now_add=True)
-    expires_at = models.DateTimeField()
+    expires_at = models.DateTimeField(db_index=True)
 
     def is_valid(self):
         return timezone.now() < self.expires_at
 
-    @staticmethod
-    def generate_otp(mobile):
-        code = str(random.randint(1000, 9999))
-        expires_at = timezone.now() + timezone.timedelta(minutes=5)
-        
-        OTPCode.objects.filter(mobile=mobile).delete()
-        otp = OTPCode.objects.create(mobile=mobile, code=code, expires_at=expires_at)
-
-        try:
-            api = KavenegarAPI(settings.KAVENEGAR_API_KEY)
-            params = {
-                'sender': settings.KAVENEGAR_SENDER,
-                'receptor': mobile,
-                'message': f'کد ورود شما: {code}\nرستوران گل‌سرخ'
-            }
-            response = api.sms_send(params)
-            print(f"پیامک ارسال شد به {mobile}: {code}")
-        except APIException as e:
-            print(f"خطای کاوه‌نگار: {e}")
-        except Exception as e:
-            print(f"خطای غیرمنتظره: {e}")
-
-        return otp
-
     def __str__(self):
         return f"OTP {self.code} برای {self.mobile}"
\ No newline at end of file
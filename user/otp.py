@@ -0,0 +1,145 @@
+# user/otp.py — کد ورود با TTL در کش مشترک (یا جدول OTPCode) و محدودیت نرخ ارسال/بررسی
+import hmac
+import logging
+import secrets
+import time
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import OTPCode
+from .sms import send_sms
+
+logger = logging.getLogger(__name__)
+
+OTP_TTL = 5 * 60
+OTP_MAX_ATTEMPTS = 5  # تلاش اشتباه برای هر کد
+
+# (تعداد مجاز، پنجره به ثانیه). محدودیت IP فقط جلوی سیل درخواست را می‌گیرد: مهمان‌های
+# Wi-Fi رستوران (NAT) همه یک IP دارند، پس بسیار شل‌تر از محدودیت هر موبایل است.
+SEND_LIMITS = {
+    'mobile': [(1, 60), (5, 60 * 60)],
+    'ip': [(30, 60), (300, 60 * 60)],
+}
+VERIFY_LIMITS = {
+    'mobile': [(10, 15 * 60)],
+    'ip': [(600, 15 * 60)],
+}
+
+
+class OTPRateLimited(Exception):
+    pass
+
+
+def client_ip(request):
+    # پشت reverse proxy همه‌ی درخواست‌ها REMOTE_ADDR یکسان دارند؛ CLIENT_IP_HEADER هدری است که
+    # proxy مورد اعتماد می‌گذارد. در X-Forwarded-For آخرین آدرس همانی است که proxy خودمان دیده.
+    header = settings.CLIENT_IP_HEADER
+    if header:
+        value = request.META.get(header, '').split(',')[-1].strip()
+        if value:
+            return value
+    return request.META.get('REMOTE_ADDR')
+
+
+def _code_key(mobile):
+    return f'otp:code:{mobile}'
+
+
+def _hit(action, scope, value, limits):
+    # شمارنده‌ی پنجره‌ی ثابت در کش؛ اگر کش در دسترس نباشد محدودیت اعمال نمی‌شود
+    for limit, window in limits:
+        key = f'otp:rate:{action}:{scope}:{window}:{value}'
+        try:
+            cache.add(key, 0, window)
+            count = cache.incr(key)
+        except Exception as e:
+            logger.warning("شمارنده‌ی محدودیت OTP در دسترس نیست: %s", e)
+            return
+        if count > limit:
+            raise OTPRateLimited()
+
+
+def _check_limits(action, limits, mobile, ip):
+    _hit(action, 'mobile', mobile, limits['mobile'])
+    if ip:
+        _hit(action, 'ip', ip, limits['ip'])
+
+
+def _cache_is_shared():
+    # LocMemCache در هر پروسس جداست: کدی که یک worker ساخته در worker دیگر دیده نمی‌شود
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], LocMemCache)
+
+
+def _store_code(mobile, code):
+    now = timezone.now()
+    OTPCode.objects.filter(Q(mobile=mobile) | Q(expires_at__lt=now)).delete()
+    OTPCode.objects.create(mobile=mobile, code=code, expires_at=now + timezone.timedelta(seconds=OTP_TTL))
+
+
+def _verify_stored_code(mobile, code):
+    otp = OTPCode.objects.filter(mobile=mobile, expires_at__gt=timezone.now()).first()
+    if otp is None:
+        return False
+    if hmac.compare_digest(otp.code.encode(), code.encode()):
+        otp.delete()
+        return True
+    if otp.attempts + 1 >= OTP_MAX_ATTEMPTS:
+        otp.delete()
+    else:
+        OTPCode.objects.filter(pk=otp.pk).update(attempts=F('attempts') + 1)
+    return False
+
+
+def issue_otp(mobile, ip=None):
+    _check_limits('send', SEND_LIMITS, mobile, ip)
+    code = f'{secrets.randbelow(9000) + 1000}'
+
+    stored = False
+    if _cache_is_shared():
+        try:
+            entry = {'code': code, 'attempts': 0, 'expires': time.time() + OTP_TTL}
+            cache.set(_code_key(mobile), entry, OTP_TTL)
+            stored = True
+        except Exception as e:
+            logger.warning("کش OTP در دسترس نیست، ذخیره در دیتابیس: %s", e)
+    if not stored:
+        # کش مشترک نیست یا در دسترس نیست: جدول OTPCode (ایندکس روی mobile و expires_at)
+        _store_code(mobile, code)
+
+    # ارسال در پس‌زمینه و بعد از ثبت کد؛ پاسخ لاگین منتظر درگاه پیامک نمی‌ماند
+    message = f'کد ورود شما: {code}\nرستوران گل‌سرخ'
+    transaction.on_commit(lambda: send_sms(mobile, message))
+    return code
+
+
+def verify_otp(mobile, code, ip=None):
+    _check_limits('verify', VERIFY_LIMITS, mobile, ip)
+    key = _code_key(mobile)
+
+    entry = None
+    if _cache_is_shared():
+        try:
+            entry = cache.get(key)
+        except Exception as e:
+            logger.warning("کش OTP در دسترس نیست: %s", e)
+
+    if entry is None:
+        return _verify_stored_code(mobile, code)
+
+    if hmac.compare_digest(entry['code'].encode(), code.encode()):
+        cache.delete(key)
+        return True
+
+    # بعد از چند تلاش اشتباه کد باطل می‌شود؛ تلاش اشتباه عمر کد را تمدید نمی‌کند
+    entry['attempts'] += 1
+    remaining = int(entry['expires'] - time.time())
+    if entry['attempts'] >= OTP_MAX_ATTEMPTS or remaining <= 0:
+        cache.delete(key)
+    else:
+        cache.set(key, entry, remaining)
+    return False
@@ -0,0 +1,87 @@
+# user/sms.py — ارسال پیامک خارج از مسیر درخواست (صف پس‌زمینه + backend قابل تعویض)
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class PermanentSMSError(Exception):
+    """خطایی که تکرار ارسال کمکی به آن نمی‌کند (شماره نامعتبر، اعتبار ناکافی، ...)."""
+
+
+class KavenegarBackend:
+    def send(self, mobile, message):
+        from kavenegar import APIException, KavenegarAPI
+
+        api = KavenegarAPI(settings.KAVENEGAR_API_KEY)
+        try:
+            api.sms_send({
+                'sender': settings.KAVENEGAR_SENDER,
+                'receptor': mobile,
+                'message': message,
+            })
+        except APIException as e:
+            raise PermanentSMSError(e) from e
+
+
+class LocMemBackend:
+    # برای تست و توسعه: پیام‌ها فقط در outbox ذخیره می‌شوند
+    outbox = []
+
+    def send(self, mobile, message):
+        self.outbox.append({'mobile': mobile, 'message': message})
+
+
+class ConsoleBackend:
+    def send(self, mobile, message):
+        logger.info("پیامک به %s: %s", mobile, message)
+
+
+def get_sms_backend():
+    return import_string(settings.SMS_BACKEND)()
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.SMS_WORKERS,
+                thread_name_prefix='sms',
+            )
+        return _executor
+
+
+def _send_with_retry(mobile, message):
+    backend = get_sms_backend()
+    for attempt in range(settings.SMS_MAX_RETRIES + 1):
+        try:
+            backend.send(mobile, message)
+            logger.info("پیامک ارسال شد به %s", mobile)
+            return True
+        except PermanentSMSError as e:
+            logger.error("ارسال پیامک به %s ناموفق بود: %s", mobile, e)
+            return False
+        except Exception as e:
+            if attempt == settings.SMS_MAX_RETRIES:
+                logger.error("ارسال پیامک به %s بعد از %s تلاش ناموفق بود: %s", mobile, attempt + 1, e)
+                return False
+            delay = settings.SMS_RETRY_BACKOFF * (2 ** attempt)
+            logger.warning("خطای موقت پیامک برای %s (تلاش %s)، %s ثانیه بعد دوباره: %s", mobile, attempt + 1, delay, e)
+            time.sleep(delay)
+
+
+def send_sms(mobile, message):
+    # درخواست کاربر منتظر درگاه پیامک نمی‌ماند؛ SMS_ASYNC=False برای اجرای هم‌زمان (مثلاً در تست)
+    if not settings.SMS_ASYNC:
+        return _send_with_retry(mobile, message)
+    return _get_executor().submit(_send_with_retry, mobile, message)
@@ -1,3 +1,251 @@
-from django.test import TestCase
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.contrib import messages
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.testing import QueryBudgetMixin
+
+from .models import OTPCode, User
+from .otp import OTP_MAX_ATTEMPTS, OTPRateLimited, client_ip, issue_otp, verify_otp
+from .sms import LocMemBackend, PermanentSMSError, send_sms
+
+
+@override_settings(SMS_BACKEND='user.sms.LocMemBackend', SMS_ASYNC=False)
+class UserQueryBudgetTests(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager = User.objects.create_user('09120000001', role='manager', first_name='مدیر', last_name='رستوران')
+
+    def setUp(self):
+        LocMemBackend.outbox.clear()
+        self.customers = []
+        self.staff = []
+
+    def grow(self, size):
+        # size مشتری و size کارمند
+        for users, prefix, roles in (
+            (self.customers, '0935', ['customer']),
+            (self.staff, '0936', ['chef', 'waiter', 'cashier']),
+        ):
+            users += User.objects.bulk_create([
+                User(
+                    mobile=f'{prefix}{i:07d}',
+                    username=f'{prefix}{i:07d}',
+                    role=roles[i % len(roles)],
+                    first_name='کاربر',
+                    last_name=str(i),
+                    national_code=f'{prefix}{i:06d}',
+                )
+                for i in range(len(users), size)
+            ])
+
+    def login_step(self, step, mobile):
+        # هر اندازه با یک session ناشناس تازه (ساخت session جزو اندازه‌گیری نیست)
+        self.client.logout()
+        session = self.client.session
+        session.update({'login_step': step, 'mobile': mobile})
+        session.save()
+
+    # --- ورود با OTP ---
+    def test_login_page(self):
+        self.assertQueryBudget(0, lambda: self.client.get(reverse('user:login')))
+
+    def test_login_send_code(self):
+        # شماره‌ی تازه در هر اندازه تا محدودیت نرخ ارسال نخورد
+        def fresh_mobile(size):
+            self.login_step(1, None)
+            return {'mobile': f'0937{size:07d}'}
+
+        self.assertQueryBudget(5, lambda mobile: self.client.post(reverse('user:login'), {'mobile': mobile}),
+                               prepare=fresh_mobile)
+        self.assertEqual(len(LocMemBackend.outbox), len(self.sizes))
+
+    def test_login_verify_code(self):
+        def issue(size):
+            mobile = self.customers[-1].mobile
+            self.login_step(2, mobile)
+            return {'code': issue_otp(mobile)}
+
+        self.assertQueryBudget(13, lambda code: self.client.post(reverse('user:login'), {'code': code}), prepare=issue)
+
+    def test_login_registration(self):
+        # کاربر تازه (بدون نام) در مرحله‌ی تکمیل اطلاعات
+        def new_user(size):
+            mobile = f'0938{size:07d}'
+            User.objects.create_user(mobile)
+            self.login_step(3, mobile)
+            return {'mobile': mobile}
+
+        self.assertQueryBudget(12, lambda mobile: self.client.post(reverse('user:login'), {
+            'first_name': 'مشتری',
+            'last_name': 'جدید',
+        }), prepare=new_user)
+
+    def test_logout(self):
+        def login(size):
+            self.client.force_login(self.customers[-1])
+            return {}
+
+        self.assertQueryBudget(3, lambda: self.client.get(reverse('user:logout')), prepare=login)
+
+    # --- مدیریت کاربران ---
+    def test_manage_users_staff(self):
+        # session، کاربر، همه‌ی شمارنده‌ها در یک aggregate، یک صفحه
+        self.client.force_login(self.manager)
+        self.assertQueryBudget(4, lambda: self.client.get(reverse('user:manage_users')))
+
+    def test_manage_users_customers_page(self):
+        self.client.force_login(self.manager)
+        self.assertQueryBudget(4, lambda: self.client.get(reverse('user:manage_users'), {'tab': 'customers', 'page': 2}))
+
+    def test_manage_users_search(self):
+        # با جستجو تعداد نتایج جدا شمرده می‌شود
+        self.client.force_login(self.manager)
+        self.assertQueryBudget(5, lambda: self.client.get(reverse('user:manage_users'), {'tab': 'staff', 'q': 'کاربر 0936'}))
+
+    def test_manage_users_delete(self):
+        self.client.force_login(self.manager)
+        self.assertQueryBudget(12, lambda user_id: self.client.post(
+            reverse('user:manage_users'), {'delete_user': user_id},
+        ), prepare=lambda size: {'user_id': User.objects.create_user(f'0939{size:07d}').id})
+
+
+@override_settings(SMS_BACKEND='user.sms.LocMemBackend', SMS_ASYNC=False)
+class OTPLoginTests(TestCase):
+    mobile = '09350000001'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(cls.mobile, first_name='مشتری')
+
+    def setUp(self):
+        cache.clear()
+        LocMemBackend.outbox.clear()
+        session = self.client.session
+        session.update({'login_step': 2, 'mobile': self.mobile})
+        session.save()
+
+    def post_code(self, code):
+        return self.client.post(reverse('user:login'), {'code': code})
+
+    def error_messages(self, response):
+        return [str(message) for message in messages.get_messages(response.wsgi_request)]
+
+    def test_persian_digits_login(self):
+        code = issue_otp(self.mobile)
+        response = self.post_code(code.translate(str.maketrans('0123456789', '۰۱۲۳۴۵۶۷۸۹')))
+        self.assertRedirects(response, reverse('index:home'), fetch_redirect_response=False)
+        self.assertEqual(int(self.client.session['_auth_user_id']), self.user.pk)
+
+    def test_code_survives_other_worker(self):
+        # با locmem هر worker کش خودش را دارد؛ کد در دیتابیس است نه کش این پروسس
+        code = issue_otp(self.mobile)
+        cache.clear()
+        self.assertTrue(verify_otp(self.mobile, code))
+        self.assertFalse(verify_otp(self.mobile, code))
+
+    def test_shared_cache_keeps_code_out_of_database(self):
+        with tempfile.TemporaryDirectory() as location, override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location,
+        }}):
+            code = issue_otp(self.mobile)
+            self.assertFalse(OTPCode.objects.exists())
+            self.assertTrue(verify_otp(self.mobile, code))
+
+    def test_wrong_attempts_invalidate_code(self):
+        code = issue_otp(self.mobile)
+        wrong = '0000' if code != '0000' else '1111'
+        for _ in range(OTP_MAX_ATTEMPTS):
+            self.assertFalse(verify_otp(self.mobile, wrong))
+        self.assertFalse(verify_otp(self.mobile, code))
+
+    def test_expired_code(self):
+        code = issue_otp(self.mobile)
+        OTPCode.objects.filter(mobile=self.mobile).update(expires_at=timezone.now())
+        self.assertFalse(verify_otp(self.mobile, code))
+
+    def test_non_digit_code_is_rejected(self):
+        issue_otp(self.mobile)
+        for code in ('abcd', '۱۲a۴', '١٢'):
+            with self.subTest(code=code):
+                response = self.post_code(code)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(self.error_messages(response), ['کد تأیید باید ۴ رقم باشد.'])
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+
+@override_settings(SMS_BACKEND='user.sms.LocMemBackend', SMS_ASYNC=False)
+class OTPRateLimitTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        LocMemBackend.outbox.clear()
+
+    def test_shared_ip_guests(self):
+        # یک گروه مهمان پشت Wi-Fi رستوران با یک IP
+        codes = [issue_otp(f'0935{i:07d}', '10.0.0.1') for i in range(25)]
+        self.assertEqual(len(codes), 25)
+
+    def test_mobile_limit(self):
+        issue_otp('09350000001', '10.0.0.1')
+        with self.assertRaises(OTPRateLimited):
+            issue_otp('09350000001', '10.0.0.2')
+
+    @override_settings(CLIENT_IP_HEADER='HTTP_X_FORWARDED_FOR')
+    def test_client_ip_from_proxy_header(self):
+        request = RequestFactory().get('/', REMOTE_ADDR='127.0.0.1', HTTP_X_FORWARDED_FOR='1.2.3.4, 5.6.7.8')
+        self.assertEqual(client_ip(request), '5.6.7.8')
+        self.assertEqual(client_ip(RequestFactory().get('/', REMOTE_ADDR='127.0.0.1')), '127.0.0.1')
+
+
+class FlakyBackend:
+    # خطاهای صف‌شده را به ترتیب پرتاب می‌کند، بعد مثل LocMemBackend ارسال می‌کند
+    errors = []
+    attempts = 0
+
+    def send(self, mobile, message):
+        FlakyBackend.attempts += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        LocMemBackend.outbox.append({'mobile': mobile, 'message': message})
+
+
+@override_settings(SMS_BACKEND='user.tests.FlakyBackend', SMS_ASYNC=False, SMS_MAX_RETRIES=2, SMS_RETRY_BACKOFF=0)
+class SMSRetryTests(SimpleTestCase):
+    def setUp(self):
+        LocMemBackend.outbox.clear()
+        FlakyBackend.attempts = 0
+
+    def send(self, *errors):
+        FlakyBackend.errors = list(errors)
+        with self.assertLogs('user.sms') as logs:
+            sent = send_sms('09120000000', 'کد: 1234')
+        return sent, logs
+
+    def test_transient_error_is_retried(self):
+        sent, logs = self.send(ConnectionError('timeout'), ConnectionError('timeout'))
+        self.assertTrue(sent)
+        self.assertEqual(FlakyBackend.attempts, 3)
+        self.assertEqual(len(LocMemBackend.outbox), 1)
+        self.assertEqual([record.levelname for record in logs.records], ['WARNING', 'WARNING', 'INFO'])
+
+    def test_gives_up_after_max_retries(self):
+        sent, _ = self.send(*[ConnectionError('timeout')] * 3)
+        self.assertFalse(sent)
+        self.assertEqual(FlakyBackend.attempts, 3)
+        self.assertEqual(LocMemBackend.outbox, [])
+
+    def test_permanent_error_is_not_retried(self):
+        sent, _ = self.send(PermanentSMSError('شماره نامعتبر'), ConnectionError('timeout'))
+        self.assertFalse(sent)
+        self.assertEqual(FlakyBackend.attempts, 1)
+        self.assertEqual(LocMemBackend.outbox, [])
+
+    @override_settings(SMS_RETRY_BACKOFF=1)
+    def test_backoff_doubles(self):
+        with mock.patch('user.sms.time.sleep') as sleep:
+            self.send(*[ConnectionError('timeout')] * 3)
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [1, 2])
@@ -3,7 +3,11 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login, logout
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required, user_passes_test
-from .models import User, OTPCode
+from django.core.paginator import Paginator
+from django.db.models import Count, Q
+from urllib.parse import urlencode
+from .models import User
+from .otp import OTPRateLimited, client_ip, issue_otp, verify_otp
 from .forms import MobileForm, OTPForm, UserRegistrationForm, UserManagementForm
 
 
@@ -21,8 +25,11 @@ def login_view(request):
             if form.is_valid():
                 mobile = form.cleaned_data['mobile']
                 try:
-                    OTPCode.generate_otp(mobile)
+                    issue_otp(mobile, client_ip(request))
                     messages.success(request, f'کد تأیید به {mobile} ارسال شد.')
+                except OTPRateLimited:
+                    messages.error(request, 'درخواست‌های زیادی ارسال شده است. لطفاً کمی بعد دوباره تلاش کنید.')
+                    return render(request, 'login.html', {'form': form, 'step': step})
                 except Exception as e:
                     messages.error(request, 'خطا در ارسال پیامک. لطفاً دوباره تلاش کنید.')
                     return render(request, 'login.html', {'form': form, 'step': step})
@@ -35,8 +42,12 @@ def login_view(request):
             form = OTPForm(request.POST)
             if form.is_valid():
                 code = form.cleaned_data['code']
-                otp = OTPCode.objects.filter(mobile=mobile, code=code).first()
-                if otp and otp.is_valid():
+                try:
+                    verified = verify_otp(mobile, code, client_ip(request))
+                except OTPRateLimited:
+                    messages.error(request, 'تلاش‌های زیادی انجام شده است. لطفاً کمی بعد دوباره تلاش کنید.')
+                    return render(request, 'login.html', {'form': form, 'step': step})
+                if verified:
                     user, created = User.objects.get_or_create(
                         mobile=mobile,
                         defaults={'username': mobile}  # مهم!
@@ -49,6 +60,8 @@ def login_view(request):
                     return redirect('index:home')
                 else:
                     messages.error(request, 'کد نامعتبر یا منقضی شده است.')
+            else:
+                messages.error(request, form.errors['code'][0])
         elif step == 3:
             user = User.objects.get(mobile=mobile)
             form = UserRegistrationForm(request.POST, instance=user)
@@ -75,16 +88,42 @@ def _cleanup_session(request):
         request.session.pop(key, None)
 
 
+# --- مدیریت کاربران ---
+STAFF_ROLES = [role for role, _ in User.ROLE_CHOICES if role != 'customer']
+USERS_PER_PAGE = 25
+
+
+def _user_counts():
+    # همه‌ی شمارنده‌های پنل در یک کوئری (COUNT ... FILTER / CASE WHEN)
+    staff = Q(role__in=STAFF_ROLES)
+    return User.objects.aggregate(
+        staff_count=Count('id', filter=staff),
+        customer_count=Count('id', filter=Q(role='customer')),
+        active_count=Count('id', filter=staff & Q(status='active')),
+        inactive_count=Count('id', filter=staff & Q(status='inactive')),
+        suspended_count=Count('id', filter=staff & Q(status='suspended')),
+        **{f'{role}_count': Count('id', filter=Q(role=role)) for role in STAFF_ROLES},
+    )
+
+
+def _search_users(users, query):
+    # هر کلمه باید بخورد: عدد با پیشوند موبایل/کد ملی (ایندکس‌دار)، متن با نام یا نام خانوادگی
+    for term in query.split():
+        if term.isdigit():
+            users = users.filter(Q(mobile__startswith=term) | Q(national_code__startswith=term))
+        else:
+            users = users.filter(Q(first_name__icontains=term) | Q(last_name__icontains=term))
+    return users
+
+
 @login_required
 @user_passes_test(is_manager)
 def manage_users(request):
-    users = User.objects.all().order_by('-date_joined')
     form = UserManagementForm()
 
     if request.method == 'POST':
-        if 'delete' in request.POST:
-            user_id = request.POST.get('user_id')
-            User.objects.filter(id=user_id).delete()
+        if 'delete_user' in request.POST:
+            User.objects.filter(id=request.POST.get('delete_user')).delete()
             messages.success(request, 'کاربر حذف شد.')
         else:
             form = UserManagementForm(request.POST)
@@ -94,8 +133,26 @@ def manage_users(request):
                 user.save()
                 messages.success(request, 'کاربر ذخیره شد.')
 
+    tab = 'customers' if request.GET.get('tab') == 'customers' else 'staff'
+    query = request.GET.get('q', '').strip()
+    counts = _user_counts()
+
+    users = User.objects.filter(role='customer') if tab == 'customers' else User.objects.filter(role__in=STAFF_ROLES)
+    users = users.only('id', 'first_name', 'last_name', 'mobile', 'role', 'status').order_by('-date_joined', '-id')
+    if query:
+        users = _search_users(users, query)
+    paginator = Paginator(users, USERS_PER_PAGE)
+    if not query:
+        # تعداد این تب در شمارنده‌ها هست؛ COUNT جداگانه‌ی Paginator لازم نیست
+        paginator.count = counts['customer_count' if tab == 'customers' else 'staff_count']
+    page_obj = paginator.get_page(request.GET.get('page'))
+
     return render(request, 'manager_karbaran.html', {
-        'users': users,
+        'page_obj': page_obj,
+        'counts': counts,
+        'tab': tab,
+        'query': query,
+        'base_query': urlencode({'tab': tab, 'q': query} if query else {'tab': tab}),
         'form': form
     })
 